@@ -0,0 +1,39 @@
+# benchmarks/compare.py -- Compares two benchmarks/run.py JSON reports metric by metric
+#   poetry run python benchmarks/compare.py before.json after.json
+
+import json
+import argparse
+
+# Metrics where a larger value is better; everything else (latencies, seconds) is better when smaller
+HIGHER_IS_BETTER = ("_per_s", "throughput_rps")
+
+
+def _flatten(node: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in node.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict): flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool): flat[path] = value
+    return flat
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON reports")
+    parser.add_argument("baseline", help="Report from the older commit")
+    parser.add_argument("candidate", help="Report from the newer commit")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f: baseline = json.load(f)
+    with open(args.candidate) as f: candidate = json.load(f)
+    print(f"baseline  {baseline['meta'].get('commit')}\ncandidate {candidate['meta'].get('commit')}\n")
+
+    old, new = _flatten(baseline["results"]), _flatten(candidate["results"])
+    for metric in sorted(old.keys() & new.keys()):
+        if metric.endswith(("count", "docs", "points", "chunks", "requests", "concurrency", "memories")): continue
+        before, after = old[metric], new[metric]
+        change = (after - before) / before * 100 if before else 0.0
+        better = (change > 0) == metric.endswith(HIGHER_IS_BETTER)
+        marker = "" if abs(change) < 5 else ("  better" if better else "  WORSE")
+        print(f"{metric:45s} {before:14.3f} -> {after:14.3f}  ({change:+6.1f}%){marker}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# benchmarks/fake_llm_server.py -- Local stand-in for OpenAI and Ollama: deterministic chat completions and embeddings with configurable speed
+# Implements the endpoints the project calls:
+#   OpenAI  POST /v1/chat/completions (JSON or SSE stream), POST /v1/embeddings, GET /v1/models
+#   Ollama  POST /api/chat (NDJSON stream or JSON), POST /api/generate (load only), POST /api/embeddings, POST /api/embed, GET /api/tags
+# Outputs come from benchmarks/fakes.py, so the same prompt always gets the same answer and the same text the same vector.
+#   poetry run python benchmarks/fake_llm_server.py --port 11435 --first-token-latency 0.3 --tokens-per-sec 40
+#   OLLAMA_URL=http://localhost:11435                                   (llm.default: ollama)
+#   OPENAI_API_BASE=http://localhost:11435/v1 OPENAI_API_KEY=fake       (llm.default: openai)
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+import uvicorn
+from fastapi           import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from fakes import fake_embedding, fake_completion
+
+
+class Settings:
+    """Speed of the fake model, set from the CLI"""
+    first_token_latency = 0.0      # Seconds before the first token (prompt processing)
+    tokens_per_sec      = 0.0      # Generation speed, 0 = instant
+    embed_latency       = 0.0      # Seconds per embedding request
+    words               = 40       # Words per completion
+    dims                = 384      # Embedding dimensions
+
+app = FastAPI(title="Fake LLM server", description="OpenAI- and Ollama-compatible stand-in for load tests")
+
+
+def _prompt(messages: list[dict]) -> str:
+    return "\n".join(str(message.get("content", "")) for message in messages)
+
+def _tokens(prompt: str) -> list[str]:
+    """The completion split into stream tokens (one word each, with its leading space)"""
+    words = fake_completion(prompt, Settings.words).split(" ")
+    return [words[0]] + [" " + word for word in words[1:]]
+
+async def _generate(prompt: str):
+    """Yields completion tokens at the configured speed"""
+    if Settings.first_token_latency: await asyncio.sleep(Settings.first_token_latency)
+    delay = 1.0 / Settings.tokens_per_sec if Settings.tokens_per_sec else 0.0
+    for token in _tokens(prompt):
+        if delay: await asyncio.sleep(delay)
+        yield token
+
+def _as_text(item) -> str:
+    """OpenAI embedding inputs may be strings or token-id lists (langchain_openai sends tiktoken ids)"""
+    return item if isinstance(item, str) else " ".join(str(token) for token in item)
+
+async def _embed(texts: list[str]) -> list[list[float]]:
+    if Settings.embed_latency: await asyncio.sleep(Settings.embed_latency)
+    return [fake_embedding(text, Settings.dims) for text in texts]
+
+
+# ==============================================================================
+# OPENAI
+# ==============================================================================
+@app.get("/v1/models")
+def openai_models():
+    return {"object": "list", "data": [{"id": "fake-chat", "object": "model", "owned_by": "benchmarks"}]}
+
+@app.post("/v1/chat/completions")
+async def openai_chat(request: Request):
+    body    = await request.json()
+    prompt  = _prompt(body.get("messages", []))
+    model   = body.get("model", "fake-chat")
+    created = int(time.time())
+    usage   = {"prompt_tokens": len(prompt.split()), "completion_tokens": Settings.words}
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+    if body.get("stream"):
+        async def events():
+            async for token in _generate(prompt):
+                chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"role": "assistant", "content": token}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            final = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    content = "".join([token async for token in _generate(prompt)])
+    return {
+        "id": "chatcmpl-fake", "object": "chat.completion", "created": created, "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": usage,
+    }
+
+@app.post("/v1/embeddings")
+async def openai_embeddings(request: Request):
+    body   = await request.json()
+    inputs = body.get("input", [])
+    if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)): inputs = [inputs]
+    vectors = await _embed([_as_text(item) for item in inputs])
+    return {
+        "object": "list", "model": body.get("model", "fake-embed"),
+        "data":   [{"object": "embedding", "index": i, "embedding": vector} for i, vector in enumerate(vectors)],
+        "usage":  {"prompt_tokens": sum(len(_as_text(item).split()) for item in inputs), "total_tokens": 0},
+    }
+
+
+# ==============================================================================
+# OLLAMA
+# ==============================================================================
+@app.get("/api/tags")
+def ollama_tags():
+    return {"models": [{"name": "fake-chat:latest", "model": "fake-chat:latest"}, {"name": "fake-embed:latest", "model": "fake-embed:latest"}]}
+
+@app.post("/api/chat")
+async def ollama_chat(request: Request):
+    body   = await request.json()
+    prompt = _prompt(body.get("messages", []))
+    model  = body.get("model", "fake-chat")
+    start  = time.perf_counter_ns()
+
+    def done(content: str = "") -> dict:
+        return {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "message": {"role": "assistant", "content": content}, "done": True, "done_reason": "stop",
+                "total_duration": time.perf_counter_ns() - start, "prompt_eval_count": len(prompt.split()), "eval_count": Settings.words}
+
+    if body.get("stream", True):         # Ollama streams unless told not to
+        async def lines():
+            async for token in _generate(prompt):
+                yield json.dumps({"model": model, "message": {"role": "assistant", "content": token}, "done": False}) + "\n"
+            yield json.dumps(done()) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return done("".join([token async for token in _generate(prompt)]))
+
+@app.post("/api/generate")
+async def ollama_generate(request: Request):
+    """Only the model-loading form (no prompt) that ClientRegistry.preload_ollama() sends"""
+    body = await request.json()
+    return {"model": body.get("model", "fake-chat"), "response": "", "done": True, "done_reason": "load"}
+
+@app.post("/api/embeddings")
+async def ollama_embeddings(request: Request):
+    body = await request.json()
+    return {"embedding": (await _embed([body.get("prompt", "")]))[0]}
+
+@app.post("/api/embed")
+async def ollama_embed(request: Request):
+    body   = await request.json()
+    inputs = body.get("input", [])
+    return {"model": body.get("model", "fake-embed"), "embeddings": await _embed([inputs] if isinstance(inputs, str) else inputs)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an OpenAI/Ollama-compatible fake LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--first-token-latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="Generation speed (0 = instant)")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Seconds per embedding request")
+    parser.add_argument("--words", type=int, default=40, help="Words per completion")
+    parser.add_argument("--dims", type=int, default=384, help="Embedding dimensions (match llm.<provider>.embedding_dims)")
+    args = parser.parse_args()
+
+    Settings.first_token_latency = args.first_token_latency
+    Settings.tokens_per_sec      = args.tokens_per_sec
+    Settings.embed_latency       = args.embed_latency
+    Settings.words               = args.words
+    Settings.dims                = args.dims
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/fake_web_server.py -- Local stand-in for a documentation site: HTML pages, a sitemap index and conditional GETs
+# Serves /sitemap.xml (a sitemap index) -> /sitemap-pages.xml -> /docs/page-<i>.html. Pages answer If-None-Match and
+# If-Modified-Since with 304; every request is logged with its status so tests can see what was re-downloaded.
+#   poetry run python benchmarks/fake_web_server.py --port 8765 --pages 200 --latency 0.05
+#   poetry run python scripts/ingest.py --sitemap http://localhost:8765/sitemap.xml
+
+import time
+import hashlib
+import argparse
+import threading
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class FakeSite:
+    """The site's content and request log; edit `pages` between fetches to simulate changed pages"""
+
+    def __init__(self, pages: int = 5, latency_s: float = 0.0, validators: bool = True):
+        self.pages      = {f"/docs/page-{i}.html": self.render(i, 1) for i in range(pages)}
+        self.modified   = {path: time.time() for path in self.pages}
+        self.latency_s  = latency_s
+        self.validators = validators                # False: no ETag / Last-Modified, always 200
+        self.requests   = []                        # (path, status, time)
+        self.starts     = []                        # Arrival time of every request, before the simulated latency
+        self.in_flight  = 0
+        self.peak       = 0                         # Most requests handled at once
+        self._lock      = threading.Lock()
+
+    @staticmethod
+    def render(i: int, version: int) -> str:
+        return (f"<html><head><title>Page {i}</title><script>var tracking = {i};</script></head><body><nav>Home | Docs</nav>"
+                f"<h1>Valve manual {i}</h1><p>Revision {version}. The housing of valve {i} is tightened to {10 + i} Nm "
+                f"and inspected after every batch.</p></body></html>")
+
+    def update(self, path: str, html: str):
+        self.pages[path]    = html
+        self.modified[path] = time.time() + 1       # HTTP dates have second resolution
+
+    def sitemap_index(self, base: str) -> str:
+        return ('<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f"<sitemap><loc>{base}/sitemap-pages.xml</loc></sitemap></sitemapindex>")
+
+    def sitemap(self, base: str) -> str:
+        urls = "".join(f"<url><loc>{base}{path}</loc></url>" for path in self.pages)
+        return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+    def begin(self):
+        with self._lock:
+            self.starts.append(time.perf_counter())
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def end(self):
+        with self._lock: self.in_flight -= 1
+
+    def reset_log(self):
+        with self._lock:
+            self.requests.clear()
+            self.starts.clear()
+            self.peak = self.in_flight
+
+    def log(self, path: str, status: int):
+        with self._lock:
+            self.requests.append((path, status, time.perf_counter()))
+
+    def statuses(self, prefix: str = "/docs/") -> list[int]:
+        return [status for path, status, _ in self.requests if path.startswith(prefix)]
+
+
+def _handler(site: FakeSite):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: bytes = b"", content_type: str = "text/html", headers: dict = None):
+            site.log(self.path, status)
+            self.send_response(status)
+            for name, value in (headers or {}).items(): self.send_header(name, value)
+            if status != 304: self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            site.begin()
+            try:
+                self._get()
+            finally:
+                site.end()
+
+        def _get(self):
+            if site.latency_s: time.sleep(site.latency_s)
+            base = f"http://{self.headers['Host']}"
+            if self.path == "/sitemap.xml":       return self._send(200, site.sitemap_index(base).encode(), "application/xml")
+            if self.path == "/sitemap-pages.xml": return self._send(200, site.sitemap(base).encode(), "application/xml")
+            if self.path not in site.pages:       return self._send(404, b"not found", "text/plain")
+
+            body = site.pages[self.path].encode()
+            if not site.validators: return self._send(200, body)
+            etag     = f'"{hashlib.sha1(body).hexdigest()}"'
+            modified = formatdate(site.modified[self.path], usegmt=True)
+            headers  = {"ETag": etag, "Last-Modified": modified}
+            if self.headers.get("If-None-Match") == etag: return self._send(304, headers=headers)
+            self._send(200, body, headers=headers)
+
+    return Handler
+
+
+class FakeWebServer:
+    """Runs a FakeSite on a local port in a background thread (usable as a context manager)"""
+
+    def __init__(self, site: FakeSite, port: int = 0):
+        self.site   = site
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _handler(site))
+        self.server.daemon_threads = True
+        self.url    = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fake-web-server", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in documentation site for web ingestion")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    args = parser.parse_args()
+    with FakeWebServer(FakeSite(args.pages, args.latency), args.port) as web:
+        print(f"Serving {args.pages} pages at {web.url}/sitemap.xml")
+        web.thread.join()
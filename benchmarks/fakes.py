@@ -0,0 +1,136 @@
+# benchmarks/fakes.py -- Deterministic offline stand-ins for the network dependencies: embedder, chat model, crew and Neo4j
+# Used with ClientRegistry.override(...) and QdrantClient(":memory:") so benchmarks need no OpenAI/Ollama/Qdrant/Neo4j.
+
+import re
+import time
+import asyncio
+import hashlib
+import numpy as np
+
+from langchain_core.embeddings                 import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages                   import AIMessage
+from langchain_core.outputs                    import ChatGeneration, ChatResult
+
+_TOKEN = re.compile(r"\w+")
+
+
+def fake_embedding(text: str, dims: int) -> list[float]:
+    """Feature-hashed bag of words, L2-normalized: identical texts get identical vectors and shared words raise cosine similarity"""
+    vector = np.zeros(dims, dtype=np.float32)
+    for token in _TOKEN.findall(text.lower()):
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        index  = int.from_bytes(digest[:4], "little") % dims
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = float(np.linalg.norm(vector))
+    if norm == 0: vector[0], norm = 1.0, 1.0
+    return (vector / norm).tolist()
+
+def fake_completion(prompt: str, words: int = 40) -> str:
+    """Deterministic pseudo-answer derived from the prompt text"""
+    digest = hashlib.sha256(prompt.encode()).hexdigest()
+    vocab  = sorted(set(_TOKEN.findall(prompt.lower()))) or ["answer"]
+    picks  = [vocab[int(digest[i % 64], 16) * (i + 1) % len(vocab)] for i in range(words)]
+    return f"Final Answer: [{digest[:12]}] " + " ".join(picks)
+
+
+class FakeEmbeddings(Embeddings):
+    """Embedder with a fixed per-call latency (one HTTP round trip per call, like the real clients)"""
+
+    def __init__(self, dims: int = 384, latency_s: float = 0.0):
+        self.dims      = dims
+        self.latency_s = latency_s
+        self.calls     = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        if self.latency_s: time.sleep(self.latency_s)
+        return [fake_embedding(text, self.dims) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        if self.latency_s: await asyncio.sleep(self.latency_s)
+        return [fake_embedding(text, self.dims) for text in texts]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model with configurable latency that answers deterministically and reports token usage like OpenAI"""
+    latency_s: float = 0.0
+    words: int       = 40
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _result(self, messages) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        text   = fake_completion(prompt, self.words)
+        usage  = {"prompt_tokens": len(prompt.split()), "completion_tokens": len(text.split())}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))],
+                          llm_output={"token_usage": usage, "model_name": "fake-chat"})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency_s: time.sleep(self.latency_s)
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency_s: await asyncio.sleep(self.latency_s)
+        return self._result(messages)
+
+
+class FakeCrew:
+    """Stands in for the crewai Crew: sleeps for the crew latency, then makes one call to the (fake) chat model"""
+
+    def __init__(self, llm: BaseChatModel, latency_s: float = 0.0):
+        self.llm       = llm
+        self.latency_s = latency_s
+
+    def kickoff(self, inputs: dict) -> str:
+        if self.latency_s: time.sleep(self.latency_s)
+        return self.llm.invoke(f"Research and answer: {inputs['topic']}\nContext: {inputs.get('context', '')}").content
+
+
+class FakeNeo4jDriver:
+    """Accepts and counts Cypher statements without a database"""
+
+    def __init__(self):
+        self.statements = 0
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query: str, **params):
+        self.statements += 1
+
+    def close(self):
+        pass
+
+
+class FakeDatabaseConnections:
+    """Same interface as utils.db_connections.DatabaseConnections, backed by an in-memory Qdrant client and FakeNeo4jDriver"""
+
+    def __init__(self, qdrant_client):
+        self._qdrant_client = qdrant_client
+        self._neo4j_driver  = FakeNeo4jDriver()
+
+    def get_qdrant_client(self):
+        return self._qdrant_client
+
+    def get_neo4j_driver(self):
+        return self._neo4j_driver
+
+    def close_connections(self):
+        pass
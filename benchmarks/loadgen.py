@@ -0,0 +1,118 @@
+# benchmarks/loadgen.py -- Closed-loop load generator for a running API: N concurrent users drive /chat and/or /upload
+# Each user sends a request, waits for the answer, and sends the next one. With several --users levels it steps through them
+# and reports throughput and latency percentiles per level, so the concurrency ceiling is where throughput stops growing.
+# Point the API at benchmarks/fake_llm_server.py to load-test without OpenAI tokens or an Ollama box:
+#   poetry run python benchmarks/fake_llm_server.py --port 11435 --first-token-latency 0.2 --tokens-per-sec 50 &
+#   OLLAMA_URL=http://localhost:11435 poetry run uvicorn rag_agent_framework.api.server:app --port 8000 &
+#   poetry run python benchmarks/loadgen.py --url http://localhost:8000 --users 1 2 4 8 16 --duration 30 --output load.json
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from stats import summarize
+
+QUESTIONS = [
+    "What is the torque specification for the valve housing?",
+    "Which sterilization method is validated for the catheter lumen?",
+    "Summarize the supplier inspection requirements.",
+    "What coating is specified for the thread diameter?",
+    "List the deviations recorded for the last batch.",
+]
+VOCABULARY = "valve housing tolerance polymer sterilization assembly torque fixture specification revision supplier coating seal".split()
+
+
+def synthetic_upload(rng: random.Random, user: int, i: int, chars: int) -> tuple[str, bytes]:
+    words = [rng.choice(VOCABULARY) for _ in range(chars // 8)]
+    return f"loadgen_{user}_{i}.md", (f"# Load test document {user}-{i}\n\n" + " ".join(words)).encode()
+
+async def run_level(args, users: int) -> dict:
+    """Runs `users` closed-loop users for args.duration seconds (or args.requests per user) and summarizes the latencies"""
+    samples  = {"chat": [], "upload": []}
+    errors   = {"chat": 0, "upload": 0}
+    deadline = time.perf_counter() + args.duration
+
+    async def user(client: httpx.AsyncClient, n: int):
+        rng = random.Random(args.seed * 1000 + n)
+        i   = 0
+        while (args.requests and i < args.requests) or (not args.requests and time.perf_counter() < deadline):
+            kind  = "upload" if rng.random() < args.upload_ratio else "chat"
+            start = time.perf_counter()
+            try:
+                if kind == "chat":
+                    response = await client.post("/chat", json={"question": rng.choice(QUESTIONS), "user_id": f"loadgen_{n % args.distinct_users}"})
+                else:
+                    filename, content = synthetic_upload(rng, n, i, args.upload_chars)
+                    response = await client.post("/upload", data={"collection_name": args.collection}, files={"file": (filename, content, "text/markdown")})
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok: samples[kind].append(time.perf_counter() - start)
+            else:  errors[kind] += 1
+            i += 1
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(user(client, n) for n in range(users)))
+        elapsed = time.perf_counter() - start
+
+    completed = len(samples["chat"]) + len(samples["upload"])
+    report    = {"users": users, "seconds": elapsed, "completed": completed, "errors": sum(errors.values()),
+                 "throughput_rps": completed / elapsed if elapsed else 0.0}
+    for kind in ("chat", "upload"):
+        if samples[kind] or errors[kind]:
+            report[kind] = {"errors": errors[kind], **summarize(samples[kind])}
+    return report
+
+def find_ceiling(levels: list[dict], min_gain: float) -> int | None:
+    """The user count after which adding users raised throughput by less than min_gain (or errors appeared)"""
+    for previous, current in zip(levels, levels[1:]):
+        if current["errors"] > previous["errors"] or current["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            return previous["users"]
+    return None
+
+async def main_async(args) -> dict:
+    async with httpx.AsyncClient(base_url=args.url, timeout=10) as client:
+        ready = await client.get("/ready")
+        if ready.status_code != 200: print(f"⚠️ {args.url}/ready returned {ready.status_code}, the first requests include warmup", file=sys.stderr)
+
+    levels = []
+    for users in args.users:
+        level = await run_level(args, users)
+        levels.append(level)
+        print(f"👥 {users:4d} users  {level['throughput_rps']:8.2f} req/s  errors {level['errors']:4d}"
+              + "".join(f"  {kind} p50 {level[kind]['p50_ms']:.0f} ms p99 {level[kind]['p99_ms']:.0f} ms" for kind in ("chat", "upload") if kind in level and level[kind]["count"]),
+              file=sys.stderr)
+    return {"levels": levels, "concurrency_ceiling": find_ceiling(levels, args.min_gain)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive /chat and /upload with N concurrent users and report throughput and latency percentiles")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the API")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Concurrent user levels to step through")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per level")
+    parser.add_argument("--requests", type=int, default=0, help="Requests per user per level instead of --duration")
+    parser.add_argument("--upload-ratio", type=float, default=0.0, help="Fraction of requests that are /upload (0 = chat only, 1 = upload only)")
+    parser.add_argument("--upload-chars", type=int, default=4000, help="Size of each synthetic uploaded Markdown file")
+    parser.add_argument("--collection", default="loadgen_collection", help="Collection the uploads go to")
+    parser.add_argument("--distinct-users", type=int, default=8, help="Distinct user_ids (memory collections) in /chat traffic")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="Throughput gain below which a level counts as saturated")
+    parser.add_argument("--timeout", type=float, default=600, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = {"url": args.url, "params": {k: v for k, v in vars(args).items() if k != "output"}, **asyncio.run(main_async(args))}
+    output = json.dumps(report, indent=2)
+    if args.output: Path(args.output).write_text(output)
+    else: print(output)
+
+if __name__ == "__main__":
+    main()
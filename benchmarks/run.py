@@ -0,0 +1,205 @@
+# benchmarks/run.py -- Offline performance benchmark suite: no OpenAI/Ollama/Qdrant/Neo4j needed
+# Fakes from benchmarks/fakes.py replace the LLM, embedder, crew and Neo4j; Qdrant runs in-process with QdrantClient(":memory:").
+# Measures:
+#   1. split_documents throughput
+#   2. ingest docs/sec through scripts/ingest.process_and_store
+#   3. MemoryStore.get_memories latency
+#   4. get_rag_chain retriever latency (and full chain invoke with a zero-latency LLM)
+#   5. /chat p50/p99 under concurrency
+# Results are written as JSON (with the git commit) so runs can be compared with benchmarks/compare.py.
+#   poetry run python benchmarks/run.py --output bench.json
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+import contextlib
+import importlib.util
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+os.environ.setdefault("QDRANT_URL", ":memory:")     # Every Qdrant client comes from the override below; this only satisfies URL checks
+os.environ.setdefault("LOG_LEVEL", "WARNING")      # Keep per-request logging out of the timings
+
+import httpx
+from qdrant_client                         import QdrantClient, models
+from langchain.schema                      import Document
+
+from rag_agent_framework.core.clients      import ClientRegistry
+from rag_agent_framework.core.config       import config
+from rag_agent_framework.rag.text_splitter import split_documents
+
+from fakes import FakeEmbeddings, FakeChatModel, FakeCrew, FakeDatabaseConnections
+from stats import summarize
+
+VOCABULARY = ("valve housing tolerance polymer sterilization biocompatibility assembly torque fixture specification "
+              "revision clause standard material supplier inspection coating thread diameter pressure seal "
+              "catheter lumen extrusion bonding adhesive cleanroom validation protocol deviation batch").split()
+
+
+def synthetic_text(rng: random.Random, chars: int) -> str:
+    words, size = [], 0
+    while size < chars:
+        word = rng.choice(VOCABULARY)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+def _quiet():
+    """The pipeline prints progress for every file / request; silence it while timing"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+def _load_ingest_module():
+    spec   = importlib.util.spec_from_file_location("ingest", PROJECT_ROOT / "scripts" / "ingest.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ==============================================================================
+# BENCHMARKS
+# ==============================================================================
+def bench_split(args, rng) -> dict:
+    documents = [Document(page_content=synthetic_text(rng, args.doc_chars), metadata={"source": f"doc_{i}"}) for i in range(args.docs)]
+    total     = sum(len(doc.page_content) for doc in documents)
+    with _quiet():
+        start  = time.perf_counter()
+        chunks = split_documents(documents, chunk_size=config.retriever.chunk_size, chunk_overlap=config.retriever.chunk_overlap)
+        elapsed = time.perf_counter() - start
+    return {"docs": len(documents), "chunks": len(chunks), "seconds": elapsed,
+            "chars_per_s": total / elapsed, "chunks_per_s": len(chunks) / elapsed}
+
+def bench_ingest(args, rng, client, embedder) -> dict:
+    ingest = _load_ingest_module()
+    client.create_collection(ingest.QDRANT_COLLECTION_NAME, vectors_config=models.VectorParams(size=embedder.dims, distance=models.Distance.COSINE))
+    db_manager = FakeDatabaseConnections(client)
+    texts      = [synthetic_text(rng, args.doc_chars) for _ in range(args.docs)]
+
+    with _quiet():
+        start = time.perf_counter()
+        graph = ingest.MergeGraphLoader(db_manager.get_neo4j_driver())
+        for i, text in enumerate(texts):
+            ingest.process_and_store(f"bench_{i}.md", db_manager, embedder, parsed=text, graph=graph)
+        graph.close()
+        elapsed = time.perf_counter() - start
+    points = client.count(ingest.QDRANT_COLLECTION_NAME).count
+    return {"docs": len(texts), "points": points, "seconds": elapsed, "docs_per_s": len(texts) / elapsed, "points_per_s": points / elapsed}
+
+def bench_memories(args, rng) -> dict:
+    from rag_agent_framework.rag.memory import MemoryStore
+    with _quiet():
+        store = MemoryStore(user_id="bench_memories")
+        store.vector_store.add_texts([synthetic_text(rng, 300) for _ in range(args.memories)], metadatas=[{"user_id": "bench_memories"}] * args.memories)
+        samples = []
+        for _ in range(args.queries):
+            query = synthetic_text(rng, 80)
+            start = time.perf_counter()
+            store.get_memories(query=query)
+            samples.append(time.perf_counter() - start)
+    return {"memories": args.memories, **summarize(samples)}
+
+def bench_rag(args, rng) -> dict:
+    from rag_agent_framework.rag.rag_chain    import get_rag_chain
+    from rag_agent_framework.rag.vector_store import get_vector_store
+    collection = config.vector_db.default_collection_name
+    with _quiet():
+        chain     = get_rag_chain(collection_name=collection, url=os.environ["QDRANT_URL"])
+        retriever = get_vector_store(collection_name=collection, url=os.environ["QDRANT_URL"]).as_retriever(search_kwargs={"k": config.retriever.k})
+        retrieval, full = [], []
+        for _ in range(args.queries):
+            query = synthetic_text(rng, 80)
+            start = time.perf_counter(); retriever.invoke(query); retrieval.append(time.perf_counter() - start)
+            start = time.perf_counter(); chain.invoke(query);     full.append(time.perf_counter() - start)
+    return {"retriever": summarize(retrieval), "chain_invoke": summarize(full)}
+
+async def bench_chat(args) -> dict:
+    from rag_agent_framework.api.server    import app
+    from rag_agent_framework.api           import scheduler as scheduler_module
+    from rag_agent_framework.agents        import crew as crew_module
+    from rag_agent_framework.core.config   import SCHEDULER_CFG
+    crew_module._pool = crew_module.CrewPool(lambda: FakeCrew(ClientRegistry.get_chat_model(), latency_s=args.crew_latency))
+    # Configured concurrency and queue limits, but seeded with the fake crew's run time and no per-user cap (few bench users)
+    scheduler_module._scheduler = scheduler_module.CrewScheduler(**{**SCHEDULER_CFG, "expected_run_s": max(args.crew_latency, 0.01), "max_per_user": args.chat_requests})
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    samples, errors = [], 0
+
+    async def one(client, i):
+        nonlocal errors
+        async with semaphore:
+            start    = time.perf_counter()
+            response = await client.post("/chat", json={"question": f"What is the torque spec for fixture {i % 17}?", "user_id": f"bench_user_{i % args.users}"})
+            samples.append(time.perf_counter() - start)
+            if response.status_code != 200: errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        with _quiet():
+            start = time.perf_counter()
+            await asyncio.gather(*(one(client, i) for i in range(args.chat_requests)))
+            elapsed = time.perf_counter() - start
+    return {"requests": args.chat_requests, "concurrency": args.concurrency, "errors": errors,
+            "throughput_rps": args.chat_requests / elapsed, **summarize(samples)}
+
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline performance benchmarks and emit JSON")
+    parser.add_argument("--docs", type=int, default=200, help="Synthetic documents for the split and ingest benchmarks")
+    parser.add_argument("--doc-chars", type=int, default=8000, help="Characters per synthetic document")
+    parser.add_argument("--memories", type=int, default=2000, help="Stored memories to search in the retrieval benchmarks")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per retrieval benchmark")
+    parser.add_argument("--chat-requests", type=int, default=200, help="Total /chat requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent /chat requests")
+    parser.add_argument("--users", type=int, default=8, help="Distinct user_ids in /chat traffic")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Seconds added to every embedder call")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds added to every chat model call")
+    parser.add_argument("--crew-latency", type=float, default=0.05, help="Seconds the fake crew spends per kickoff")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", nargs="*", choices=["split", "ingest", "memories", "rag", "chat"], help="Run a subset")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    rng      = random.Random(args.seed)
+    embedder = FakeEmbeddings(dims=384, latency_s=args.embed_latency)
+    client   = QdrantClient(location=":memory:")
+    ClientRegistry.override(chat_model=FakeChatModel(latency_s=args.llm_latency), embedder=embedder, qdrant_client=client)
+
+    selected = set(args.only or ["split", "ingest", "memories", "rag", "chat"])
+    results  = {}
+    if "split" in selected:    results["split_documents"] = bench_split(args, rng)
+    if "ingest" in selected:   results["ingest"]          = bench_ingest(args, rng, client, embedder)
+    if "memories" in selected: results["get_memories"]    = bench_memories(args, rng)
+    if "rag" in selected:      results["rag_chain"]       = bench_rag(args, rng)
+    if "chat" in selected:     results["chat"]            = asyncio.run(bench_chat(args))
+
+    report = {
+        "meta": {
+            "commit":    _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python":    platform.python_version(),
+            "params":    {k: v for k, v in vars(args).items() if k != "output"},
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output: Path(args.output).write_text(output)
+    else: print(output)
+
+if __name__ == "__main__":
+    main()
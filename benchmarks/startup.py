@@ -0,0 +1,102 @@
+# benchmarks/startup.py -- Cold-start benchmark: import time of the API and scripts, time-to-first-request and time-to-ready
+# Every measurement runs in a fresh interpreter so nothing is cached between runs. Prints (or writes) a JSON report.
+#   poetry run python benchmarks/startup.py --runs 5 --output startup.json
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ENV          = {**os.environ, "PYTHONPATH": os.pathsep.join([str(PROJECT_ROOT / "src"), str(PROJECT_ROOT)])}
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+SCRIPTS        = ["scripts/run_crew.py", "scripts/query.py", "scripts/chat.py", "scripts/ingest.py"]
+
+
+def _summary(samples: list[float]) -> dict:
+    return {"min_s": min(samples), "median_s": statistics.median(samples), "max_s": max(samples), "runs": len(samples)}
+
+def measure_import(module: str, runs: int) -> dict:
+    """Wall time of `import module` in a fresh interpreter"""
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+                             env=ENV, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return _summary(samples)
+
+def measure_script_help(script: str, runs: int) -> dict:
+    """Wall time of `python script --help`, i.e. the startup cost paid before the script does any work"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script, "--help"], env=ENV, cwd=PROJECT_ROOT, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_for(url: str, deadline: float) -> float:
+    """Polls url until it returns 200, returns the time it first did"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200: return time.perf_counter()
+        except Exception:
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"{url} did not return 200 in time")
+
+def measure_first_request(runs: int, timeout: float) -> dict:
+    """Launches uvicorn and records time until /health answers (first request) and until /ready answers (warm)"""
+    first, ready = [], []
+    for _ in range(runs):
+        port    = _free_port()
+        start   = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "rag_agent_framework.api.server:app", "--port", str(port)],
+            env=ENV, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            first.append(_wait_for(f"http://127.0.0.1:{port}/health", start + timeout) - start)
+            ready.append(_wait_for(f"http://127.0.0.1:{port}/ready", start + timeout) - start)
+        finally:
+            process.terminate()
+            process.wait()
+    return {"time_to_first_request": _summary(first), "time_to_ready": _summary(ready)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API and script cold-start times")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh-interpreter runs per measurement")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds to wait for the server per run")
+    parser.add_argument("--skip-server", action="store_true", help="Only measure import times")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "python": sys.version.split()[0],
+        "import": {
+            "rag_agent_framework.api.server":   measure_import("rag_agent_framework.api.server", args.runs),
+            "rag_agent_framework.agents.crew":  measure_import("rag_agent_framework.agents.crew", args.runs),
+        },
+        "scripts": {script: measure_script_help(script, args.runs) for script in SCRIPTS},
+    }
+    if not args.skip_server:
+        report["server"] = measure_first_request(args.runs, args.timeout)
+
+    output = json.dumps(report, indent=2)
+    if args.output: Path(args.output).write_text(output)
+    else: print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+# benchmarks/stats.py -- Latency summaries shared by the benchmark scripts
+
+import statistics
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted sample list"""
+    ordered = sorted(samples)
+    rank    = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+def summarize(samples_s: list[float]) -> dict:
+    """Count, mean and p50/p90/p99/max of latencies given in seconds, reported in milliseconds"""
+    if not samples_s: return {"count": 0}
+    return {
+        "count":   len(samples_s),
+        "mean_ms": statistics.fmean(samples_s) * 1000,
+        "p50_ms":  percentile(samples_s, 50) * 1000,
+        "p90_ms":  percentile(samples_s, 90) * 1000,
+        "p99_ms":  percentile(samples_s, 99) * 1000,
+        "max_ms":  max(samples_s) * 1000,
+    }
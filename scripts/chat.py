@@ -12,8 +12,9 @@ import sys
 from pathlib import Path
 
 from rag_agent_framework.utils import path_fix # noqa: F401
-from rag_agent_framework.rag.memory import MemoryStore, get_summarizer
-from rag_agent_framework.agents.crew import agent_crew
+from rag_agent_framework.rag.memory import MemoryStore
+from rag_agent_framework.rag.memory_policy import get_memory_writer
+from rag_agent_framework.agents.crew import get_crew
 
 def main():
     """An interactive chat loop that uses the agentic crew and long-term memory"""
@@ -23,14 +24,15 @@ def main():
     print("Type 'exit' to end the conversation.")
     print("-" * 100)
 
-    # Initialize the memory store and summarizer
+    # Initialize the memory store and the memory writer (memory.policy in config.yaml decides when summaries are written)
     memory = MemoryStore(user_id=user_id)
-    summarizer = get_summarizer()
+    writer = get_memory_writer()
 
     # Start the interactive chat loop
     while True:
         question = input("You: ")
         if question.lower() == 'exit':
+            writer.flush()          # Buffered turns are summarized before leaving
             print("Ending chat. Good bye!")
             break
 
@@ -46,16 +48,12 @@ def main():
 
         # 3. Run the crew
         print("\n🤖 Crew is thinking...")
-        result = agent_crew.kickoff(inputs=inputs)
+        result = get_crew().kickoff(inputs=inputs)
         print("\nAgent:", result)
         print("-" * 100)
 
-        # 4. Summarize and store the new interaction
-        conversation_to_summarize = f"User asked: {question}\nAgent answered: {result}"
-        summary = summarizer.invoke({"text": conversation_to_summarize})
-
-        # 5. Call the add_memory method on the memory instance
-        memory.add_memory(summary.content)
+        # 4. Summarize (now or later, per the policy) and store the new interaction
+        writer.record(user_id, question, str(result), memory)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
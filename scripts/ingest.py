@@ -1,147 +1,326 @@
 # scripts/ingest.py -- aparses, chunks, embeds, and stores (text and CAD files) into a hybrid knowledge base (Qdrant-vector search and Neo4j-graph based relationships)
 # 1. Handles CLI input using click(--path option)
 # 2. Initializes connections to Qdrant and Neo4j
-# 3. Processes each file (dir or single file) using process_and_store()
+# 3. Parses files concurrently through the cad-parser / pdf-parser services (utils/parser_client.py); without PDF_PARSER_URL,
+#    PDFs are loaded lazily page by page. Chunks are embedded and upserted in fixed-size batches (retriever.embed_batch_size)
+# 4. Stores each parsed file (dir or single file) using process_and_store()
+# 5. Also writes every chunk and its vector to the corpus store, so scripts/reindex.py can rebuild collections without re-parsing
+# 6. Skips chunks that near-duplicate stored ones before embedding them (rag/dedup.py, --dedup/--no-dedup)
+# 7. Writes graph nodes in batches (UNWIND ... MERGE on the schema's constraints) or, with --graph-mode csv, as neo4j-admin import CSVs
+# 8. Times parse / chunk / embed / graph_write / qdrant_write and prints a per-stage summary (optionally a Prometheus textfile)
+# 9. --urls / --sitemap ingest web pages instead of --path: fetched concurrently with per-host rate limits, unchanged pages skipped
+#    through conditional GETs (rag/web_loader.py)
+# 10. --profile records a sampling profile of the whole run (core/profiling.py) next to the API's request profiles
 
 import os
 import click
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 # -- Add project root to path to allow submodule imports --
 import sys
 project_root = Path(__file__).resolve().parent.parent
-sys.path.append(str(project_root))
+sys.path.append(str(project_root / "src"))
 sys.path.append(str(project_root / 'vendor/markitdown/packages/markitdown/src'))
 
-from src.rag_agent_framework.utils.db_connections      import DatabaseConnections
-from src.rag_agent_framework.ingestion.document_parser import parse_document
-from src.rag_agent_framework.ingestion.cad_parser      import parse_step_file
-from src.rag_agent_framework.rag.text_splitter         import split_documents
-from src.rag_agent_framework.core.config               import config
-from src.rag_agent_framework.rag.vector_store          import get_embedder
-from langchain.schema                                  import Document
-from qdrant_client.http                                import models
+from rag_agent_framework.utils.db_connections      import DatabaseConnections
+from rag_agent_framework.utils                     import parser_client
+from rag_agent_framework.core.clients              import ClientRegistry
+from rag_agent_framework.core                      import telemetry, profiling
+from rag_agent_framework.core.telemetry            import span
+from rag_agent_framework.graph.bulk_loader         import MergeGraphLoader, CsvGraphWriter
+from rag_agent_framework.rag.corpus_store          import CorpusWriter
+from rag_agent_framework.rag.collections           import ensure_collection
+from rag_agent_framework.rag.dedup                 import DedupIndex, CHUNKS, get_dedup_index, existing_points, link_duplicates
+from rag_agent_framework.rag.web_loader            import get_web_fetcher
+from rag_agent_framework.rag.text_splitter         import iter_split_documents, batched
+from rag_agent_framework.rag.data_loader           import lazy_load_documents
+from rag_agent_framework.core.config               import config, CORPUS_STORE_CFG, DEDUP_CFG, PDF_PARSER_URL
+from rag_agent_framework.rag.vector_store          import get_embedder, build_filter
+from langchain.schema                              import Document
+from qdrant_client.http                            import models
 
 # -- Constants -- from config.yaml
 QDRANT_COLLECTION_NAME = config.vector_db.default_collection_name
 EMBEDDING_MODEL        = "nomic-embed-text:latest"
-MARKDOWN_EXTENSIONS    = ['.pdf', '.docx', '.md', '.html', '.pptx', '.txt']
-CAD_EXTENSIONS         = ['.step', 'iges']
+PDF_EXTENSIONS         = ['.pdf']                       # Parsed by the pdf-parser service
+OFFICE_EXTENSIONS      = ['.docx', '.pptx']             # Converted by the pdf-parser service too (MarkItDown); need PDF_PARSER_URL
+TEXT_EXTENSIONS        = ['.md', '.txt', '.html']       # Already text, read locally
+MARKDOWN_EXTENSIONS    = PDF_EXTENSIONS + OFFICE_EXTENSIONS + TEXT_EXTENSIONS
+CAD_EXTENSIONS         = ['.step', '.stp', '.iges', '.igs']
 
-def process_and_store(file_path: str, db_manager: DatabaseConnections, embeddings):
-    """Processes a single file, stores its content in Qdrant, and its metadata in Neo4j"""
+logger = telemetry.get_logger("scripts.ingest")
+
+def parse_file(file_path: str):
+    """
+        Parses one file: CAD files go to the cad-parser, PDF/DOCX/PPTX to the pdf-parser (CAD_PARSER_URL / PDF_PARSER_URL), text is read locally.
+        Without a PDF parser service, a PDF comes back as a lazy page iterator that store_text() streams in batches
+    """
+    file_ext = Path(file_path).suffix.lower()
+    with span("parse"):
+        if file_ext in CAD_EXTENSIONS: return parser_client.get_cad_parser().parse(file_path)
+        if file_ext in PDF_EXTENSIONS and not PDF_PARSER_URL: return lazy_load_documents(file_path)
+        if file_ext in PDF_EXTENSIONS + OFFICE_EXTENSIONS: return parser_client.get_pdf_parser().parse(file_path)["markdown_content"]
+        if file_ext in TEXT_EXTENSIONS: return Path(file_path).read_text(encoding="utf-8", errors="ignore")
+    return None
+
+def iter_parsed(file_paths: list[str]):
+    """Parses files concurrently through the parser services (bounded by parsers.max_concurrency) and yields (path, parsed or error) as each finishes"""
+    workers = config.get("parsers", {}).get("max_concurrency", 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(parse_file, path): path for path in file_paths}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+def cad_parts(cad_data: dict, filename: str) -> list[dict]:
+    """Turns the cad-parser response (volume, part_count, hierarchy of solids) into one part record with a text summary per solid"""
+    parts = []
+    for solid in cad_data.get("hierarchy", []):
+        bbox = ", ".join(f"{v:.2f}" for v in solid.get("bbox", []))
+        parts.append({
+            "part_id":         f"{filename}:{solid['id']}",
+            "volume":          solid["volume"],
+            "properties_text": f"CAD part {solid['id']} from {filename} (assembly of {cad_data.get('part_count', 0)} solids, "
+                               f"total volume {cad_data.get('volume', 0):.2f}). Solid volume: {solid['volume']:.2f}. Bounding box: [{bbox}].",
+        })
+    return parts
+
+def store_chunks(qdrant_client, texts: list[str], vectors: list[list[float]], metadatas: list[dict], corpus: CorpusWriter = None, ids: list[str] = None):
+    """Upserts chunks using the same payload layout as LangChain's QdrantVectorStore so the RAG retriever can read them; also records them in the corpus store"""
+    ids = ids or [str(uuid.uuid4()) for _ in texts]
+    with span("qdrant_write"):
+        qdrant_client.upsert(
+            collection_name = QDRANT_COLLECTION_NAME,
+            points          = [
+                models.PointStruct(id=point_id, vector=vector, payload={"page_content": text, "metadata": metadata})
+                for point_id, text, vector, metadata in zip(ids, texts, vectors, metadatas)
+            ]
+        )
+    if corpus is not None: corpus.add(ids, texts, metadatas, vectors)
+
+def embed_and_store(qdrant_client, texts: list[str], metadatas: list[dict], embeddings, corpus: CorpusWriter = None, dedup: DedupIndex = None) -> int:
+    """Embeds and stores the chunks that are not near-duplicates of stored ones (rag/dedup.py); returns how many were stored"""
+    ids = [str(uuid.uuid4()) for _ in texts]
+    if dedup is None:
+        store_chunks(qdrant_client, texts, embeddings.embed_documents(texts), metadatas, corpus, ids)
+        return len(texts)
+
+    plan  = dedup.check(ids, texts, exists=existing_points(qdrant_client, QDRANT_COLLECTION_NAME))
+    texts = [texts[i] for i in plan.keep]
+    if texts: store_chunks(qdrant_client, texts, embeddings.embed_documents(texts), [metadatas[i] for i in plan.keep], corpus, plan.ids)
+    dedup.commit(plan)
+    if plan.duplicates and DEDUP_CFG.get("mode", "skip") == "link":
+        links = {}
+        for i, point_id in plan.duplicates.items(): links.setdefault(point_id, []).append(metadatas[i]["source"])
+        link_duplicates(qdrant_client, QDRANT_COLLECTION_NAME, links)
+    if plan.duplicates: logger.info(f"🧬 {len(plan.duplicates)} of {len(ids)} chunks were near-duplicates and not embedded")
+    return len(texts)
+
+def store_text(qdrant_client, content, source: str, source_path: str, graph, embeddings, corpus: CorpusWriter = None,
+               dedup: DedupIndex = None, chunk_type: str = "text_chunk", extra_metadata: dict = None) -> int:
+    """
+        Chunks one document, adds its Document node to the graph and embeds and stores the chunks; returns how many were stored.
+        `content` is the text, or an iterator of page Documents (a lazy loader); chunks are embedded and upserted
+        retriever.embed_batch_size at a time, so one batch is the most held in memory
+    """
+    # Wraps raw text in a LangChain Document to use the text_splitter.py
+    pages  = [Document(page_content=content, metadata={"source": source})] if isinstance(content, str) else content
+    chunks = iter_split_documents(
+        pages,
+        chunk_size    = config.retriever.chunk_size,
+        chunk_overlap = config.retriever.chunk_overlap
+    )
+
+    # Creates a single Document node in the graph
+    document_id = str(uuid.uuid4())
+    graph.add_document(source_path=source_path, document_id=document_id, filename=source)
+    logger.debug(f"✔️  Queued Document node for: {source}")
+
+    # Embed the chunks batch by batch and store them in Qdrant (the embedder from get_embedder() times itself as "embed")
+    stored, batches = 0, batched(chunks, config.retriever.get("embed_batch_size", 64))
+    while True:
+        with span("chunk"):                                     # Includes loading the pages of this batch when `content` is lazy
+            batch = next(batches, None)
+        if batch is None: return stored
+        stored += embed_and_store(
+            qdrant_client,
+            texts      = [doc.page_content for doc in batch],
+            metadatas  = [{"source": source, "document_id": document_id, "type": chunk_type, **(extra_metadata or {}),
+                           **({"page": doc.metadata["page"]} if "page" in doc.metadata else {})} for doc in batch],
+            embeddings = embeddings,
+            corpus     = corpus,
+            dedup      = dedup
+        )
+
+def delete_source(qdrant_client, source: str, corpus: CorpusWriter = None):
+    """Removes the stored chunks of one source (a web page that changed is stored again from scratch), in Qdrant and the corpus store"""
+    with span("qdrant_write"):
+        qdrant_client.delete(collection_name=QDRANT_COLLECTION_NAME, points_selector=models.FilterSelector(filter=build_filter({"source": source})))
+    if corpus: corpus.delete_source(source)                 # Otherwise scripts/reindex.py would bring the old chunks back
+
+def ingest_web(sources: list[str], db_manager: DatabaseConnections, embeddings, graph, corpus: CorpusWriter = None, dedup: DedupIndex = None,
+               use_cache: bool = True) -> dict:
+    """
+        Fetches web pages and sitemaps concurrently (rag/web_loader.py) and stores the pages that are new or changed.
+        Unchanged pages (304, or the same content hash) are neither parsed nor embedded; a changed page replaces its old chunks.
+        Returns {status: pages}
+    """
+    fetcher       = get_web_fetcher(use_cache)
+    qdrant_client = db_manager.get_qdrant_client()
+    logger.info(f"🌐 Fetching {len(sources)} web sources")
+    counts = {}
+    for page in fetcher.fetch(sources):
+        counts[page.status] = counts.get(page.status, 0) + 1
+        if page.status == "failed":
+            logger.error(f"❌ Failed to fetch {page.url}: {page.error}")
+            continue
+        if page.status == "unchanged":
+            logger.debug(f"⏭️  Unchanged: {page.url}")
+            continue
+        try:
+            if page.status == "changed": delete_source(qdrant_client, page.url, corpus)
+            stored = store_text(qdrant_client, page.document.page_content, page.url, page.url, graph, embeddings, corpus, dedup,
+                                chunk_type="web_page", extra_metadata={"title": page.document.metadata.get("title", "")})
+            if fetcher.cache: fetcher.cache.commit(page)        # Only now: a failed store is fetched again next run
+            logger.info(f"✔️  Stored {stored} chunks in Qdrant for: {page.url}")
+        except Exception as e:
+            logger.error(f"❌ Failed to store {page.url}. Error: {e}")
+    if fetcher.cache: fetcher.cache.close()
+    logger.info(f"🌐 Web pages: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    return counts
+
+def process_and_store(file_path: str, db_manager: DatabaseConnections, embeddings, parsed=None, graph=None, corpus: CorpusWriter = None, dedup: DedupIndex = None):
+    """
+        Processes a single file, stores its content in Qdrant, and its metadata in the graph. Pass `parsed` to skip parsing.
+        `graph` is a MergeGraphLoader / CsvGraphWriter shared across files; without one, a loader is made for this file only.
+        `corpus` also records the chunks and vectors in the corpus store; with `dedup`, near-duplicate chunks are not embedded
+    """
+    own_graph = graph is None
     try:
         qdrant_client = db_manager.get_qdrant_client()
-        neo4j_driver  = db_manager.get_neo4j_driver()
+        if own_graph: graph = MergeGraphLoader(db_manager.get_neo4j_driver())
         file_ext      = Path(file_path).suffix.lower()
         filename      = os.path.basename(file_path)
+        if parsed is None: parsed = parse_file(file_path)
 
         # -- Dispatcher Logic --
         # 1. Hanfle CAD files
         if file_ext in CAD_EXTENSIONS:
-            cad_data = parse_step_file(file_path)
-            with neo4j_driver.session() as session:
-                for part in cad_data['parts']:
-                    session.run("""
-                        MERGE (p:Part {part_id: $part_id})
-                        SET p.volume = $volume, p.source_file = $filename""",
-                        part_id = part["part_id"],
-                        volume  = part["volume"],
-                        filename= filename
-                    )
-                    print(f"✔️  Created Part node in Neo4j for: {part['part_id']}")
-
-                    # Store a text summary for the part in Qdrant
-                    qdrant_client.add(
-                        collection_name = QDRANT_COLLECTION_NAME,
-                        documents       = [part['properties_text']],
-                        embeddings      = [embeddings.embed_query(part['properties_text'])],
-                        ids             = [str(uuid.uuid4())],
-                        metadatas       = [{"source": filename, "part_id": part['part_id'], "type": "cad_summary"}]
-                    )
-                    print(f"✔️  Stored vector summary in Qdrant for: {part['part_id']}")
+            cad_data = {"parts": cad_parts(parsed, filename)}
+            for part in cad_data['parts']:
+                graph.add_part(part_id=part["part_id"], volume=part["volume"], source_file=filename)
+                logger.debug(f"✔️  Queued Part node for: {part['part_id']}")
+
+            # Store a text summary for each part in Qdrant
+            summaries = [part['properties_text'] for part in cad_data['parts']]
+            stored = embed_and_store(
+                qdrant_client,
+                texts      = summaries,
+                metadatas  = [{"source": filename, "part_id": part['part_id'], "type": "cad_summary"} for part in cad_data['parts']],
+                embeddings = embeddings,
+                corpus     = corpus,
+                dedup      = dedup
+            ) if summaries else 0
+            logger.info(f"✔️  Stored {stored} part summaries in Qdrant for: {filename}")
 
         # 2. Handle Text-based Documents
         elif file_ext in MARKDOWN_EXTENSIONS:
-            content      = parse_document(file_path)
-            # Wraps raw text in a LangChain Document to use the text_splitter.py
-            temp_doc     = [Document(page_content=content, metadata={"source": filename})]  
-            chunked_docs = split_documents(
-                temp_doc,
-                chunk_size    = config.retriever.chunk_size,
-                chunk_overlap = config.retriever.chunk_overlap
-            )
-            chunk_texts  = [doc.page_content for doc in chunked_docs]
-
-            # Creates a single Document node in the graph
-            document_id = str(uuid.uuid4())
-            with neo4j_driver.session() as session:
-                session.run("""
-                    MERGE (d:Document {source_path: $source_path})
-                    SET d.document_id = $document_id, d.filename = $filename""",
-                    source_path = file_path,
-                    document_id = document_id,
-                    filename    = filename
-                )
-            print(f"✔️  Created Document node in Neo4j for: {filename}")
-
-            # Embed all chunks and store them in Qdrant
-            qdrant_client.add(
-                collection_name = QDRANT_COLLECTION_NAME,
-                documents       = chunk_texts,
-                embeddings      = embeddings.embed_documents(chunk_texts),
-                ids             = [str(uuid.uuid4()) for _ in chunk_texts],
-                metadatas       = [{"source": filename, "document_id": document_id, "type": "text_chunk"} for _ in chunk_texts]
-            )
-            print(f"️✔️  Stored {len(chunk_texts)} text chunks in Qdrant for: {filename}")
+            stored = store_text(qdrant_client, parsed, filename, file_path, graph, embeddings, corpus, dedup)
+            logger.info(f"️✔️  Stored {stored} text chunks in Qdrant for: {filename}")
         
         else:
-            print(f"⚠️ Unsupported file type: {filename}. Skipping.")
+            logger.warning(f"⚠️ Unsupported file type: {filename}. Skipping.")
             return
     
     except Exception as e:
-        print(f"❌ Failed to process {file_path}. Error: {e}")
+        logger.error(f"❌ Failed to process {file_path}. Error: {e}")
+    finally:
+        if own_graph and graph is not None: graph.close()
 
 @click.command()
 @click.option('--path', default='./data', help='Path to the directory or a single file to ingest')
-def ingest(path):
+@click.option('--metrics-file', default=None, help='Also write the stage metrics here in the Prometheus text format (node_exporter textfile collector)')
+@click.option('--graph-mode', type=click.Choice(['merge', 'csv']), default='merge', help='merge: batched MERGE into the live Neo4j; csv: write neo4j-admin import files')
+@click.option('--graph-csv-dir', default='./data/graph_import', help='Where --graph-mode csv writes the node/relationship CSVs')
+@click.option('--corpus/--no-corpus', default=CORPUS_STORE_CFG.get("enabled", True), help='Also write chunks and vectors to the corpus store (corpus_store.path)')
+@click.option('--dedup/--no-dedup', default=DEDUP_CFG.get("enabled", True), help='Skip (or link) chunks that near-duplicate stored ones instead of embedding them')
+@click.option('--reset-dedup', is_flag=True, help="Forget the collection's dedup index first")
+@click.option('--urls', 'urls_file', default=None, help='Ingest the web pages (or sitemaps) listed in this file, one URL per line, instead of --path')
+@click.option('--sitemap', 'sitemaps', multiple=True, help='Ingest every page of this sitemap (repeatable) instead of --path')
+@click.option('--http-cache/--no-http-cache', default=True, help='Skip web pages that did not change since the last run (conditional GETs)')
+@click.option('--profile', 'profile_run', is_flag=True, help='Write a sampling profile (speedscope) and the stage timings of this run to observability.profiling.dir')
+def ingest(path, metrics_file, graph_mode, graph_csv_dir, corpus, dedup, reset_dedup, urls_file, sitemaps, http_cache, profile_run):
     """Ingest documents from a specified path into the hybrid knowledge base, populating both the Qdrant vector store and the Neo4j graph database"""
+    sources = list(sitemaps)
+    if urls_file: sources += [line.strip() for line in Path(urls_file).read_text().splitlines() if line.strip() and not line.startswith("#")]
+    args    = (path, metrics_file, graph_mode, graph_csv_dir, corpus, dedup, reset_dedup, sources, http_cache)
+    if not profile_run: return run_ingest(*args)
+    with profiling.profile(f"ingest {urls_file or path}", trigger="cli"):
+        run_ingest(*args)
+
+def run_ingest(path, metrics_file, graph_mode, graph_csv_dir, corpus, dedup, reset_dedup, sources=(), http_cache=True):
     # Collection setup for Qdrant (pre-processing step), Neo4j connection is not needed at this stage
     db_manager = DatabaseConnections()
     qdrant     = db_manager.get_qdrant_client()
     embeddings = get_embedder()
 
-    # Ensure the Qdrant collection exists
-    try:
-        qdrant.get_collection(collection_name=QDRANT_COLLECTION_NAME)
-        print(f"🗂️  Using existing Qdrant collection: '{QDRANT_COLLECTION_NAME}'")
-    except Exception:
-        print(f"✨ Creating new Qdrant collection: '{QDRANT_COLLECTION_NAME}'")
-        # Dynamically get embedding size from the model
-        vector_size = len(embeddings.embed_query("test"))
-        qdrant.recreate_collection(
-            collection_name = QDRANT_COLLECTION_NAME,
-            vectors_config  = models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
-        )
+    # Ensure the Qdrant collection exists -- only created when nothing exists; a Qdrant error aborts instead of recreating it
+    target = ensure_collection(qdrant, QDRANT_COLLECTION_NAME)
+    logger.info(f"🗂️  Using Qdrant collection '{QDRANT_COLLECTION_NAME}' ('{target}')")
 
-    # Process files
-    if os.path.isdir(path):
-        print(f"📂 Processing directory: {path}")
-        for filename in os.listdir(path):
-            if not filename.startswith('.'): # Skips hidden files
-                file_path = os.path.join(path, filename)
-                if os.path.isfile(file_path): process_and_store(file_path, db_manager, embeddings)
+    # Collect files (web sources replace --path)
+    if sources:
+        file_paths = []
+    elif os.path.isdir(path):
+        logger.info(f"📂 Processing directory: {path}")
+        file_paths = [
+            os.path.join(path, filename) for filename in sorted(os.listdir(path))
+            if not filename.startswith('.') and os.path.isfile(os.path.join(path, filename))     # Skips hidden files
+        ]
     
     elif os.path.isfile(path):
-        print(f"📄 Processing single files: {path}")
-        process_and_store(path, db_manager, embeddings)
+        logger.info(f"📄 Processing single files: {path}")
+        file_paths = [path]
 
     else:
-        print(f"❌ Error: Provided path: '{path}' is not a valid file or directory.")
+        logger.error(f"❌ Error: Provided path: '{path}' is not a valid file or directory.")
         return
-    
+
+    # Graph nodes are buffered across files and written in batches (or to CSVs for an offline neo4j-admin import)
+    graph  = CsvGraphWriter(graph_csv_dir) if graph_mode == 'csv' else MergeGraphLoader(db_manager.get_neo4j_driver())
+    writer = CorpusWriter() if corpus else None
+    index  = get_dedup_index(QDRANT_COLLECTION_NAME) if dedup else None
+    if index and reset_dedup: index.reset()
+
+    # Web pages are fetched concurrently, unchanged ones skipped before they are parsed
+    if sources: ingest_web(sources, db_manager, embeddings, graph, corpus=writer, dedup=index, use_cache=http_cache)
+
+    supported = CAD_EXTENSIONS + MARKDOWN_EXTENSIONS
+    for file_path in file_paths:
+        if Path(file_path).suffix.lower() not in supported: logger.warning(f"⚠️ Unsupported file type: {os.path.basename(file_path)}. Skipping.")
+
+    # Parse concurrently in the parser containers, store each file as soon as its parse result arrives
+    for file_path, parsed in iter_parsed([p for p in file_paths if Path(p).suffix.lower() in supported]):
+        if isinstance(parsed, Exception):
+            logger.error(f"❌ Failed to parse {file_path}. Error: {parsed}")
+            continue
+        process_and_store(file_path, db_manager, embeddings, parsed=parsed, graph=graph, corpus=writer, dedup=index)
+
+    graph.close()                                               # Flushes the last batch and reports nodes/sec
+    if writer: writer.close()
+    parser_client.close()
     db_manager.close_connections()
-    print(f"\n✅ Ingestion complete.")
+    ClientRegistry.close_all()
+
+    # Where did the time go?
+    for stage, stats in telemetry.stage_summary().items():
+        logger.info(f"⏱️  {stage:14s} {stats['count']:6d} calls  {stats['total_s']:9.3f} s total  {stats['mean_ms']:9.2f} ms mean")
+    if index: logger.info(f"🧬 Dedup: {CHUNKS.value(result='kept'):.0f} chunks stored, {CHUNKS.value(result='duplicate'):.0f} near-duplicates not embedded")
+    if metrics_file: Path(metrics_file).write_text(telemetry.render_metrics())
+    logger.info(f"✅ Ingestion complete.")
 
 if __name__ == '__main__':
     ingest()
@@ -7,8 +7,9 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 load_dotenv()
-from src.rag_agent_framework.core.config import config
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))     # One module tree: rag_agent_framework.*, never src.*
 from rag_agent_framework.utils           import path_fix          # noqa: F401
+from rag_agent_framework.core.config     import config, VECTOR_DB_TYPE
 from rag_agent_framework.rag.rag_chain   import get_rag_chain     # Import the LCEL chain function
 
 # A command-line interface to query the RAG chain.
@@ -19,7 +20,7 @@ def main():
     args = parser.parse_args()
 
     qdrant_url = os.getenv("QDRANT_URL")
-    if not qdrant_url: raise RuntimeError("QDRANT_URL not set. Please check your .env file.")
+    if not qdrant_url and VECTOR_DB_TYPE == "qdrant": raise RuntimeError("QDRANT_URL not set. Please check your .env file.")
 
     # 1. Build the RAG chain
     print("Building RAG chain...")
@@ -0,0 +1,110 @@
+# scripts/reindex.py -- Rebuilds a Qdrant collection from the corpus store (rag/corpus_store.py) instead of re-running ingest
+# 1. Reads the chunk shards (Parquet) that ingest.py wrote -- nothing is parsed again
+# 2. Reuses the stored vectors of the configured embedding model (memory-mapped .npy); only shards without them are embedded,
+#    and those vectors are saved back so the next reindex with this model embeds nothing
+# 3. Bulk-uploads everything with QdrantClient.upload_collection into a new versioned collection while readers keep using the old one,
+#    then atomically swaps the alias (rag/collections.py) and keeps `--keep` older versions for --rollback
+#   poetry run python scripts/reindex.py --collection rag_collection [--keep 1]
+#   poetry run python scripts/reindex.py --collection rag_collection --rollback
+
+import sys
+import json
+import time
+import click
+import numpy as np
+from pathlib import Path
+# -- Add project root to path to allow submodule imports --
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root / "src"))
+
+from rag_agent_framework.core                import telemetry
+from rag_agent_framework.core.clients        import ClientRegistry
+from rag_agent_framework.core.config         import config
+from rag_agent_framework.core.telemetry      import span
+from rag_agent_framework.rag.corpus_store    import CorpusStore, model_key
+from rag_agent_framework.rag.vector_store    import get_embedder
+from rag_agent_framework.rag.collections     import KEEP_VERSIONS, new_version, swap_alias, rollback
+
+logger = telemetry.get_logger("scripts.reindex")
+
+
+def shard_vectors(store: CorpusStore, shard: dict, texts: list[str], key: str, embeddings, embed_batch: int) -> tuple[np.ndarray, bool]:
+    """The shard's vectors for model `key`: read from the store, or embedded now and saved. Returns (vectors, reused)"""
+    vectors = store.read_embeddings(shard["name"], key)
+    if vectors is not None: return vectors, True
+
+    embedded = []
+    for start in range(0, len(texts), embed_batch):
+        embedded.extend(embeddings.embed_documents(texts[start:start + embed_batch]))
+    store.add_embeddings(shard["name"], key, embedded)
+    return store.read_embeddings(shard["name"], key), False
+
+def upload_shards(client, store: CorpusStore, target: str, key: str, embeddings, batch_size: int, parallel: int, embed_batch: int) -> tuple[int, int]:
+    """Uploads every shard into `target`; returns (points with stored vectors, points embedded now)"""
+    reused, embedded = 0, 0
+    for shard in store.shards:
+        table    = store.read_chunks(shard["name"])
+        texts    = table.column("text").to_pylist()
+        vectors, was_stored = shard_vectors(store, shard, texts, key, embeddings, embed_batch)
+        live     = store.live_rows(shard["name"], table.column("source").to_pylist())     # Rows of sources stored again later are dead
+        if not live.all():
+            table, vectors = table.filter(live), vectors[live]
+            texts          = table.column("text").to_pylist()
+        if was_stored: reused += len(texts)
+        else:          embedded += len(texts)
+        if not texts: continue
+
+        payloads = [{"page_content": text, "metadata": json.loads(metadata)} for text, metadata in zip(texts, table.column("metadata").to_pylist())]
+        with span("qdrant_write"):
+            client.upload_collection(collection_name=target, vectors=vectors, payload=payloads, ids=table.column("id").to_pylist(),
+                                     batch_size=batch_size, parallel=parallel, wait=True)
+        logger.info(f"✔️  {shard['name']}: {len(texts)} points ({'stored vectors' if was_stored else 'embedded now'})")
+
+    return reused, embedded
+
+@click.command()
+@click.option('--collection', default=config.vector_db.default_collection_name, help='Alias to rebuild; readers use this name')
+@click.option('--store', 'store_path', default=None, help='Corpus store directory (defaults to corpus_store.path)')
+@click.option('--keep', default=KEEP_VERSIONS, help='Older versions to keep after the swap, for --rollback')
+@click.option('--rollback', 'roll_back', is_flag=True, help='Point the alias back at the previous version and exit')
+@click.option('--batch-size', default=512, help='Points per upload request')
+@click.option('--parallel', default=2, help='Concurrent upload workers')
+@click.option('--embed-batch', default=64, help='Chunks per embedding call for shards without stored vectors')
+def reindex(collection, store_path, keep, roll_back, batch_size, parallel, embed_batch):
+    """Rebuild a collection from the corpus store at bulk-upload speed, without taking it offline"""
+    if roll_back:
+        rollback(ClientRegistry.get_qdrant_client(), collection)
+        ClientRegistry.close_all()
+        return
+
+    store = CorpusStore(store_path)
+    if not store.shards:
+        logger.error(f"❌ The corpus store at {store.path} is empty, run scripts/ingest.py first.")
+        return
+
+    client     = ClientRegistry.get_qdrant_client()
+    embeddings = get_embedder()
+    key        = model_key()
+    logger.info(f"🗄️  Corpus store v{store.manifest['version']}: {store.stats()['chunks']} chunks in {len(store.shards)} shards, model '{key}'")
+
+    dims   = next((shard["embeddings"][key] for shard in store.shards if key in shard["embeddings"]), None) or len(embeddings.embed_query("test"))
+    target = new_version(client, collection, dims)                  # Invisible to readers until the swap
+    logger.info(f"🏗️  Building '{target}' for alias '{collection}'")
+
+    start = time.perf_counter()
+    try:
+        reused, embedded = upload_shards(client, store, target, key, embeddings, batch_size, parallel, embed_batch)
+    except Exception:
+        client.delete_collection(target)                            # The alias still points at the old version
+        logger.error(f"❌ Rebuild failed, dropped '{target}'; '{collection}' is unchanged")
+        raise
+
+    elapsed = time.perf_counter() - start
+    total   = reused + embedded
+    swap_alias(client, collection, target, keep)
+    ClientRegistry.close_all()
+    logger.info(f"✅ Rebuilt '{collection}' as '{target}': {total} points in {elapsed:.1f}s ({total / elapsed:.0f} points/s), "
+                f"{reused} with stored vectors, {embedded} embedded")
+
+if __name__ == '__main__':
+    reindex()
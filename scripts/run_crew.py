@@ -8,7 +8,6 @@ from pathlib import Path
 from dotenv import load_dotenv
 load_dotenv()
 from rag_agent_framework.utils import path_fix # noqa: F401
-from rag_agent_framework.agents.crew import agent_crew      # instead of get_crew for more flexible, recreate the crew dynamically, change its config, etc.
 
 def main():
     """A command-line interface to run the agentic crew"""
@@ -16,6 +15,9 @@ def main():
     parser.add_argument("topic", type=str, help="The topic of the question for the crew to research")
     args = parser.parse_args()
 
+    # Imported after argument parsing so `--help` and bad arguments don't pay for building crewai and the LLM client
+    from rag_agent_framework.agents.crew import get_crew
+
     # Prepare the inputs for the crew's kickoff
     inputs = {
         "topic": args.topic,
@@ -26,7 +28,7 @@ def main():
     print("-" * 100)
 
     # Run the crew
-    result = agent_crew.kickoff(inputs = inputs)
+    result = get_crew().kickoff(inputs = inputs)
 
     print("\n\n--- Crew Run Complete ---")
     print("Final Result:")
@@ -6,38 +6,47 @@
 #   b. Once parsing complete, runner.py takes a dict of results -> JSON string -> prints it to its standard output
 # 4. The main.py captures the (JSON string) from runner.py -> sends it as the HTTP response
 #   c. The temporary file is deleted
+# /parse_cad/batch does the same for many files (or one .zip/.tar archive): every file gets its own runner.py
+# subprocess, at most BATCH_WORKERS of them at once across all batches (one shared pool), and one NDJSON line is
+# streamed back per file as soon as it finishes
 
 ## Run the Test
 # docker compose up -d --build
 # curl -X POST -F "file=@services/cad-parser/test/Part2.STEP" http://localhost:8001/parse_cad/
+# curl -N -X POST -F "files=@services/cad-parser/test/Part2.STEP" -F "files=@other.step" http://localhost:8001/parse_cad/batch
 
-import os, sys, json, shutil, tempfile, logging, subprocess
-from fastapi           import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+import os, sys, json, shutil, tarfile, zipfile, tempfile, logging, subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing             import List
+from fastapi            import FastAPI, File, UploadFile, HTTPException
+from fastapi.responses  import JSONResponse, StreamingResponse
 
 # Configure logging
 logging.basicConfig(
-    level  = os.getenv("LOG_LEVEL", "INFO"), 
+    level  = os.getenv("LOG_LEVEL", "INFO"),
     format = "%(asctime)s %(levelname)s %(name)s %(message)s"
 )
 logger = logging.getLogger("cad-parser")
 
+CAD_EXTENSIONS     = (".step", ".stp", ".iges", ".igs")
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+BATCH_WORKERS      = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 4)))     # Concurrent runner.py subprocesses, process-wide
+MAX_BATCH_FILES    = int(os.getenv("MAX_BATCH_FILES", "500"))
+PARSE_TIMEOUT      = int(os.getenv("PARSE_TIMEOUT_S", "120"))
+
 app = FastAPI(title = "CAD Parsing Service")
 
-@app.post("/parse_cad/")
-def parse_cad_endpoint(file: UploadFile = File(...)):
-    """
-        Parses a CAD file by running the core logic in an isolated subprocess for maximum stability.
-    """
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in (".step", ".stp", ".iges", ".igs"):
-        raise HTTPException(status_code=400, detail="Unsupported CAD format")
 
-    # Create a temporary file to store the upload
-    with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        temp_file_path = tmp.name
+class ParseFailed(Exception):
+    """Raised when the runner subprocess could not parse a file. Carries the HTTP status to report"""
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail      = detail
+
 
+def _run_parser(temp_file_path: str) -> dict:
+    """Runs runner.py on a file saved to disk and returns its parsed JSON output, raising ParseFailed on any error"""
     try:
         # Prepare the command to run the parser script in a separate process
         # This uses the same Python executable that the app is running in
@@ -50,27 +59,148 @@ def parse_cad_endpoint(file: UploadFile = File(...)):
             command,
             check          = True,
             capture_output = True,
-            text           = True,  # decoded as string rather raw bytes
-            timeout        = 120    # 2-minute timeout
+            text           = True,          # decoded as string rather raw bytes
+            timeout        = PARSE_TIMEOUT  # 2-minute timeout by default
         )
 
         # The JSON output from the script is in process.stdout
         logger.info("Subprocess executed successfully.")
-        result = json.loads(process.stdout)
-        
+        return json.loads(process.stdout)
+
     except subprocess.CalledProcessError as e:
         # This error is raised if the script exits with an error
         logger.error(f"The parsing script failed with exit code {e.returncode}.")
         logger.error(f"Stderr: {e.stderr}")
-        raise HTTPException(status_code=500, detail=f"Failed to parse CAD file. See server logs for details.")
+        raise ParseFailed(500, "Failed to parse CAD file. See server logs for details.")
     except subprocess.TimeoutExpired:
         logger.error("The parsing script timed out.")
-        raise HTTPException(status_code=500, detail="Parsing process timed out.")
-    except Exception as e:
+        raise ParseFailed(500, "Parsing process timed out.")
+    except Exception:
         logger.exception("An unexpected error occurred while managing the subprocess.")
-        raise HTTPException(status_code=500, detail="An internal server error occurred.")
+        raise ParseFailed(500, "An internal server error occurred.")
+
+
+@app.post("/parse_cad/")
+def parse_cad_endpoint(file: UploadFile = File(...)):
+    """
+        Parses a CAD file by running the core logic in an isolated subprocess for maximum stability.
+    """
+    ext = os.path.splitext(file.filename)[1].lower()
+    if ext not in CAD_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Unsupported CAD format")
+
+    # Create a temporary file to store the upload
+    with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
+        shutil.copyfileobj(file.file, tmp)
+        temp_file_path = tmp.name
+
+    try:
+        result = _run_parser(temp_file_path)
+    except ParseFailed as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     finally:
         # Crucially, ensure the temporary file is always deleted
         os.unlink(temp_file_path)
 
-    return JSONResponse(content=result)
\ No newline at end of file
+    return JSONResponse(content=result)
+
+
+# ——— Batch parsing ———
+# Every batch submits to one pool (created on first use), so concurrent batches share BATCH_WORKERS subprocesses
+_batch_pool = None
+
+def _get_batch_pool() -> ThreadPoolExecutor:
+    global _batch_pool
+    if _batch_pool is None:
+        _batch_pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="cad-batch")
+    return _batch_pool
+
+@app.on_event("shutdown")
+def _shutdown_batch_pool():
+    if _batch_pool is not None:
+        _batch_pool.shutdown(cancel_futures=True)
+
+class BatchTooLarge(Exception):
+    """Raised while spooling as soon as a batch has more than MAX_BATCH_FILES files"""
+
+def _spool_path(work_dir: str, spooled: list, name: str) -> str:
+    if len(spooled) >= MAX_BATCH_FILES: raise BatchTooLarge()
+    return os.path.join(work_dir, f"{len(spooled):05d}_{name}")
+
+def _is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS)
+
+def _spool_archive(upload: UploadFile, work_dir: str, spooled: list[tuple[str, str]]):
+    """Extracts the regular files of a .zip/.tar upload into work_dir. Member paths are flattened to avoid path traversal"""
+    if upload.filename.lower().endswith(".zip"):
+        with zipfile.ZipFile(upload.file) as archive:
+            for member in archive.infolist():
+                if member.is_dir(): continue
+                name = os.path.basename(member.filename)
+                path = _spool_path(work_dir, spooled, name)
+                with archive.open(member) as src, open(path, "wb") as dst: shutil.copyfileobj(src, dst)
+                spooled.append((name, path))
+    else:
+        with tarfile.open(fileobj=upload.file, mode="r:*") as archive:
+            for member in archive:
+                if not member.isfile(): continue
+                name = os.path.basename(member.name)
+                path = _spool_path(work_dir, spooled, name)
+                with archive.extractfile(member) as src, open(path, "wb") as dst: shutil.copyfileobj(src, dst)
+                spooled.append((name, path))
+
+def _spool_uploads(files: List[UploadFile], work_dir: str) -> list[tuple[str, str]]:
+    """Copies every upload (or every archive member) to disk so parsing can outlive the request body; stops at MAX_BATCH_FILES"""
+    spooled = []
+    for upload in files:
+        if _is_archive(upload.filename):
+            _spool_archive(upload, work_dir, spooled)
+            continue
+        name = os.path.basename(upload.filename)                               # Same flattening as archive members
+        path = _spool_path(work_dir, spooled, name)
+        with open(path, "wb") as dst: shutil.copyfileobj(upload.file, dst)
+        spooled.append((name, path))
+    return spooled
+
+def _parse_one(filename: str, path: str) -> dict:
+    """Parses a single spooled file and always returns a result line -- one bad file never fails the whole batch"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in CAD_EXTENSIONS:
+        return {"filename": filename, "status": "error", "status_code": 400, "detail": "Unsupported CAD format"}
+    try:
+        return {"filename": filename, "status": "ok", "result": _run_parser(path)}
+    except ParseFailed as e:
+        return {"filename": filename, "status": "error", "status_code": e.status_code, "detail": e.detail}
+
+def _stream_results(spooled: list[tuple[str, str]], work_dir: str):
+    """Fans the files out over the shared pool and yields one NDJSON line per file in completion order"""
+    futures = [_get_batch_pool().submit(_parse_one, name, path) for name, path in spooled]
+    try:
+        for future in as_completed(futures):
+            yield json.dumps(future.result()) + "\n"
+    finally:
+        for future in futures: future.cancel()          # Client went away: free the pool for other batches
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+@app.post("/parse_cad/batch")
+def parse_cad_batch_endpoint(files: List[UploadFile] = File(...)):
+    """
+        Parses many CAD files (or the members of .zip/.tar archives) in one request.
+        Streams back application/x-ndjson: one {"filename", "status", "result" | "detail"} line per file as each completes.
+    """
+    work_dir = tempfile.mkdtemp(prefix="cad-batch-")
+    try:
+        spooled = _spool_uploads(files, work_dir)
+    except BatchTooLarge:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_FILES} files")
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=f"Unreadable archive: {e}")
+
+    if not spooled:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail="No files found in the batch")
+
+    logger.info(f"Parsing batch of {len(spooled)} file(s) on the shared pool of {BATCH_WORKERS} worker(s)")
+    return StreamingResponse(_stream_results(spooled, work_dir), media_type="application/x-ndjson")
@@ -0,0 +1,71 @@
+# services/cad-parser/test/test_batch.py
+import io
+import os
+import sys
+import json
+import zipfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app")))
+from fastapi.testclient import TestClient
+from main import app
+
+TEST_FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "Part2.STEP"))
+client = TestClient(app)
+
+def _lines(response):
+    return {line["filename"]: line for line in map(json.loads, response.text.splitlines())}
+
+def test_batch_isolates_per_file_errors():
+    """A good STEP file and an unsupported file in one batch each get their own result line"""
+    with open(TEST_FILE_PATH, "rb") as step:
+        response = client.post("/parse_cad/batch", files=[
+            ("files", ("Part2.STEP", step.read())),
+            ("files", ("notes.txt", b"not a cad file")),
+        ])
+
+    assert response.status_code == 200
+    results = _lines(response)
+    assert results["Part2.STEP"]["status"] == "ok"
+    assert "volume" in results["Part2.STEP"]["result"]
+    assert results["notes.txt"]["status"] == "error"
+    assert results["notes.txt"]["status_code"] == 400
+
+def test_batch_accepts_zip_archive():
+    """Every member of an uploaded .zip is parsed as its own file"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.write(TEST_FILE_PATH, "parts/Part2.STEP")
+        archive.write(TEST_FILE_PATH, "Part2_copy.STEP")
+
+    response = client.post("/parse_cad/batch", files=[("files", ("parts.zip", buffer.getvalue()))])
+
+    assert response.status_code == 200
+    results = _lines(response)
+    assert set(results) == {"Part2.STEP", "Part2_copy.STEP"}
+    assert all(line["status"] == "ok" for line in results.values())
+
+def test_batch_over_the_file_limit_is_rejected_while_spooling(monkeypatch, tmp_path):
+    """The 413 comes as soon as the limit is passed; nothing is left in the work dir and no file is parsed"""
+    import main
+    monkeypatch.setattr(main, "MAX_BATCH_FILES", 2)
+    batch_dir = tmp_path / "batch"
+    def mkdtemp(prefix):
+        batch_dir.mkdir()
+        return str(batch_dir)
+    monkeypatch.setattr(main.tempfile, "mkdtemp", mkdtemp)
+    written = []
+    real    = main._spool_path
+    monkeypatch.setattr(main, "_spool_path", lambda *args: written.append(args[-1]) or real(*args))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for i in range(5): archive.writestr(f"part{i}.step", b"ISO-10303-21;")
+
+    response = client.post("/parse_cad/batch", files=[("files", ("parts.zip", buffer.getvalue()))])
+    assert response.status_code == 413
+    assert len(written) == 3 and not batch_dir.exists()
+
+def test_batch_flattens_uploaded_filenames():
+    """A plain upload's client-supplied path is basename'd like an archive member's, in the result and on disk"""
+    response = client.post("/parse_cad/batch", files=[("files", ("../../etc/notes.txt", b"not a cad file"))])
+
+    assert response.status_code == 200
+    assert list(_lines(response)) == ["notes.txt"]
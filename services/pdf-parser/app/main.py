@@ -1,8 +1,11 @@
 # services/pdf-parser/app/main.py
 
-import os, shutil, tempfile, logging
+import os, json, shutil, asyncio, tarfile, zipfile, tempfile, logging, threading
+from concurrent.futures      import Future, ProcessPoolExecutor
+from typing                  import List
 from fastapi                 import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses       import JSONResponse
+from fastapi.concurrency     import run_in_threadpool
+from fastapi.responses       import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic                import BaseModel
 from pdf_parser              import convert_to_markdown, ParseError
@@ -10,6 +13,10 @@ from pdf_parser              import convert_to_markdown, ParseError
 # ——— Load configuration ———
 MAX_UPLOAD_MB   = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
 MAX_UPLOAD_SIZE = MAX_UPLOAD_MB * (1 << 20)     # in bytes: 1024 * 1024
+BATCH_WORKERS   = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 4)))    # Parser processes shared by all batch requests
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "500"))
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+DOCUMENT_EXTENSIONS = (".pdf", ".docx", ".pptx")    # Everything MarkItDown converts that ingestion sends here
 
 # ——— Logging Setup ———
 logging.basicConfig(
@@ -41,8 +48,9 @@ class ParsePDFResponse(BaseModel):
 @app.post("/parse_pdf/", response_model=ParsePDFResponse, summary="Parse a PDF to Markdown")
 async def parse_pdf_endpoint(file: UploadFile = File(...)):
     # 1. Validate  file tpe
-    if not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are accepted")
+    ext = os.path.splitext(file.filename)[1].lower()
+    if ext not in DOCUMENT_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Only PDF, DOCX and PPTX files are accepted")
     
     # 2. Enfore a configurable size limit
     chunk  = await file.read(MAX_UPLOAD_SIZE + 1)       # read the file into chunk (binary data) + extra 1 byte
@@ -52,7 +60,7 @@ async def parse_pdf_endpoint(file: UploadFile = File(...)):
     await file.seek(0)      # Moves the file pointer back to the beginning if size no exceeds
 
     # 3. Write to a safe temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:     # MarkItDown picks its converter by extension
         shutil.copyfileobj(file.file, tmp)
         temp_path = tmp.name
 
@@ -76,4 +84,151 @@ async def parse_pdf_endpoint(file: UploadFile = File(...)):
         try:
             os.unlink(temp_path)
         except OSError:
-            logger.warning(f"Failed to delete temp file {temp_path}")
\ No newline at end of file
+            logger.warning(f"Failed to delete temp file {temp_path}")
+
+
+# ——— Batch parsing ———
+# Markitdown is CPU-bound pure Python, so batch files are fanned out over a process pool (created on first use)
+_batch_pool = None
+
+def _get_batch_pool() -> ProcessPoolExecutor:
+    global _batch_pool
+    if _batch_pool is None:
+        _batch_pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+    return _batch_pool
+
+@app.on_event("shutdown")
+def _shutdown_batch_pool():
+    if _batch_pool is not None:
+        _batch_pool.shutdown(cancel_futures=True)
+
+class BatchTooLarge(Exception):
+    """Raised while spooling as soon as a batch has more than MAX_BATCH_FILES files"""
+
+class FileTooLarge(Exception):
+    """Raised while copying a file to disk as soon as it passes MAX_UPLOAD_SIZE"""
+
+COPY_CHUNK = 1 << 20
+
+def _copy_capped(src, dst):
+    """Copies src to dst in chunks and stops as soon as more than MAX_UPLOAD_SIZE bytes have been read"""
+    copied = 0
+    while chunk := src.read(COPY_CHUNK):
+        copied += len(chunk)
+        if copied > MAX_UPLOAD_SIZE: raise FileTooLarge()
+        dst.write(chunk)
+
+def _spool_uploads(files: List[UploadFile], work_dir: str) -> list[tuple[str, str | None]]:
+    """
+        Copies every upload (or every .zip/.tar member) to disk so parsing can outlive the request body. Member paths are flattened.
+        A file over MAX_UPLOAD_SIZE is never kept on disk: it is spooled with path None and reported as a 413 line.
+    """
+    spooled = []
+
+    def _write(name, src, size=None):
+        if len(spooled) >= MAX_BATCH_FILES: raise BatchTooLarge()           # Stop before spooling the rest of an oversized batch
+        name = os.path.basename(name)
+        if size is not None and size > MAX_UPLOAD_SIZE:                    # Declared size of an archive member: skip without extracting
+            spooled.append((name, None))
+            return
+        path = os.path.join(work_dir, f"{len(spooled):05d}_{name}")
+        try:
+            with open(path, "wb") as dst: _copy_capped(src, dst)
+        except FileTooLarge:                                                # Declared sizes can lie (zip bombs): the copy is capped too
+            os.unlink(path)
+            path = None
+        spooled.append((name, path))
+
+    for upload in files:
+        lowered = upload.filename.lower()
+        if lowered.endswith(".zip"):
+            with zipfile.ZipFile(upload.file) as archive:
+                for member in archive.infolist():
+                    if member.is_dir(): continue
+                    if member.file_size > MAX_UPLOAD_SIZE:
+                        _write(member.filename, None, member.file_size)
+                        continue
+                    with archive.open(member) as src: _write(member.filename, src)
+        elif lowered.endswith(ARCHIVE_EXTENSIONS):
+            with tarfile.open(fileobj=upload.file, mode="r:*") as archive:
+                for member in archive:
+                    if not member.isfile(): continue
+                    if member.size > MAX_UPLOAD_SIZE:
+                        _write(member.name, None, member.size)
+                        continue
+                    with archive.extractfile(member) as src: _write(member.name, src)
+        else:
+            _write(upload.filename, upload.file)
+    return spooled
+
+def _error_line(filename: str, status_code: int, detail: str) -> str:
+    return json.dumps({"filename": filename, "status": "error", "status_code": status_code, "detail": detail}) + "\n"
+
+def _submit(filename: str, path: str | None) -> Future | str:
+    """Submits one spooled file to the process pool, or returns its NDJSON error line if it is rejected up front"""
+    if not filename.lower().endswith(DOCUMENT_EXTENSIONS):
+        return _error_line(filename, 400, "Only PDF, DOCX and PPTX files are accepted")
+    if path is None:
+        return _error_line(filename, 413, f"File exceeds {MAX_UPLOAD_MB} MB")
+    return _get_batch_pool().submit(convert_to_markdown, path)
+
+async def _result_line(filename: str, future: Future) -> str:
+    """Awaits one parse and always returns an NDJSON line -- one bad file never fails the batch"""
+    try:
+        markdown_text = await asyncio.wrap_future(future)
+        return json.dumps({"filename": filename, "status": "ok", "result": {"markdown_content": markdown_text}}) + "\n"
+    except ParseError as pe:
+        logger.error(f"! Parsing failed for {filename} !", exc_info = pe)
+        return _error_line(filename, 422, str(pe))
+    except Exception:
+        logger.exception(f"Unexpected error during parsing of {filename}")
+        return _error_line(filename, 500, "Internal server error")
+
+def _remove_when_done(futures: list[Future], work_dir: str):
+    """Cancels the parses that have not started and removes work_dir once the running ones, which still read from it, finish"""
+    for future in futures: future.cancel()
+    running = [future for future in futures if not future.done()]
+    if not running:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return
+    lock, left = threading.Lock(), [len(running)]
+    def _finished(_):
+        with lock:
+            left[0] -= 1
+            last = left[0] == 0
+        if last: shutil.rmtree(work_dir, ignore_errors=True)
+    for future in running: future.add_done_callback(_finished)
+
+async def _stream_results(spooled: list[tuple[str, str | None]], work_dir: str):
+    """Yields one NDJSON line per file in completion order, then removes the spooled files"""
+    submitted = [(name, _submit(name, path)) for name, path in spooled]
+    futures   = [future for _, future in submitted if isinstance(future, Future)]
+    try:
+        for _, rejected in submitted:
+            if isinstance(rejected, str): yield rejected
+        for next_done in asyncio.as_completed([_result_line(name, future) for name, future in submitted if isinstance(future, Future)]):
+            yield await next_done
+    finally:
+        _remove_when_done(futures, work_dir)            # No await here: a disconnected client cancels this generator
+
+@app.post("/parse_pdf/batch", summary="Parse many PDFs (or a .zip/.tar of PDFs) to Markdown")
+async def parse_pdf_batch_endpoint(files: List[UploadFile] = File(...)):
+    """
+        Streams back application/x-ndjson: one {"filename", "status", "result" | "detail"} line per file as each completes.
+    """
+    work_dir = tempfile.mkdtemp(prefix="pdf-batch-")
+    try:
+        spooled = await run_in_threadpool(_spool_uploads, files, work_dir)
+    except BatchTooLarge:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_FILES} files")
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=f"Unreadable archive: {e}")
+
+    if not spooled:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail="No files found in the batch")
+
+    logger.info(f"Parsing batch of {len(spooled)} file(s) with {BATCH_WORKERS} worker process(es)")
+    return StreamingResponse(_stream_results(spooled, work_dir), media_type="application/x-ndjson")
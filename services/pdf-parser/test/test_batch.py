@@ -0,0 +1,108 @@
+# services/pdf-parser/test/test_batch.py
+import io
+import os
+import sys
+import json
+import time
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app")))
+from fastapi.testclient import TestClient
+import main
+from main import app
+
+TEST_FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "W-4.pdf"))
+client = TestClient(app)
+
+def _lines(response):
+    return {line["filename"]: line for line in map(json.loads, response.text.splitlines())}
+
+def _pdf() -> bytes:
+    with open(TEST_FILE_PATH, "rb") as pdf:
+        return pdf.read()
+
+def test_batch_streams_one_line_per_file():
+    """A good PDF and an unsupported file in one batch each get their own NDJSON result line"""
+    response = client.post("/parse_pdf/batch", files=[
+        ("files", ("W-4.pdf", _pdf())),
+        ("files", ("notes.txt", b"not a document")),
+    ])
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = _lines(response)
+    assert results["W-4.pdf"]["status"] == "ok"
+    assert results["W-4.pdf"]["result"]["markdown_content"]
+    assert results["notes.txt"]["status"] == "error"
+    assert results["notes.txt"]["status_code"] == 400
+
+def test_batch_accepts_zip_archive():
+    """Every member of an uploaded .zip is parsed as its own file, with its path flattened"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.write(TEST_FILE_PATH, "forms/W-4.pdf")
+        archive.write(TEST_FILE_PATH, "W-4_copy.pdf")
+
+    response = client.post("/parse_pdf/batch", files=[("files", ("forms.zip", buffer.getvalue()))])
+
+    assert response.status_code == 200
+    results = _lines(response)
+    assert set(results) == {"W-4.pdf", "W-4_copy.pdf"}
+    assert all(line["status"] == "ok" for line in results.values())
+
+def test_batch_over_the_file_limit_is_rejected_while_spooling(monkeypatch, tmp_path):
+    """The 413 comes as soon as the limit is passed and nothing is left in the work dir"""
+    monkeypatch.setattr(main, "MAX_BATCH_FILES", 2)
+    batch_dir = tmp_path / "batch"
+    def mkdtemp(prefix):
+        batch_dir.mkdir()
+        return str(batch_dir)
+    monkeypatch.setattr(main.tempfile, "mkdtemp", mkdtemp)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for i in range(5): archive.writestr(f"form{i}.pdf", b"%PDF-1.4")
+
+    response = client.post("/parse_pdf/batch", files=[("files", ("forms.zip", buffer.getvalue()))])
+    assert response.status_code == 413
+    assert not batch_dir.exists()
+
+def test_oversized_files_are_rejected_without_being_spooled(monkeypatch, tmp_path):
+    """A plain upload or archive member over MAX_UPLOAD_SIZE gets a 413 line and never lands whole in the work dir"""
+    monkeypatch.setattr(main, "MAX_UPLOAD_SIZE", 4096)
+    monkeypatch.setattr(main, "COPY_CHUNK", 1024)
+    written = []
+    real    = main._copy_capped
+    def copy(src, dst):
+        try:
+            real(src, dst)
+        finally:
+            written.append(dst.tell())
+    monkeypatch.setattr(main, "_copy_capped", copy)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("bomb.pdf", b"\0" * (1 << 20))          # Compresses to ~1 KB, declares 1 MB
+
+    response = client.post("/parse_pdf/batch", files=[
+        ("files", ("big.pdf", b"%PDF-1.4" + b"\0" * 8192)),
+        ("files", ("bombs.zip", buffer.getvalue())),
+    ])
+
+    assert response.status_code == 200
+    results = _lines(response)
+    assert {name: line["status_code"] for name, line in results.items()} == {"big.pdf": 413, "bomb.pdf": 413}
+    assert written == [4096]                                      # Copy stopped at the cap; the member was never extracted
+
+def test_disconnect_waits_for_running_parses_before_removing_the_work_dir(tmp_path):
+    """Queued parses are cancelled; the spooled files stay until the parse still reading them has finished"""
+    release = threading.Event()
+    pool    = ThreadPoolExecutor(max_workers=1)
+    running = pool.submit(release.wait)
+    queued  = pool.submit(time.sleep, 0)
+    time.sleep(0.05)
+
+    main._remove_when_done([running, queued], str(tmp_path))
+    assert queued.cancelled() and tmp_path.exists()
+    release.set()
+    pool.shutdown()                                               # Done callbacks run on the worker before it exits
+    assert not tmp_path.exists()
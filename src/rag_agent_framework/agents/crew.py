@@ -1,18 +1,114 @@
 # src/rag_agent_framework/agents/crew.py -- Crew Assembly -- The entire agentic system defintions
+# The crew (and the LLM client, agents and tools under it) is assembled on first use, not at import
+# A Crew is not safe to share between threads: kickoff() interpolates the inputs into its Task objects and stores each task's output
+# on them. Concurrent /chat requests therefore each check out their own crew from a CrewPool (kickoff() below):
+# 1. Crews are built by build_crew(); their agents and tasks are new objects, the LLM clients (ClientRegistry) and tools are shared
+# 2. `size` crews are built ahead (at warmup); a checkout when all are busy builds another, and up to `max_idle` are kept afterwards
+# 3. get_crew() still returns one crew for the single-threaded CLIs (chat.py, run_crew.py)
 
+import queue
+import threading
+from contextlib       import contextmanager
 from crewai           import Crew, Process
-from .research_agents import document_researcher, general_researcher, report_writer, llm
-from .tasks           import document_research_task, web_research_task, writer_task
-
-# Assemble the new sequential crew
-agent_crew = Crew(
-    agents = [document_researcher, general_researcher, report_writer],
-    tasks = [document_research_task, web_research_task, writer_task],
-    process = Process.sequential,
-    manager_llm=llm,
-    verbose = True
-)
-
-def get_crew():
-    """Returns the configured agent crew"""
-    return agent_crew
\ No newline at end of file
+
+from rag_agent_framework.core.config    import AGENT_CFG
+from rag_agent_framework.core.telemetry import Gauge, register, get_logger
+from .research_agents import build_agents, get_llm
+from .tasks           import build_tasks
+
+logger = get_logger(__name__)
+
+POOL_CREWS = register(Gauge("rag_crew_pool_crews", "Crews of the per-request pool", ("state",)))
+
+_crew      = None
+_crew_lock = threading.Lock()
+
+def build_crew(llm = None) -> Crew:
+    """Assembles the sequential crew"""
+    agents = build_agents(llm)              # Each agent on its role's model (llm.roles), or all on `llm`
+    return Crew(
+        agents = list(agents.values()),
+        tasks = build_tasks(**agents),
+        process = Process.sequential,
+        manager_llm=llm or get_llm("writer"),
+        verbose = True
+    )
+
+def get_crew() -> Crew:
+    """Returns the configured agent crew, building it on first use"""
+    global _crew
+    if _crew is None:
+        with _crew_lock:
+            if _crew is None: _crew = build_crew()
+    return _crew
+
+
+class CrewPool:
+    """Hands each caller a crew no other thread is using; `factory()` builds one"""
+
+    def __init__(self, factory = build_crew, size: int = 4, max_idle: int = 8):
+        self.factory  = factory
+        self.size     = size
+        self.max_idle = max(max_idle, size)
+        self._idle    = queue.LifoQueue()               # Most recently used first: its clients' connections are still warm
+        self._lock    = threading.Lock()
+        self._built   = 0
+        self._busy    = 0
+
+    def _build(self):
+        crew = self.factory()
+        with self._lock:
+            self._built += 1
+            POOL_CREWS.set(self._built, state="built")
+        return crew
+
+    def prefill(self):
+        """Builds crews until `size` exist (at warmup, so requests do not pay for the construction)"""
+        while self._built < self.size:
+            self._idle.put(self._build())
+        logger.info(f"👥 Crew pool ready with {self._built} crews")
+
+    @contextmanager
+    def checkout(self):
+        try:               crew = self._idle.get_nowait()
+        except queue.Empty: crew = self._build()      # All busy: one more, the scheduler already bounds how many run at once
+        with self._lock:
+            self._busy += 1
+            POOL_CREWS.set(self._busy, state="busy")
+        try:
+            yield crew
+        finally:
+            with self._lock:
+                self._busy -= 1
+                POOL_CREWS.set(self._busy, state="busy")
+                keep = self._idle.qsize() < self.max_idle
+                if not keep:
+                    self._built -= 1
+                    POOL_CREWS.set(self._built, state="built")
+            if keep: self._idle.put(crew)
+
+    def kickoff(self, inputs: dict):
+        """Runs one crew of the pool on `inputs`"""
+        with self.checkout() as crew:
+            return crew.kickoff(inputs=inputs)
+
+
+_pool      = None
+_pool_lock = threading.Lock()
+
+def get_crew_pool() -> CrewPool:
+    """The process-wide pool, configured from agent.crew_pool in config.yaml"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None: _pool = CrewPool(**AGENT_CFG.get("crew_pool", {}))
+    return _pool
+
+def kickoff(inputs: dict):
+    """Thread-safe crew run for concurrent callers (the API)"""
+    return get_crew_pool().kickoff(inputs)
+
+def __getattr__(name: str):
+    """Keeps `from rag_agent_framework.agents.crew import agent_crew` working without building the crew at import"""
+    if name == "agent_crew": return get_crew()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
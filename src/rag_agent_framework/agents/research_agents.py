@@ -1,57 +1,71 @@
 # src/rag_agent_framework/agents/research_agents.py -- Agent Definitions, define their tasks, and assembling them into a crew
 # document_researcher -- uses the RAG tool
-# general_researcher -- search 
+# general_researcher -- search
+# Nothing is built at import time: get_llm() and build_agents() create the LLM client and agents on first use
+# Each agent gets the model of its role in llm.roles (config.yaml), so cheap steps can run on a smaller model
 
-import os
-from crewai import Agent
+from functools import lru_cache
+from crewai    import Agent
 
-from langchain_openai import ChatOpenAI
-from langchain_community.chat_models.ollama import ChatOllama
-
-from rag_agent_framework.tools.rag_tool import rag_tool
-from rag_agent_framework.core.config import LLM_CFG, OPENAI_API_KEY, OLLAMA_URL
+from rag_agent_framework.utils.tools.rag_tool import rag_tool, multi_query_rag_tool
+from rag_agent_framework.core.clients         import ClientRegistry
+from rag_agent_framework.core.telemetry       import AgentMetricsHandler
 
 # Get the LLM for the agents
-if LLM_CFG["default"] == "openai":
-    llm = ChatOpenAI(
-        model = LLM_CFG["openai"]["chat_model"],
-        openai_api_key = OPENAI_API_KEY
+def get_llm(role: str = "writer"):
+    """Returns the chat model of an agent role (llm.roles) from the client registry, created on the first call"""
+    return ClientRegistry.get_role_model(role)
+
+def build_agents(llm = None) -> dict:
+    """Builds the three agents of the crew, each on its role's model (or all on `llm`, if given)"""
+
+    # --- Researcher Agent --- uses the RAG tool
+    document_researcher = Agent(
+        role = "DocumentResearcher",
+        goal = "Find and return relevant information from the provided documents.",
+        backstory = "You are an expert at searching and extracting information from a document knowledge base. You are known for your ability to find the most relevant and accurate information quickly.",
+        tools = [rag_tool, multi_query_rag_tool],
+        llm = llm or get_llm("document_researcher"),
+        allow_delegation = False,   # In the CrewAI framework, an Agent can (optionally) delegate tasks to other agents.
+        verbose = True,
+        callbacks = [AgentMetricsHandler("DocumentResearcher")],    # Per-task latency on /metrics
     )
-else:
-    llm = ChatOllama(
-        model = LLM_CFG["ollama"]["chat_model"],
-        base_url = OLLAMA_URL,
-        request_timeout = 300
+
+    # --- General Researcher Agent --- search the web, uses SERPAPI_API_KEY in the .env file
+    general_researcher = Agent(
+        role = "GeneralResearcher",
+        goal = "Find and return general information from the web.",
+        backstory = "You are an expert web researcher, skilled at using search engines to find accurate and up-to-date information at any topic.",
+        # This agent will have a web search tool added to it automatically by CrewAI
+        llm = llm or get_llm("web_researcher"),
+        allow_delegation = False,   # In the CrewAI framework, an Agent can (optionally) delegate tasks to other agents.
+        verbose = True,
+        callbacks = [AgentMetricsHandler("GeneralResearcher")]
     )
-    
-# --- Researcher Agent --- uses the RAG tool
-document_researcher = Agent(
-    role = "DocumentResearcher",
-    goal = "Find and return relevant information from the provided documents.",
-    backstory = "You are an expert at searching and extracting information from a document knowledge base. You are known for your ability to find the most relevant and accurate information quickly.",
-    tools = [rag_tool],
-    llm = llm,
-    allow_delegation = False,   # In the CrewAI framework, an Agent can (optionally) delegate tasks to other agents.
-    verbose = True,
-)
-
-# --- General Researcher Agent --- search the web, uses SERPAPI_API_KEY in the .env file
-general_researcher = Agent(
-    role = "GeneralResearcher",
-    goal = "Find and return general information from the web.",
-    backstory = "You are an expert web researcher, skilled at using search engines to find accurate and up-to-date information at any topic.",
-    # This agent will have a web search tool added to it automatically by CrewAI
-    llm = llm,
-    allow_delegation = False,   # In the CrewAI framework, an Agent can (optionally) delegate tasks to other agents.
-    verbose = True
-)
-
-# --- Writer Agent --- synthesizes findings from other agents into a final report.
-report_writer = Agent(
-    role = "ReportWriter",
-    goal = "Write a clear, concise, and accurate summary report based on the research findings provided by other agents.",
-    backstory = "You are an expert technical writer, known for your ability to synthesize complex information from multiple sources into a perfectly formatted and easy-to-understand report that directly answers the user's original question.",
-    llm = llm,
-    allow_delegation = False,
-    verbose = True
-)
\ No newline at end of file
+
+    # --- Writer Agent --- synthesizes findings from other agents into a final report.
+    report_writer = Agent(
+        role = "ReportWriter",
+        goal = "Write a clear, concise, and accurate summary report based on the research findings provided by other agents.",
+        backstory = "You are an expert technical writer, known for your ability to synthesize complex information from multiple sources into a perfectly formatted and easy-to-understand report that directly answers the user's original question.",
+        llm = llm or get_llm("writer"),
+        allow_delegation = False,
+        verbose = True,
+        callbacks = [AgentMetricsHandler("ReportWriter")]
+    )
+
+    return {
+        "document_researcher": document_researcher,
+        "general_researcher":  general_researcher,
+        "report_writer":       report_writer,
+    }
+
+@lru_cache(maxsize=None)
+def _default_agents() -> dict:
+    return build_agents()
+
+def __getattr__(name: str):
+    """Keeps `from .research_agents import llm, document_researcher, ...` working, building them lazily on first access"""
+    if name == "llm": return get_llm()
+    if name in ("document_researcher", "general_researcher", "report_writer"): return _default_agents()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,33 +1,49 @@
 # src/rag_agent_framework/agents/tasks.py -- Agent Task Definitions
 
-from crewai import Task
-from .research_agents import document_researcher, general_researcher, report_writer
+from functools import lru_cache
+from crewai    import Task
 
-# Task 1: Search the internal documents
-document_research_task = Task(
-    description = "Search the user's private documents for information related to the topic: '{topic}'.",
-    expected_output = "A summary of the findings from the documents. If no relevant information is found, state that clearly.",
-    agent = document_researcher
-)
+def build_tasks(document_researcher, general_researcher, report_writer) -> list[Task]:
+    """Builds the three sequential tasks for the given agents"""
+    # Task 1: Search the internal documents
+    document_research_task = Task(
+        description = "Search the user's private documents for information related to the topic: '{topic}'. "
+                      "To try several phrasings or sub-questions, send them together in one Multi-Query Document Search Tool call.",
+        expected_output = "A summary of the findings from the documents. If no relevant information is found, state that clearly.",
+        agent = document_researcher
+    )
 
-# Task 2: Search the web
-web_research_task = Task(
-    description = "Search the public web for up-to-date information on the topic: '{topic}'.",
-    expected_output = "A summary of the key findings from the web search.",
-    agent = general_researcher
-)
+    # Task 2: Search the web
+    web_research_task = Task(
+        description = "Search the public web for up-to-date information on the topic: '{topic}'.",
+        expected_output = "A summary of the key findings from the web search.",
+        agent = general_researcher
+    )
 
-# Task 3: Write the final report
-writer_task = Task(
-    description = (
-        "Review the research findings from both the DocumentResearcher and the GeneralResearcher. "
-        "Your job is to synthesize this information into a single, cohesive final report. "
-        "It is critical that you address the user's original question: '{topic}'. "
-        "Explicitly mention if the internal documents contained relevant information or not. "
-        "Then, present the web findings to provide a complete answer."
-    ),
-    expected_output = "A final, comprehensive report that synthesizes all research findings and directly answers the user's original question.",
-    agent = report_writer,
-    # Context is the output of the previous two tasks
-    context = [document_research_task, web_research_task]
-)
\ No newline at end of file
+    # Task 3: Write the final report
+    writer_task = Task(
+        description = (
+            "Review the research findings from both the DocumentResearcher and the GeneralResearcher. "
+            "Your job is to synthesize this information into a single, cohesive final report. "
+            "It is critical that you address the user's original question: '{topic}'. "
+            "Explicitly mention if the internal documents contained relevant information or not. "
+            "Then, present the web findings to provide a complete answer."
+        ),
+        expected_output = "A final, comprehensive report that synthesizes all research findings and directly answers the user's original question.",
+        agent = report_writer,
+        # Context is the output of the previous two tasks
+        context = [document_research_task, web_research_task]
+    )
+
+    return [document_research_task, web_research_task, writer_task]
+
+@lru_cache(maxsize=None)
+def _default_tasks() -> list[Task]:
+    from .research_agents import document_researcher, general_researcher, report_writer
+    return build_tasks(document_researcher, general_researcher, report_writer)
+
+def __getattr__(name: str):
+    """Keeps `from .tasks import writer_task, ...` working, building the tasks lazily on first access"""
+    names = ("document_research_task", "web_research_task", "writer_task")
+    if name in names: return _default_tasks()[names.index(name)]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
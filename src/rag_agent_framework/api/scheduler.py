@@ -0,0 +1,221 @@
+# src/rag_agent_framework/api/scheduler.py -- Admission control for crew runs: bounded concurrency, bounded queue, per-user fairness, priority lanes
+# 1. At most `max_concurrency` crew runs execute at once, on their own thread pool (the default threadpool stays free for /health, /upload)
+# 2. Everything else waits in a bounded queue; a request is rejected up front when the queue is full (503),
+#    when its estimated wait exceeds `max_queue_wait` (503), or when its user already has `max_per_user` requests in (429)
+# 3. Waiting requests are split into lanes (short questions first) and served round-robin across users inside a lane
+# 4. Queue depth, running runs, wait time and rejections are exported on /metrics and returned by /queue
+# 5. run() admits and executes one request's own run. A run shared by several requests (api/singleflight.py) admits every
+#    request with admitted(user_id) -- each against its own per-user limit -- and executes once with execute()
+
+import time
+import asyncio
+import functools
+import contextvars
+from contextlib         import contextmanager
+from collections        import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from rag_agent_framework.core.config    import SCHEDULER_CFG
+from rag_agent_framework.core.telemetry import Gauge, Histogram, Counter, register, get_logger
+
+logger = get_logger(__name__)
+
+LANES = ("short", "normal")        # Highest priority first
+
+QUEUE_DEPTH  = register(Gauge("rag_scheduler_queue_depth", "Crew runs waiting for a slot", ("lane",)))
+RUNNING      = register(Gauge("rag_scheduler_running", "Crew runs executing"))
+WAIT_SECONDS = register(Histogram("rag_scheduler_wait_seconds", "Time a crew run waited in the queue", ("lane",)))
+REJECTED     = register(Counter("rag_scheduler_rejected_total", "Crew runs turned away", ("reason",)))
+
+
+class SchedulerRejected(Exception):
+    """Raised instead of queueing; the API turns it into `status_code` with a Retry-After header"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail      = detail
+        self.retry_after = retry_after
+
+
+class CrewScheduler:
+    """Runs blocking crew kickoffs with admission control. Must be used from one event loop (the API's)"""
+
+    def __init__(self, max_concurrency: int = 4, max_queue: int = 32, max_queue_wait: float = 120.0, max_per_user: int = 2,
+                 short_question_chars: int = 200, short_burst: int = 3, expected_run_s: float = 60.0):
+        self.max_concurrency      = max_concurrency
+        self.max_queue            = max_queue
+        self.max_queue_wait       = max_queue_wait
+        self.max_per_user         = max_per_user
+        self.short_question_chars = short_question_chars
+        self.short_burst          = short_burst                     # Short runs served in a row before a waiting normal one goes
+        self.run_time_s           = expected_run_s                  # EWMA of crew run time, used to estimate queue wait
+
+        self._lanes    = {lane: OrderedDict() for lane in LANES}    # lane -> user_id -> deque of waiter futures
+        self._per_user = {}                                         # user_id -> queued + running
+        self._running  = 0
+        self._queued   = 0
+        self._streak   = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="crew")
+
+    # --- Admission ---
+    def lane_for(self, question: str) -> str:
+        return "short" if len(question) <= self.short_question_chars else "normal"
+
+    def estimated_wait(self) -> float:
+        """Seconds a request admitted now would wait: the queue ahead of it drains max_concurrency runs per run time"""
+        if self._running < self.max_concurrency and not self._queued: return 0.0
+        return (self._queued + 1) / self.max_concurrency * self.run_time_s
+
+    def _admit_user(self, user_id: str):
+        """Counts one more request of user_id, or raises 429 when the user already has max_per_user in"""
+        if self._per_user.get(user_id, 0) >= self.max_per_user:
+            REJECTED.inc(reason="per_user")
+            raise SchedulerRejected(429, f"User '{user_id}' already has {self.max_per_user} requests in progress.", max(1, int(self.run_time_s)))
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+
+    def _admit_run(self):
+        retry_after = max(1, int(self.run_time_s))
+        if self._running >= self.max_concurrency and self._queued >= self.max_queue:
+            REJECTED.inc(reason="queue_full")
+            raise SchedulerRejected(503, "The server is at capacity, please retry later.", retry_after)
+        if self.estimated_wait() > self.max_queue_wait:
+            REJECTED.inc(reason="wait_too_long")
+            raise SchedulerRejected(503, f"Estimated wait of {self.estimated_wait():.0f}s exceeds the limit, please retry later.", retry_after)
+
+    # --- Queue ---
+    def _enqueue(self, lane: str, user_id: str) -> asyncio.Future:
+        waiter = asyncio.get_running_loop().create_future()
+        self._lanes[lane].setdefault(user_id, deque()).append(waiter)
+        self._queued += 1
+        QUEUE_DEPTH.set(sum(len(q) for q in self._lanes[lane].values()), lane=lane)
+        return waiter
+
+    def _remove(self, lane: str, user_id: str, waiter: asyncio.Future):
+        queue = self._lanes[lane].get(user_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue: del self._lanes[lane][user_id]
+            self._queued -= 1
+            QUEUE_DEPTH.set(sum(len(q) for q in self._lanes[lane].values()), lane=lane)
+
+    def _next_lane(self) -> str | None:
+        waiting = [lane for lane in LANES if self._lanes[lane]]
+        if not waiting: return None
+        # Strict priority for short questions, except that a waiting normal run goes after `short_burst` short ones
+        if waiting[0] == "short" and len(waiting) > 1 and self._streak >= self.short_burst:
+            self._streak = 0
+            return waiting[1]
+        self._streak = self._streak + 1 if waiting[0] == "short" else 0
+        return waiting[0]
+
+    def _dispatch(self):
+        """Hands free slots to waiters: highest lane first, round-robin across users inside the lane"""
+        while self._running < self.max_concurrency:
+            lane = self._next_lane()
+            if lane is None: return
+            users          = self._lanes[lane]
+            user_id, queue = next(iter(users.items()))
+            waiter         = queue.popleft()
+            if queue: users.move_to_end(user_id)                    # This user goes to the back of the rotation
+            else:     del users[user_id]
+            self._queued -= 1
+            QUEUE_DEPTH.set(sum(len(q) for q in users.values()), lane=lane)
+            if waiter.done(): continue                              # Cancelled while queued
+            self._running += 1
+            RUNNING.set(self._running)
+            waiter.set_result(None)
+
+    def _release(self, started: float | None = None):
+        if started is not None: self.run_time_s = 0.8 * self.run_time_s + 0.2 * (time.perf_counter() - started)
+        self._running -= 1
+        RUNNING.set(self._running)
+        self._dispatch()
+
+    def _forget(self, user_id: str):
+        self._per_user[user_id] -= 1
+        if not self._per_user[user_id]: del self._per_user[user_id]
+
+    async def _start(self, fn, args: tuple, kwargs: dict, user_id: str, lane: str) -> asyncio.Future:
+        """Waits for a slot (or raises SchedulerRejected with 503), then starts fn on the crew thread pool and returns its future"""
+        self._admit_run()
+        queued_at = time.perf_counter()
+
+        if self._running < self.max_concurrency and not self._queued:
+            self._running += 1
+            RUNNING.set(self._running)
+        else:
+            waiter = self._enqueue(lane, user_id)
+            try:
+                await asyncio.wait_for(waiter, timeout=self.max_queue_wait)
+            except asyncio.TimeoutError:
+                self._remove(lane, user_id, waiter)
+                REJECTED.inc(reason="queue_timeout")
+                raise SchedulerRejected(503, f"Waited {self.max_queue_wait:.0f}s in the queue without a free slot, please retry later.",
+                                        max(1, int(self.run_time_s)))
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled(): self._release()     # A slot was handed over just before the client left
+                else: self._remove(lane, user_id, waiter)
+                raise
+        WAIT_SECONDS.observe(time.perf_counter() - queued_at, lane=lane)
+
+        # The slot is freed when the thread finishes, even if the client disconnects first (the thread cannot be stopped).
+        # The run keeps the request's context variables (e.g. its profile, core/profiling.py)
+        started = time.perf_counter()
+        call    = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        future  = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        future.add_done_callback(lambda _: self._release(started))
+        return future
+
+    # --- Public API ---
+    async def run(self, fn, *args, user_id: str, lane: str = "normal", **kwargs):
+        """Admits the request (429 over the per-user limit, 503 when overloaded), waits for a slot, then runs fn(*args, **kwargs)"""
+        self._admit_user(user_id)
+        try:
+            future = await self._start(fn, args, kwargs, user_id, lane)
+        except BaseException:
+            self._forget(user_id)
+            raise
+        future.add_done_callback(lambda _: self._forget(user_id))          # Counted until the thread finishes, even if the client left
+        return await asyncio.shield(future)
+
+    @contextmanager
+    def admitted(self, user_id: str):
+        """Counts one request of user_id against max_per_user (429 when over) for the duration of the block"""
+        self._admit_user(user_id)
+        try:
+            yield
+        finally:
+            self._forget(user_id)
+
+    async def execute(self, fn, *args, user_id: str, lane: str = "normal", **kwargs):
+        """
+            Runs fn like run() but without per-user admission: for a run shared by requests that each went through admitted().
+            user_id only places the run in the round-robin; a rejection here is about capacity (503), never about a user
+        """
+        return await asyncio.shield(await self._start(fn, args, kwargs, user_id, lane))
+
+    def snapshot(self) -> dict:
+        """Current load, returned by /queue"""
+        return {
+            "running":          self._running,
+            "max_concurrency":  self.max_concurrency,
+            "queued":           {lane: sum(len(q) for q in self._lanes[lane].values()) for lane in LANES},
+            "max_queue":        self.max_queue,
+            "estimated_wait_s": round(self.estimated_wait(), 1),
+            "run_time_s":       round(self.run_time_s, 1),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_scheduler = None
+
+def get_scheduler() -> CrewScheduler:
+    """The process-wide scheduler, configured from the `scheduler` section of config.yaml"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = CrewScheduler(**SCHEDULER_CFG)
+        logger.info(f"🚦 Crew scheduler: {_scheduler.max_concurrency} concurrent runs, queue of {_scheduler.max_queue}")
+    return _scheduler
@@ -1,27 +1,100 @@
 # src/rag_agent_framework/api/server.py -- The main FastAPI server, adapting the logic from chat.py
 
-import io
-import os
-from crewai                                 import Crew
-from fastapi                                import FastAPI, HTTPException, Body, UploadFile, File, Form
+import time
+import asyncio
+from contextlib                             import asynccontextmanager
+from fastapi                                import FastAPI, HTTPException, Body, UploadFile, File, Form, Request
+from fastapi.responses                      import JSONResponse, PlainTextResponse, FileResponse
 from pydantic                               import BaseModel, Field
 from typing                                 import Optional
 from fastapi.concurrency                    import run_in_threadpool # For running sync code in async endpoints
-from langchain_core.messages                import HumanMessage
-from langchain_openai                       import ChatOpenAI
-from langchain_community.chat_models.ollama import ChatOllama
 
-from rag_agent_framework.agents.crew import agent_crew
-from rag_agent_framework.rag.memory  import MemoryStore, get_summarizer
-from rag_agent_framework.core.config import AGENT_CFG, QDRANT_URL, LLM_CFG, OLLAMA_URL, OPENAI_API_KEY
+# Heavy components (crewai, LangChain, LLM/embedding/Qdrant clients) are imported inside the functions that need them,
+# so importing this module stays cheap. The lifespan warmup builds them in the background and flips /ready.
+from rag_agent_framework.core.config    import AGENT_CFG, API_CFG, QDRANT_URL, PDF_PARSER_URL
+from rag_agent_framework.core.clients   import ClientRegistry
+from rag_agent_framework.core           import telemetry, profiling
+from rag_agent_framework.core.telemetry import span
+from rag_agent_framework.api.scheduler  import get_scheduler, SchedulerRejected
+from rag_agent_framework.api            import singleflight
+from rag_agent_framework.utils          import parser_client
+
+logger = telemetry.get_logger(__name__)
+
+SERVICE_PARSED_EXTENSIONS = (".pdf", ".docx", ".pptx")     # Converted to Markdown by the pdf-parser service (MarkItDown)
+
+
+def _warm_components():
+    """Builds everything the first /chat would otherwise build: the crews (LLM clients, agents, tools), the summarizer, the embedder"""
+    from rag_agent_framework.agents.crew      import get_crew_pool
+    from rag_agent_framework.rag.memory       import get_summarizer
+    from rag_agent_framework.rag.vector_store import get_embedder
+    get_crew_pool().prefill()
+    get_summarizer()
+    get_embedder()
+    ClientRegistry.preload_ollama()             # Loads the role models into Ollama (llm.ollama.preload)
+
+async def _warmup(app: FastAPI):
+    """Builds the components, retrying every api.warmup_retry_s seconds; /ready stays 503 until one attempt succeeds"""
+    while True:
+        try:
+            await run_in_threadpool(_warm_components)
+            break
+        except Exception as e:
+            app.state.warmup_error = repr(e)
+            logger.warning(f"⚠️ Warmup failed, retrying in {API_CFG.get('warmup_retry_s', 30)} s: {e}")
+            await asyncio.sleep(API_CFG.get("warmup_retry_s", 30))
+    app.state.warmup_error = None
+    app.state.ready        = True
+    logger.info("🔥 Warmup complete, API is ready.")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready        = not API_CFG.get("warmup", True)
+    app.state.warmup_error = None
+    warmup_task = asyncio.create_task(_warmup(app)) if not app.state.ready else None
+    yield
+    if warmup_task and not warmup_task.done(): warmup_task.cancel()
+    get_scheduler().shutdown()
+    from rag_agent_framework.rag.memory_policy import get_memory_writer
+    await run_in_threadpool(get_memory_writer().flush)      # Buffered conversations are summarized before the process exits
+    await parser_client.aclose()
+    await ClientRegistry.aclose_all()          # Closes the pooled LLM / embedding / Qdrant connections
 
 # Initialize FastAPI app
 app = FastAPI(
     title = "RAG Agent Framework API",
     description = "An API for interacting with a RAG-powered agentic crew",
-    version = "1.0.0"
+    version = "1.0.0",
+    lifespan = lifespan
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Observes every request into rag_http_request_duration_seconds, labelled by route template (not raw path) to bound cardinality"""
+    start  = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status   = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        telemetry.HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                                       path=getattr(route, "path", "unmatched"), status=str(status))
+
+PROFILED_PATHS = ("/chat", "/upload")
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Profiles a /chat or /upload request on demand (X-Profile admin header or observability.profiling.sample_rate)"""
+    trigger = profiling.trigger_for(request.headers) if request.url.path in PROFILED_PATHS else None
+    if trigger is None: return await call_next(request)
+    async with profiling.aprofile(f"{request.method} {request.url.path}", trigger) as running:     # Files written off the event loop
+        response = await call_next(request)
+    response.headers["X-Profile-Id"] = running.id
+    return response
+
 # --- Pydantic Models for API I/O --- Defines the expected structure of incoming/outgoing JSON payloads for /chat
 class ChatRequest(BaseModel):
     question: str
@@ -45,22 +118,29 @@ def read_root():
 async def chat_with_agent(request: ChatRequest = Body(...)):
     """
         /chat -> Main chat endpoint
-        1. MemoryStore initialized for specific user_id (+ get_memories)
+        1. AsyncMemoryStore for the specific user_id (+ await get_memories: async embedding call and AsyncQdrantClient query)
         2. inputs{} combines user question and memory_context into dict passed to the agent crew
-        3. agent_crew.kickoff(inputs) inside run_in_threadpool since it's synchronous
-        4. get_summarizer(user's question + agent's response) in threadpool -> MemoryStore
+        3. Each request is admitted against its own user's limit (429), then a crew of the per-request pool runs kickoff(inputs)
+           through the crew scheduler (bounded concurrency, 503 when overloaded); identical concurrent requests (same question
+           and context) share one run
+        4. The turn goes to long-term memory per memory.policy (rag/memory_policy.py): summarized now (per_turn), stored without
+           an LLM (extractive), or buffered and summarized later in batches (every_n, token_threshold -> memory_summary is None)
     """
     
-    print(f"Received chat request for user '{request.user_id}' with question: '{request.question}'")
+    from rag_agent_framework.agents.crew       import kickoff as crew_kickoff
+    from rag_agent_framework.rag.memory        import AsyncMemoryStore
+    from rag_agent_framework.rag.memory_policy import get_memory_writer
+
+    logger.info(f"Received chat request for user '{request.user_id}'")
+    logger.debug(f"Question: '{request.question}'")
     try:
-        # 1. Initialize memory store for the user
-        memory_store = MemoryStore(user_id=request.user_id)
+        # 1. Initialize memory store for the user (async: Qdrant and embedding I/O never block the event loop)
+        memory_store = AsyncMemoryStore(user_id=request.user_id)
 
-        # 2. Retrieve relevant memories
-        print(f"Retrieving memories for query: {request.question}")
-        relevant_memories   = memory_store.get_memories(query = request.question)
+        # 2. Retrieve relevant memories (timed as "memory_retrieval" inside get_memories)
+        relevant_memories   = await memory_store.get_memories(query = request.question)
         memory_context      = "\n".join([mem.page_content for mem in relevant_memories])
-        print(f"Retrieved context: {memory_context}")
+        logger.debug(f"Retrieved context: {memory_context}")
 
         # 3. Prepare inputs for the crew, including the memory context
         inputs = {
@@ -68,20 +148,23 @@ async def chat_with_agent(request: ChatRequest = Body(...)):
             "context": memory_context if memory_context else "No relevant past conversations found"
         }
 
-        # 4. Kick off the crew's task
-        print("Kicking off the agent crew in a background thread...")
-        result = await run_in_threadpool(agent_crew.kickoff, inputs=inputs)
-        # result = agent_crew.kickoff(inputs=inputs)      # Gives that memory + question to a group of agents (the “crew”) to figure out the answer.
-        print(f"Crew finished with result: {result}")
+        # 4. Kick off the crew's task once the scheduler grants a slot. Every request is admitted against its own user's limit;
+        #    only the crew run itself is shared with identical requests
+        scheduler = get_scheduler()
+        def kickoff():
+            return scheduler.execute(crew_kickoff, inputs, user_id=request.user_id, lane=scheduler.lane_for(request.question))
 
-        # 5. Summarize the interaction for long-term memory
-        summarizer_chain          = get_summarizer()
-        conversation_to_summarize = f"User Question: {request.question}\nAgent Answer: {result}"
-        llm_response              = await run_in_threadpool(summarizer_chain.invoke, {"text": conversation_to_summarize})
-        summary                   = llm_response.content
+        logger.info("Kicking off the agent crew in a background thread...")
+        with span("crew"), scheduler.admitted(request.user_id):     # Includes queue wait; each task, tool and LLM call inside has its own histogram
+            if API_CFG.get("coalesce_chat", True):
+                result = await singleflight.get_flights().do(singleflight.request_key(request.question, inputs["context"]), kickoff)
+            else:
+                result = await kickoff()
+        # result = agent_crew.kickoff(inputs=inputs)      # Gives that memory + question to a group of agents (the “crew”) to figure out the answer.
+        logger.debug(f"Crew finished with result: {result}")
 
-        # 6. Add the new summary to the memory store
-        memory_store.add_memory(summary)
+        # 5. Write the interaction to long-term memory (per user, also when the crew run was shared); "summarization" is timed inside
+        summary = await get_memory_writer().arecord(request.user_id, request.question, str(result), memory_store)
 
         return ChatResponse(
             answer         = str(result),
@@ -89,10 +172,13 @@ async def chat_with_agent(request: ChatRequest = Body(...)):
             memory_summary = summary
         )
 
+    except SchedulerRejected as e:
+        logger.warning(f"🚦 Rejected chat request for user '{request.user_id}': {e.detail}")
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
     except Exception as e:
         # Logs the error on the server terminal/logs
-        print(f"An unexpected error occurred: {e}")
-        print(f"Error details: {repr(e)}")
+        logger.exception(f"An unexpected error occurred: {e}")
         
         # Sends the user a friendly, generic message
         raise HTTPException(
@@ -107,29 +193,48 @@ async def upload_document(
 ):
     """
         /upload -> Upload documents to KB
-        1. Reads the uploaded docs to io.BytesIO -> temp_file
-        2. Initializes MemoryStore for given collection_name (not tied to general) <- temp_file
+        1. PDF, DOCX and PPTX files are streamed to the PDF parser service (when PDF_PARSER_URL is set) and the returned Markdown is stored
+        2. Without it, PDFs are copied to a temp file and parsed in-process, streaming pages -> chunks -> embedding batches;
+           DOCX and PPTX need the service
+        3. Initializes MemoryStore for given collection_name (not tied to general) <- parsed content
         Uploads a document to the specified Qdrant collection. This is used to populate the knowledge base for the document_researcher agent.
     """
-    print(f"Received file '{file.filename}' for collection '{collection_name}'")
+    from rag_agent_framework.rag.memory import MemoryStore
+
+    logger.info(f"Received file '{file.filename}' for collection '{collection_name}'")
     try:
-        # Read the file content into an in-memory object
-        file_content    = await file.read()
-        temp_file       = io.BytesIO(file_content)
-        temp_file.name  = file.filename
+        lowered = file.filename.lower()
+        if not PDF_PARSER_URL and lowered.endswith(SERVICE_PARSED_EXTENSIONS) and not lowered.endswith(".pdf"):
+            raise HTTPException(status_code=400, detail="DOCX and PPTX uploads need the PDF parser service (PDF_PARSER_URL)")
+        if PDF_PARSER_URL and lowered.endswith(SERVICE_PARSED_EXTENSIONS):
+            # Parsing is CPU-heavy, so it runs in the parser containers rather than in the API process
+            with span("parse"):
+                parsed = await parser_client.get_pdf_parser().aparse(file.file, file.filename)
+
+            doc_store = await run_in_threadpool(MemoryStore, collection_name=collection_name, url=QDRANT_URL)
+            await run_in_threadpool(doc_store.add_text, parsed["markdown_content"], file.filename)
+            return {"message": f"Successfully uploaded {file.filename} to collection '{collection_name}'."}
 
         # We initialize it with a collection_name instead of a user_id to target the general knowledge base.
-        doc_store = MemoryStore(collection_name=collection_name, url=QDRANT_URL)
+        # Built in the threadpool: the constructor makes Qdrant round-trips (ensure_collection)
+        doc_store = await run_in_threadpool(MemoryStore, collection_name=collection_name, url=QDRANT_URL)
         
-        # Add the document to the vector store
-        await run_in_threadpool(doc_store.add_document, temp_file)
+        # Add the document to the vector store -- streamed from the spooled upload, page by page, one embedding batch at a time
+        await run_in_threadpool(doc_store.add_document, file.file, file.filename)
         
-        print(f"Successfully processed and stored '{file.filename}'")
+        logger.info(f"Successfully processed and stored '{file.filename}'")
         return {"message": f"Successfully uploaded {file.filename} to collection '{collection_name}'."}
 
+    except HTTPException:
+        raise
+    except parser_client.ParserServiceError as e:
+        logger.warning(f"Parser service failed for '{file.filename}': {e}")
+        raise HTTPException(
+            status_code = e.status_code if e.status_code and e.status_code < 500 else 502,
+            detail      = f"The parser service could not process the file: {str(e)}"
+        )
     except Exception as e:
-        print(f"Error during file upload: {e}")
-        print(f"Error details: {repr(e)}")
+        logger.exception(f"Error during file upload: {e}")
         raise HTTPException(
             status_code = 500,
             detail      = f"An error occurred during file upload: {str(e)}"
@@ -139,4 +244,37 @@ async def upload_document(
 @app.get("/health", summary = "Health check endpoint")
 def health_check():
     """/health -> Confirm the API is running and healthy"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/ready", summary = "Readiness check endpoint")
+def readiness_check():
+    """/ready -> 200 once the warmup has built the crew and clients, 503 while it is still running or has failed"""
+    if app.state.warmup_error:
+        return JSONResponse(status_code=503, content={"status": "warmup_failed", "warmup_error": app.state.warmup_error})
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+@app.get("/queue", summary = "Crew scheduler load")
+def queue_status():
+    """/queue -> Running crew runs, queued runs per lane and the estimated wait for a new /chat"""
+    return get_scheduler().snapshot()
+
+@app.get("/profiles", summary = "Recent request profiles")
+def list_profiles(request: Request, limit: int = 20):
+    """/profiles -> Newest profiles first: stage timings and the speedscope file of each (needs the X-Profile admin header)"""
+    if not profiling.is_admin(request.headers): raise HTTPException(status_code=403, detail="Profiles need PROFILE_TOKEN set and the X-Profile admin header.")
+    return profiling.recent_profiles(limit=limit)
+
+@app.get("/profiles/{profile_id}", summary = "Download a profile")
+def get_profile(profile_id: str, request: Request):
+    """/profiles/{id} -> The speedscope file of one profile, to open at https://www.speedscope.app"""
+    if not profiling.is_admin(request.headers): raise HTTPException(status_code=403, detail="Profiles need PROFILE_TOKEN set and the X-Profile admin header.")
+    path = profiling.speedscope_path(profile_id)
+    if path is None: raise HTTPException(status_code=404, detail=f"No profile '{profile_id}'.")
+    return FileResponse(path, media_type="application/json", filename=path.name)
+
+@app.get("/metrics", summary = "Prometheus metrics")
+def metrics():
+    """/metrics -> Per-stage, crew task, tool, LLM (latency and tokens) and HTTP histograms in the Prometheus text format"""
+    return PlainTextResponse(telemetry.render_metrics(), media_type = "text/plain; version=0.0.4")
@@ -0,0 +1,54 @@
+# src/rag_agent_framework/api/singleflight.py -- Coalesces identical in-flight /chat crew runs into one execution
+# Requests with the same normalized question and the same memory context share a key. The first one runs the crew,
+# the others await its result (or its exception). Nothing is cached: the key is forgotten as soon as the run finishes.
+
+import re
+import asyncio
+import hashlib
+
+from rag_agent_framework.core.telemetry import Counter, Gauge, register
+
+COALESCED = register(Counter("rag_singleflight_coalesced_total", "Requests that shared another request's in-flight crew run"))
+IN_FLIGHT = register(Gauge("rag_singleflight_in_flight", "Distinct crew runs in flight"))
+
+_SPACES   = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Case, whitespace and trailing punctuation do not change the question"""
+    return _SPACES.sub(" ", text).strip().lower().rstrip("?!. ")
+
+def request_key(question: str, context: str) -> str:
+    return hashlib.sha256(f"{normalize(question)}\0{_SPACES.sub(' ', context).strip()}".encode()).hexdigest()
+
+
+class SingleFlight:
+    """Maps a key to the one running task that computes it. Must be used from one event loop (the API's)"""
+
+    def __init__(self):
+        self._flights = {}
+
+    async def do(self, key: str, coro_fn):
+        """Returns the result of coro_fn() -- started now, or already started by an identical request"""
+        task = self._flights.get(key)
+        if task is None:
+            # A separate task, so a leader whose client disconnects does not cancel the run the followers are waiting on
+            task = self._flights[key] = asyncio.ensure_future(coro_fn())
+            IN_FLIGHT.set(len(self._flights))
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            COALESCED.inc()
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task):
+        if self._flights.get(key) is task: del self._flights[key]
+        IN_FLIGHT.set(len(self._flights))
+        if not task.cancelled(): task.exception()           # Marks the exception retrieved when every waiter has gone
+
+
+_flights = None
+
+def get_flights() -> SingleFlight:
+    global _flights
+    if _flights is None: _flights = SingleFlight()
+    return _flights
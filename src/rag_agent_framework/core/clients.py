@@ -0,0 +1,282 @@
+# src/rag_agent_framework/core/clients.py -- Process-wide client registry: one pooled LLM / embedder / Qdrant client per (provider, model, endpoint)
+# Every factory in the project (get_llm, get_summarizer, get_rag_chain, get_embedder, get_vector_store, MemoryStore) goes through here,
+# so a process opens one keep-alive connection pool per endpoint instead of one per request.
+# The API's async paths get an AsyncQdrantClient from get_async_qdrant_client(), so Qdrant I/O never blocks the event loop.
+
+import os
+import asyncio
+import threading
+import httpx
+
+from rag_agent_framework.core.config            import LLM_CFG, LLM_ROLES_CFG, ROLES, CLIENTS_CFG, EMBED_BATCH_CFG, OPENAI_API_KEY, OLLAMA_URL, QDRANT_URL, VECTOR_DB_TYPE, VECTOR_DB_PATH
+from rag_agent_framework.core.telemetry         import llm_handler, get_logger, TimedEmbeddings
+from rag_agent_framework.core.embedding_batcher import BatchingEmbeddings
+from rag_agent_framework.core.llm_cache         import get_llm_cache, cacheable
+
+logger = get_logger(__name__)
+
+
+class ThreadedAsyncQdrant:
+    """
+        AsyncQdrantClient-shaped wrapper of a sync QdrantClient: every method call runs on a worker thread and is awaited.
+        Used where no async client can share the sync client's storage (embedded `local` / `memory` Qdrant, test overrides)
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        if not callable(method): return method
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+        return call
+
+
+class ClientRegistry:
+    """A singleton class that owns every network client of the process"""
+    _clients   = {}
+    _overrides = {}
+    _lock      = threading.RLock()
+
+    @classmethod
+    def override(cls, chat_model = None, embedder = None, qdrant_client = None):
+        """Makes the factories return the given instances instead of building real clients (benchmarks and tests run offline with this)"""
+        overrides = {"chat": chat_model, "embedder": embedder, "qdrant": qdrant_client}
+        cls._overrides = {kind: client for kind, client in overrides.items() if client is not None}
+
+    # --- Internals ---
+    @classmethod
+    def _get_or_create(cls, key: tuple, factory):
+        client = cls._clients.get(key)
+        if client is None:
+            with cls._lock:
+                client = cls._clients.get(key)
+                if client is None:
+                    client = cls._clients[key] = factory()
+        return client
+
+    @staticmethod
+    def _limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections           = CLIENTS_CFG.get("max_connections", 50),
+            max_keepalive_connections = CLIENTS_CFG.get("max_keepalive", 20),
+            keepalive_expiry          = CLIENTS_CFG.get("keepalive_expiry", 60),
+        )
+
+    @classmethod
+    def http_client(cls, endpoint: str = "default") -> httpx.Client:
+        """Shared keep-alive pool for one HTTP endpoint"""
+        return cls._get_or_create(("http", endpoint), lambda: httpx.Client(limits=cls._limits(), timeout=CLIENTS_CFG.get("timeout", 300)))
+
+    @classmethod
+    def async_http_client(cls, endpoint: str = "default") -> httpx.AsyncClient:
+        """Shared async keep-alive pool for one HTTP endpoint"""
+        return cls._get_or_create(("async_http", endpoint), lambda: httpx.AsyncClient(limits=cls._limits(), timeout=CLIENTS_CFG.get("timeout", 300)))
+
+    # --- LLMs ---
+    @classmethod
+    def get_chat_model(cls, provider: str = None, model: str = None, **params):
+        """
+            Returns the shared chat model for (provider, model, endpoint, params). `params` are extra model kwargs (e.g. request_timeout);
+            llm.<provider>.temperature applies unless `params` sets one. With llm_cache.enabled, models whose temperature is 0
+            (or any, with llm_cache.force) get the on-disk response cache (core/llm_cache.py).
+            OpenAI models reuse the pooled httpx clients; LangChain's Ollama integration has no pluggable session,
+            so Ollama models are only de-duplicated (no per-request construction) but still use its own requests calls.
+        """
+        if "chat" in cls._overrides: return cls._overrides["chat"]
+        provider = provider or LLM_CFG["default"]
+        model    = model or LLM_CFG[provider]["chat_model"]
+        if LLM_CFG[provider].get("temperature") is not None: params = {"temperature": LLM_CFG[provider]["temperature"], **params}
+        key      = ("chat", provider, model, OLLAMA_URL if provider == "ollama" else "openai", tuple(sorted(params.items())))
+
+        def factory():
+            cache  = get_llm_cache() if cacheable(params.get("temperature")) else None
+            kwargs = {**params, "cache": cache} if cache is not None else params
+            if provider == "openai":
+                from langchain_openai import ChatOpenAI
+                return ChatOpenAI(
+                    model             = model,
+                    openai_api_key    = OPENAI_API_KEY,
+                    http_client       = cls.http_client("openai"),
+                    http_async_client = cls.async_http_client("openai"),
+                    callbacks         = [llm_handler],      # LLM latency and token metrics
+                    **kwargs
+                )
+            from langchain_community.chat_models.ollama import ChatOllama
+            return ChatOllama(model = model, base_url = OLLAMA_URL, callbacks = [llm_handler], **kwargs)
+
+        return cls._get_or_create(key, factory)
+
+    @classmethod
+    def get_role_model(cls, role: str):
+        """
+            The chat model for one step of the pipeline (llm.roles in config.yaml: document_researcher, web_researcher, writer,
+            rag_answerer, summarizer). Each role may set provider, model, timeout and num_ctx; unset fields fall back to llm.default,
+            its chat_model and a 300 s timeout. Roles with the same settings share one client.
+        """
+        settings = LLM_ROLES_CFG.get(role) or {}
+        provider = settings.get("provider") or LLM_CFG["default"]
+        timeout  = settings.get("timeout", 300)
+        if provider != "ollama": return cls.get_chat_model(provider, settings.get("model"), request_timeout = timeout)
+
+        params = {"timeout": timeout}
+        if settings.get("num_ctx"): params["num_ctx"] = settings["num_ctx"]
+        keep_alive = settings.get("keep_alive", LLM_CFG["ollama"].get("keep_alive"))
+        if keep_alive is not None: params["keep_alive"] = keep_alive           # Keeps the model loaded between calls
+        return cls.get_chat_model(provider, settings.get("model"), **params)
+
+    @classmethod
+    def preload_ollama(cls):
+        """Loads every Ollama model the roles and the embedder use (llm.ollama.preload), so the first request does not wait for a load"""
+        ollama = LLM_CFG.get("ollama", {})
+        if not ollama.get("preload", False): return
+        roles       = [LLM_ROLES_CFG.get(role) or {} for role in ROLES]
+        chat_models = {role.get("model") or ollama["chat_model"] for role in roles if (role.get("provider") or LLM_CFG["default"]) == "ollama"}
+        requests    = [("/api/generate", {"model": model}) for model in sorted(chat_models)]
+        if LLM_CFG["default"] == "ollama": requests.append(("/api/embed", {"model": ollama["embedding_model"], "input": ""}))
+
+        for path, body in requests:
+            if ollama.get("keep_alive") is not None: body["keep_alive"] = ollama["keep_alive"]
+            try:
+                cls.http_client("ollama").post(f"{OLLAMA_URL}{path}", json=body).raise_for_status()
+                logger.info(f"📦 Preloaded Ollama model '{body['model']}'")
+            except Exception as e:
+                logger.warning(f"⚠️ Could not preload Ollama model '{body['model']}': {e}")
+
+    # --- Embedders ---
+    @classmethod
+    def get_embedder(cls, provider: str = None, model: str = None):
+        """
+            Returns the shared embedding client for (provider, model, endpoint), timed as the 'embed' stage.
+            With clients.embedding_batch.enabled, concurrent calls are micro-batched (core/embedding_batcher.py): OpenAI takes a list
+            per request already; Ollama batches go to /api/embed in one request (LangChain's OllamaEmbeddings sends one per text).
+            Batches formed on the event loop go out on the pooled async clients (OpenAI's http_async_client, async_http_client("ollama")).
+        """
+        if "embedder" in cls._overrides: return cls._overrides["embedder"]
+        provider = provider or LLM_CFG["default"]
+        model    = model or LLM_CFG[provider]["embedding_model"]
+        key      = ("embedder", provider, model, OLLAMA_URL if provider == "ollama" else "openai")
+
+        def factory():
+            if provider == "openai":
+                from langchain_openai import OpenAIEmbeddings
+                embedder = OpenAIEmbeddings(
+                    model             = model,
+                    openai_api_key    = OPENAI_API_KEY,
+                    http_client       = cls.http_client("openai"),
+                    http_async_client = cls.async_http_client("openai"),
+                )
+                if not EMBED_BATCH_CFG.get("enabled", True): return TimedEmbeddings(embedder)
+                return BatchingEmbeddings(embedder, **cls._batch_params())
+
+            from langchain_community.embeddings.ollama import OllamaEmbeddings
+            embedder = OllamaEmbeddings(
+                model = model,
+                base_url = OLLAMA_URL,
+                num_ctx = 2048 # Explicitly set context size
+            )
+            if not EMBED_BATCH_CFG.get("enabled", True): return TimedEmbeddings(embedder)
+            return BatchingEmbeddings(embedder, batch_fn=cls._ollama_batch_fn(model), abatch_fn=cls._ollama_abatch_fn(model),
+                                      query_prefix=embedder.query_instruction, document_prefix=embedder.embed_instruction, **cls._batch_params())
+
+        return cls._get_or_create(key, factory)
+
+    @staticmethod
+    def _batch_params() -> dict:
+        return {key: EMBED_BATCH_CFG[key] for key in ("max_batch", "max_wait_ms", "workers") if key in EMBED_BATCH_CFG}
+
+    @staticmethod
+    def _ollama_embed_body(model: str, texts: list[str]) -> dict:
+        body = {"model": model, "input": texts, "options": {"num_ctx": 2048}}
+        if LLM_CFG["ollama"].get("keep_alive") is not None: body["keep_alive"] = LLM_CFG["ollama"]["keep_alive"]
+        return body
+
+    @classmethod
+    def _ollama_batch_fn(cls, model: str):
+        """One POST /api/embed for the whole batch, on the pooled connection (texts already carry the instruction prefixes)"""
+        def embed(texts: list[str]) -> list[list[float]]:
+            response = cls.http_client("ollama").post(f"{OLLAMA_URL}/api/embed", json=cls._ollama_embed_body(model, texts))
+            response.raise_for_status()
+            return response.json()["embeddings"]
+        return embed
+
+    @classmethod
+    def _ollama_abatch_fn(cls, model: str):
+        """_ollama_batch_fn() on the pooled async client, for batches formed on the API's event loop"""
+        async def aembed(texts: list[str]) -> list[list[float]]:
+            response = await cls.async_http_client("ollama").post(f"{OLLAMA_URL}/api/embed", json=cls._ollama_embed_body(model, texts))
+            response.raise_for_status()
+            return response.json()["embeddings"]
+        return aembed
+
+    # --- Vector DB ---
+    @classmethod
+    def get_qdrant_client(cls, url: str = None):
+        """
+            Returns the shared QdrantClient. With vector_db.type `qdrant` it talks to the server at `url` through an httpx pool sized
+            by the `clients` config; with `local` or `memory` it is Qdrant's embedded engine in this process and `url` is ignored.
+        """
+        if "qdrant" in cls._overrides: return cls._overrides["qdrant"]
+        if VECTOR_DB_TYPE in ("local", "memory"): return cls._get_or_create(("qdrant", VECTOR_DB_TYPE), cls._embedded_qdrant)
+
+        url = url or QDRANT_URL
+        if not url: raise ValueError("Qdrant URL must be provided.")
+
+        def factory():
+            from qdrant_client import QdrantClient
+            logger.info(f"Initializing qdrant client at {url}")
+            return QdrantClient(url = url, timeout = CLIENTS_CFG.get("qdrant_timeout", 30), limits = cls._limits())
+
+        return cls._get_or_create(("qdrant", url), factory)
+
+    @classmethod
+    def get_async_qdrant_client(cls, url: str = None):
+        """
+            The async counterpart of get_qdrant_client() for the API's event loop: an AsyncQdrantClient for a Qdrant server, or the
+            shared sync client behind ThreadedAsyncQdrant for embedded Qdrant (one process may not open its storage twice)
+        """
+        if "qdrant" in cls._overrides or VECTOR_DB_TYPE in ("local", "memory"): return ThreadedAsyncQdrant(cls.get_qdrant_client(url))
+
+        url = url or QDRANT_URL
+        if not url: raise ValueError("Qdrant URL must be provided.")
+
+        def factory():
+            from qdrant_client import AsyncQdrantClient
+            logger.info(f"Initializing async qdrant client at {url}")
+            return AsyncQdrantClient(url = url, timeout = CLIENTS_CFG.get("qdrant_timeout", 30), limits = cls._limits())
+
+        return cls._get_or_create(("async_qdrant", url), factory)
+
+    @staticmethod
+    def _embedded_qdrant():
+        """Same client API, no server: `local` persists collections under vector_db.path, `memory` keeps them in this process only"""
+        from qdrant_client import QdrantClient
+        if VECTOR_DB_TYPE == "memory":
+            logger.info("Initializing in-memory qdrant client")
+            return QdrantClient(location = ":memory:")
+        os.makedirs(VECTOR_DB_PATH, exist_ok = True)
+        logger.info(f"Initializing local qdrant client at {VECTOR_DB_PATH}")
+        return QdrantClient(path = VECTOR_DB_PATH)
+
+    # --- Shutdown ---
+    @classmethod
+    def close_all(cls):
+        """Closes every pooled connection and forgets all clients (scripts call this when done)"""
+        with cls._lock:
+            clients, cls._clients = cls._clients, {}
+        for key, client in clients.items():
+            if key[0] in ("async_http", "async_qdrant"): continue       # Need an event loop, see aclose_all()
+            close = getattr(client, "close", None)
+            if callable(close):
+                try: close()
+                except Exception as e: logger.warning(f"⚠️ Failed to close {key[0]} client: {e}")
+
+    @classmethod
+    async def aclose_all(cls):
+        """Closes every client including the async pools (the API calls this on shutdown)"""
+        async_clients = [(key[0], client) for key, client in cls._clients.items() if key[0] in ("async_http", "async_qdrant")]
+        cls.close_all()
+        for kind, client in async_clients:
+            if kind == "async_qdrant": await client.close()
+            else:                      await client.aclose()
@@ -20,8 +20,23 @@ with open(config_path, "r") as f:
 # 3. Expose config sections as constants        <- config.yaml
 VECTOR_DB_CFG = _cfg.get("vector_db", {})
 LLM_CFG       = _cfg.get("llm", {})
+LLM_ROLES_CFG = LLM_CFG.get("roles") or {}
+ROLES         = ("document_researcher", "web_researcher", "writer", "rag_answerer", "summarizer")
 AGENT_CFG     = _cfg.get("agent", {})
 RETRIEVER_CFG = _cfg.get("retriever", {})
+PARSER_CFG    = _cfg.get("parsers", {})
+API_CFG       = _cfg.get("api", {})
+CLIENTS_CFG   = _cfg.get("clients", {})
+EMBED_BATCH_CFG = CLIENTS_CFG.get("embedding_batch", {})
+OBSERVABILITY_CFG = _cfg.get("observability", {})
+PROFILING_CFG = OBSERVABILITY_CFG.get("profiling") or {}
+SCHEDULER_CFG = _cfg.get("scheduler", {})
+NEO4J_CFG     = _cfg.get("neo4j", {})
+CORPUS_STORE_CFG = _cfg.get("corpus_store", {})
+MEMORY_CFG    = _cfg.get("memory", {})
+LLM_CACHE_CFG = _cfg.get("llm_cache", {})
+DEDUP_CFG     = _cfg.get("dedup", {})
+WEB_CFG       = _cfg.get("web", {})
 
 # 4. Pull keys from environment                 <- .env
 OPENAI_API_KEY     = os.getenv("OPENAI_API_KEY")
@@ -29,7 +44,12 @@ OPENAI_EMBED_MODEL = LLM_CFG.get("openai", {}).get("embedding_model") # will ret
 OLLAMA_URL         = os.getenv("OLLAMA_URL")
 QDRANT_URL         = os.getenv("QDRANT_URL")
 SERPAPI_API_KEY    = os.getenv("SERPAPI_API_KEY")
+CAD_PARSER_URL     = os.getenv("CAD_PARSER_URL")
+PDF_PARSER_URL     = os.getenv("PDF_PARSER_URL")
+PROFILE_TOKEN      = os.getenv("PROFILE_TOKEN")            # Admin token for the X-Profile header and GET /profiles
 MAX_UPLOAD_SIZE    = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50")) * (1 << 20)
+VECTOR_DB_TYPE     = os.getenv("VECTOR_DB_TYPE") or VECTOR_DB_CFG.get("type", "qdrant")          # qdrant | local | memory
+VECTOR_DB_PATH     = str(base_dir / (os.getenv("VECTOR_DB_PATH") or VECTOR_DB_CFG.get("path", "data/qdrant_local")))
 
 # Create a importable object                    -> config.py
 config = Box(_cfg)
\ No newline at end of file
@@ -0,0 +1,172 @@
+# src/rag_agent_framework/core/embedding_batcher.py -- Dynamic micro-batching for embedding calls from concurrent requests
+# Every /chat request embeds its question on its own (MemoryStore.get_memories, then the rag_tool retriever). BatchingEmbeddings
+# puts those calls on one queue; worker threads take whatever arrives within `max_wait_ms` (up to `max_batch` texts) and send it
+# as one batched request, then hand each caller its own slice of the result.
+# 1. Callers from threads block on a concurrent.futures.Future filled by the worker threads. Callers on the event loop are
+#    batched on the loop itself and sent with `abatch_fn` (an async HTTP request), so /chat never holds a thread while it
+#    embeds; only embedders without an async API fall back to the worker threads
+# 2. Calls that already carry `max_batch` texts or more (ingest) skip the queue -- they are a full batch on their own
+# 3. Each batch is timed as the "embed" stage; its size goes to rag_embedding_batch_size on /metrics
+
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future
+from langchain_core.embeddings import Embeddings
+
+from rag_agent_framework.core.telemetry import Histogram, register, span, get_logger
+
+logger = get_logger(__name__)
+
+BATCH_SIZE = register(Histogram("rag_embedding_batch_size", "Texts per batched embedding request", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)))
+
+
+class BatchingEmbeddings(Embeddings):
+    """
+        Wraps an embedder; `batch_fn(texts) -> vectors` sends one batched request (defaults to embedder.embed_documents), and
+        `async abatch_fn(texts) -> vectors` its async counterpart (defaults to embedder.aembed_documents when the embedder has
+        a native one; otherwise async callers use the worker threads). Queries and documents share batches, so embedders that
+        embed them differently pass their prefixes (e.g. Ollama's "query: " / "passage: ") and batch functions that send the
+        texts as given.
+    """
+
+    def __init__(self, embedder: Embeddings, batch_fn=None, max_batch: int = 64, max_wait_ms: float = 5.0, workers: int = 2,
+                 query_prefix: str = "", document_prefix: str = "", abatch_fn=None):
+        native_async         = type(embedder).aembed_documents is not Embeddings.aembed_documents     # Not the run_in_executor default
+        self.embedder        = embedder
+        self.batch_fn        = batch_fn or embedder.embed_documents
+        self.abatch_fn       = abatch_fn or (embedder.aembed_documents if batch_fn is None and native_async else None)
+        self.max_batch       = max_batch
+        self.max_wait_s      = max_wait_ms / 1000
+        self.workers         = workers
+        self.query_prefix    = query_prefix
+        self.document_prefix = document_prefix
+        self._queue          = queue.Queue()
+        self._threads        = []
+        self._lock           = threading.Lock()
+        self._loop           = None                 # Event-loop batching state, reset when used from another loop
+        self._pending        = []
+        self._pending_size   = 0
+        self._flush_timer    = None
+        self._slots          = None
+
+    def __getattr__(self, name):
+        return getattr(self.embedder, name)
+
+    # --- Submitting ---
+    def _submit(self, texts: list[str]) -> Future:
+        if not self._threads:
+            with self._lock:
+                if not self._threads:
+                    self._threads = [threading.Thread(target=self._work, name=f"embed-batcher-{i}", daemon=True) for i in range(self.workers)]
+                    for thread in self._threads: thread.start()
+        future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def _embed_now(self, texts: list[str]) -> list[list[float]]:
+        with span("embed"):
+            vectors = self.batch_fn(texts)
+        BATCH_SIZE.observe(len(texts))
+        return vectors
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        texts = [f"{self.document_prefix}{text}" for text in texts]
+        if not texts: return []
+        if len(texts) >= self.max_batch: return self._embed_now(texts)
+        return self._submit(texts).result()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._submit([f"{self.query_prefix}{text}"]).result()[0]
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Several queries of one caller (e.g. multi-query retrieval) in one batch, with the query prefix"""
+        if not texts: return []
+        return self._submit([f"{self.query_prefix}{text}" for text in texts]).result()
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        texts = [f"{self.document_prefix}{text}" for text in texts]
+        if not texts: return []
+        if self.abatch_fn is None:                  # No async API: the worker threads embed it
+            if len(texts) >= self.max_batch: return await asyncio.get_running_loop().run_in_executor(None, self._embed_now, texts)
+            return await asyncio.wrap_future(self._submit(texts))
+        if len(texts) >= self.max_batch: return await self._aembed_now(texts)
+        return await self._asubmit(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        texts = [f"{self.query_prefix}{text}"]
+        if self.abatch_fn is None: return (await asyncio.wrap_future(self._submit(texts)))[0]
+        return (await self._asubmit(texts))[0]
+
+    # --- Event-loop batching ---
+    async def _aembed_now(self, texts: list[str]) -> list[list[float]]:
+        async with self._slots_for(asyncio.get_running_loop()):
+            with span("embed"):
+                vectors = await self.abatch_fn(texts)
+        BATCH_SIZE.observe(len(texts))
+        return vectors
+
+    def _slots_for(self, loop) -> asyncio.Semaphore:
+        """At most `workers` batched requests in flight from the loop, like the worker threads"""
+        if self._loop is not loop:
+            self._loop, self._pending, self._pending_size, self._flush_timer = loop, [], 0, None
+            self._slots = asyncio.Semaphore(self.workers)
+        return self._slots
+
+    async def _asubmit(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        self._slots_for(loop)
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_size += len(texts)
+        if self._pending_size >= self.max_batch:  self._aflush()
+        elif self._flush_timer is None:           self._flush_timer = loop.call_later(self.max_wait_s, self._aflush)
+        return await future
+
+    def _aflush(self):
+        if self._flush_timer is not None: self._flush_timer.cancel()
+        pending, self._pending, self._pending_size, self._flush_timer = self._pending, [], 0, None
+        if pending: self._loop.create_task(self._asend(pending))
+
+    async def _asend(self, pending: list[tuple[list[str], asyncio.Future]]):
+        texts = [text for texts, _ in pending for text in texts]
+        try:
+            vectors = await self._aembed_now(texts)
+        except Exception as e:
+            logger.warning(f"⚠️ Batched embedding of {len(texts)} texts for {len(pending)} callers failed: {e}")
+            for _, future in pending:
+                if not future.done(): future.set_exception(e)
+            return
+        start = 0
+        for texts, future in pending:
+            if not future.done(): future.set_result(vectors[start:start + len(texts)])     # Skipped if the caller went away
+            start += len(texts)
+
+    # --- Workers ---
+    def _work(self):
+        while True:
+            pending  = [self._queue.get()]
+            size     = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait_s
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0: break
+                try: item = self._queue.get(timeout=remaining)
+                except queue.Empty: break
+                pending.append(item)
+                size += len(item[0])
+            self._flush(pending)
+
+    def _flush(self, pending: list[tuple[list[str], Future]]):
+        texts = [text for texts, _ in pending for text in texts]
+        try:
+            vectors = self._embed_now(texts)
+        except Exception as e:
+            logger.warning(f"⚠️ Batched embedding of {len(texts)} texts for {len(pending)} callers failed: {e}")
+            for _, future in pending: future.set_exception(e)
+            return
+        start = 0
+        for texts, future in pending:
+            future.set_result(vectors[start:start + len(texts)])
+            start += len(texts)
@@ -0,0 +1,102 @@
+# src/rag_agent_framework/core/llm_cache.py -- Opt-in, on-disk exact-match cache for chat-model calls (llm_cache in config.yaml)
+# ClientRegistry.get_chat_model() hands this to LangChain as the model's `cache`, so agents, the RAG chain and the summarizer all use it.
+# 1. Key: sha256 of LangChain's llm_string (provider class, model, every invocation parameter) and the full serialized prompt
+# 2. Stored in one SQLite file (WAL, shared by processes); entries expire after `ttl_s` and the least recently used beyond
+#    `max_entries` are evicted
+# 3. Only deterministic models get it: a temperature above 0 (or the provider's default) bypasses the cache unless `force`
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from langchain_core.caches import BaseCache
+from langchain_core.load   import dumps, loads
+
+from rag_agent_framework.core.config    import LLM_CACHE_CFG, base_dir
+from rag_agent_framework.core.telemetry import Counter, register, get_logger
+
+logger = get_logger(__name__)
+
+LOOKUPS = register(Counter("rag_llm_cache_lookups_total", "LLM cache lookups", ("result",)))
+
+
+class SQLiteLLMCache(BaseCache):
+    """LangChain cache backed by a local SQLite database with a TTL and an entry cap"""
+
+    def __init__(self, path: str, ttl_s: float = 7 * 24 * 3600, max_entries: int = 50000, prune_every: int = 100):
+        self.path        = Path(path)
+        self.ttl_s       = ttl_s
+        self.max_entries = max_entries
+        self.prune_every = prune_every                  # Inserts between evictions
+        self._inserts    = 0
+        self._lock       = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)")
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str):
+        key, now = self._key(prompt, llm_string), time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl_s:
+                self._db.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+        if not row or now - row[1] > self.ttl_s:
+            LOOKUPS.inc(result="miss")
+            return None
+        try:
+            generations = [loads(generation) for generation in json.loads(row[0])]
+        except Exception as e:                          # Written by another LangChain version
+            logger.warning(f"⚠️ Dropping unreadable LLM cache entry: {e}")
+            LOOKUPS.inc(result="miss")
+            return None
+        LOOKUPS.inc(result="hit")
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val):
+        value, now = json.dumps([dumps(generation) for generation in return_val]), time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO llm_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                             (self._key(prompt, llm_string), value, now, now))
+            self._inserts += 1
+            if self._inserts % self.prune_every == 0: self._prune(now)
+
+    def _prune(self, now: float):
+        self._db.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl_s,))
+        self._db.execute("DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                         (self.max_entries,))
+
+    def clear(self, **kwargs):
+        with self._lock:
+            self._db.execute("DELETE FROM llm_cache")
+
+    def size(self) -> int:
+        """Entries stored (not __len__: LangChain tests the cache for truthiness, an empty one would be skipped)"""
+        return self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+def cacheable(temperature) -> bool:
+    """Whether calls at this temperature may be served from the cache (None means the provider's default, which is above 0)"""
+    return LLM_CACHE_CFG.get("force", False) or temperature == 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_llm_cache() -> SQLiteLLMCache | None:
+    """The process-wide cache, or None when llm_cache.enabled is false"""
+    global _cache
+    if not LLM_CACHE_CFG.get("enabled", False): return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLiteLLMCache(base_dir / LLM_CACHE_CFG.get("path", "data/llm_cache.sqlite"),
+                                    LLM_CACHE_CFG.get("ttl_s", 7 * 24 * 3600), LLM_CACHE_CFG.get("max_entries", 50000))
+            logger.info(f"🗃️  LLM cache at {_cache.path} ({_cache.size()} entries)")
+    return _cache
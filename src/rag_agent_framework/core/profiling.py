@@ -0,0 +1,190 @@
+# src/rag_agent_framework/core/profiling.py -- On-demand sampling profiles of single requests and ingest runs (observability.profiling)
+# 1. A request is profiled when it carries the admin header (X-Profile: <PROFILE_TOKEN>) or is picked by `sample_rate`;
+#    scripts/ingest.py profiles the whole run with --profile
+# 2. While a profile runs, a sampler thread records the Python stack of every thread each `interval_ms` (sys._current_frames),
+#    so time spent inside crewai, LangChain or qdrant-client shows up; threads that only waited for work the whole time are left out
+# 3. span() records each stage of the profiled request (core/telemetry.py, through the current_profile context variable)
+# 4. The result is a speedscope file (https://www.speedscope.app, one flame graph per thread) plus a summary with the stage
+#    timings, both in `dir`; the newest `keep` profiles are kept and GET /profiles lists them. The API writes them from a
+#    worker thread (aprofile), never from the event loop
+# 5. Reading profiles and the X-Profile header need PROFILE_TOKEN: without it set, only sample_rate profiles anything and
+#    GET /profiles is closed
+# No profiler package is needed: the sampler is a few dozen lines on top of the standard library.
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import hmac
+import asyncio
+import threading
+from pathlib    import Path
+from contextlib import contextmanager, asynccontextmanager
+
+from rag_agent_framework.core.config    import PROFILING_CFG, PROFILE_TOKEN, base_dir
+from rag_agent_framework.core.telemetry import Counter, register, current_profile, get_logger
+
+logger = get_logger(__name__)
+
+PROFILES = register(Counter("rag_profiles_total", "Requests and runs profiled", ("trigger",)))
+
+HEADER = "X-Profile"
+
+_WAITING = ("threading.py", "queue.py", "selectors.py")      # A thread whose stack always ends in these was only waiting for work
+
+
+class Profile:
+    """Samples every thread's stack until stop(); collects the stage timings of the profiled work"""
+
+    def __init__(self, name: str, interval_ms: float = 5.0):
+        self.id          = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.name        = name
+        self.interval_s  = interval_ms / 1000
+        self.started     = time.time()
+        self.duration_s  = 0.0
+        self.stages      = []                               # (stage, thread, offset_s, duration_s)
+        self._frames     = {}                               # (function, file, line) -> index in the speedscope frame table
+        self._samples    = {}                               # thread name -> [stack as frame indexes, root first], [weights]
+        self._origin     = time.perf_counter()
+        self._stop       = threading.Event()
+        self._lock       = threading.Lock()
+        self._sampler    = threading.Thread(target=self._sample, name="profiler", daemon=True)
+
+    # --- Recording ---
+    def start(self):
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        self.duration_s = time.perf_counter() - self._origin
+
+    def add_stage(self, stage: str, start: float, elapsed: float):
+        with self._lock:
+            self.stages.append((stage, threading.current_thread().name, start - self._origin, elapsed))
+
+    def _frame(self, frame) -> int:
+        code = frame.f_code
+        key  = (code.co_name, code.co_filename, code.co_firstlineno)
+        if key not in self._frames: self._frames[key] = len(self._frames)
+        return self._frames[key]
+
+    def _sample(self):
+        names, own, last = {}, threading.get_ident(), time.perf_counter()
+        while not self._stop.wait(self.interval_s):
+            now          = time.perf_counter()
+            weight, last = (now - last) * 1000, now             # Real time since the last sample, in case the sampler fell behind
+            if len(names) != threading.active_count(): names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own: continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame(frame))
+                    frame = frame.f_back
+                samples, weights = self._samples.setdefault(names.get(ident, str(ident)), ([], []))
+                samples.append(stack[::-1])
+                weights.append(weight)
+
+    # --- Output ---
+    def speedscope(self) -> dict:
+        """The samples in the speedscope file format, one sampled profile per busy thread (times in milliseconds)"""
+        frames   = [{"name": name, "file": file, "line": line} for (name, file, line), _ in sorted(self._frames.items(), key=lambda item: item[1])]
+        idle     = lambda samples: all(not sample or frames[sample[-1]]["file"].endswith(_WAITING) for sample in samples)
+        profiles = [{"type": "sampled", "name": thread, "unit": "milliseconds", "startValue": 0, "endValue": sum(weights),
+                     "samples": samples, "weights": weights}
+                    for thread, (samples, weights) in sorted(self._samples.items()) if not idle(samples)]
+        return {"$schema": "https://www.speedscope.app/file-format-schema.json", "name": self.name, "exporter": "rag_agent_framework",
+                "activeProfileIndex": 0, "shared": {"frames": frames}, "profiles": profiles}
+
+    def summary(self) -> dict:
+        return {
+            "id":         self.id,
+            "name":       self.name,
+            "started":    self.started,
+            "duration_s": round(self.duration_s, 4),
+            "samples":    sum(len(samples) for samples, _ in self._samples.values()),
+            "stages":     [{"stage": stage, "thread": thread, "offset_s": round(offset, 4), "duration_s": round(elapsed, 4)}
+                           for stage, thread, offset, elapsed in self.stages],
+            "speedscope": f"{self.id}.speedscope.json",
+        }
+
+    def save(self, directory: Path) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{self.id}.speedscope.json").write_text(json.dumps(self.speedscope()))
+        path = directory / f"{self.id}.json"
+        path.write_text(json.dumps(self.summary(), indent=2))
+        return path
+
+
+# ==============================================================================
+# Triggers and storage
+# ==============================================================================
+def profiles_dir() -> Path:
+    return base_dir / PROFILING_CFG.get("dir", "data/profiles")
+
+def trigger_for(headers) -> str | None:
+    """'header' when the request carries the admin token, 'sampled' when the sample rate picks it, otherwise None"""
+    if not PROFILING_CFG.get("enabled", True): return None
+    token = headers.get(HEADER)
+    if token and PROFILE_TOKEN and hmac.compare_digest(token, PROFILE_TOKEN): return "header"
+    if random.random() < PROFILING_CFG.get("sample_rate", 0.0): return "sampled"
+    return None
+
+def is_admin(headers) -> bool:
+    """Whether the request may read profiles: only with the admin token, so nobody can while PROFILE_TOKEN is unset"""
+    token = headers.get(HEADER)
+    return bool(token and PROFILE_TOKEN) and hmac.compare_digest(token, PROFILE_TOKEN)
+
+def _finish(running: Profile, trigger: str, directory: Path = None):
+    """Stops the sampler and writes the files (blocking: the sampler join and the JSON writes)"""
+    running.stop()
+    directory = directory or profiles_dir()
+    path      = running.save(directory)
+    PROFILES.inc(trigger=trigger)
+    prune(directory, PROFILING_CFG.get("keep", 50))
+    logger.info(f"🔬 Profiled '{running.name}' ({running.duration_s:.2f} s) -> {path}")
+
+@contextmanager
+def profile(name: str, trigger: str = "header", directory: Path = None):
+    """Profiles the block (and everything it runs in other threads); the files are written when it ends"""
+    running = Profile(name, PROFILING_CFG.get("interval_ms", 5.0)).start()
+    token   = current_profile.set(running)
+    try:
+        yield running
+    finally:
+        current_profile.reset(token)
+        _finish(running, trigger, directory)
+
+@asynccontextmanager
+async def aprofile(name: str, trigger: str = "header", directory: Path = None):
+    """profile() for the event loop: the files are written on a worker thread"""
+    running = Profile(name, PROFILING_CFG.get("interval_ms", 5.0)).start()
+    token   = current_profile.set(running)
+    try:
+        yield running
+    finally:
+        current_profile.reset(token)
+        await asyncio.to_thread(_finish, running, trigger, directory)
+
+def _summaries(directory: Path) -> list[Path]:
+    """Summary files, newest first"""
+    paths = [path for path in directory.glob("*.json") if not path.name.endswith(".speedscope.json")]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+def prune(directory: Path, keep: int):
+    for summary in _summaries(directory)[keep:]:
+        summary.unlink(missing_ok=True)
+        summary.with_name(f"{summary.stem}.speedscope.json").unlink(missing_ok=True)
+
+def recent_profiles(directory: Path = None, limit: int = 20) -> list[dict]:
+    """Summaries of the newest profiles, newest first"""
+    directory = directory or profiles_dir()
+    if not directory.exists(): return []
+    return [json.loads(path.read_text()) for path in _summaries(directory)[:limit]]
+
+def speedscope_path(profile_id: str, directory: Path = None) -> Path | None:
+    path = (directory or profiles_dir()) / f"{profile_id}.speedscope.json"
+    return path if path.name == f"{Path(profile_id).name}.speedscope.json" and path.exists() else None
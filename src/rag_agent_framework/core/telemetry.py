@@ -0,0 +1,274 @@
+# src/rag_agent_framework/core/telemetry.py -- Timing spans, Prometheus metrics and logging for the API, the memory store and ingestion
+# 1. span("stage") times a block into the rag_stage_duration_seconds histogram (and counts failures)
+# 2. LLMMetricsHandler / AgentMetricsHandler are LangChain callbacks for LLM calls (latency + tokens) and crew tasks,
+#    TimedEmbeddings times every embedding call
+# 3. render_metrics() returns the Prometheus text exposition format served on /metrics
+# 4. get_logger() replaces print(): the level comes from LOG_LEVEL or observability.log_level
+# The metric types are hand-rolled (a few dozen lines) so the project does not need prometheus_client.
+
+import os
+import time
+import logging
+import threading
+from contextlib  import contextmanager
+from contextvars import ContextVar
+from langchain_core.callbacks  import BaseCallbackHandler
+from langchain_core.embeddings import Embeddings
+
+from rag_agent_framework.core.config import OBSERVABILITY_CFG
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+BUCKETS         = tuple(OBSERVABILITY_CFG.get("buckets") or DEFAULT_BUCKETS)
+
+
+# ==============================================================================
+# 1. LOGGING
+# ==============================================================================
+_logging_configured = False
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns a module logger; the first call sets up the 'rag_agent_framework' handler and level"""
+    global _logging_configured
+    if not _logging_configured:
+        level   = os.getenv("LOG_LEVEL") or OBSERVABILITY_CFG.get("log_level", "INFO")
+        root    = logging.getLogger("rag_agent_framework")
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        root.addHandler(handler)
+        root.setLevel(level.upper())
+        root.propagate      = False
+        _logging_configured = True
+    return logging.getLogger(name if name.startswith("rag_agent_framework") else f"rag_agent_framework.{name}")
+
+logger = get_logger(__name__)
+
+
+# ==============================================================================
+# 2. METRIC TYPES
+# ==============================================================================
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra: pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names"""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self._values = {}
+        self._lock   = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels.get(name, "") for name in self.labelnames), 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed set of label names"""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = BUCKETS):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}           # labels -> [bucket counts..., sum, count]
+        self._lock   = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound: series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> dict:
+        """{labels: (count, sum)} for summaries outside Prometheus"""
+        with self._lock:
+            return {key: (series[-1], series[-2]) for key, series in self._series.items()}
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {count}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {series[-1]}")
+                lines.append(f"{self.name}_sum{_label_text(self.labelnames, key)} {series[-2]}")
+                lines.append(f"{self.name}_count{_label_text(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    def set(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+# ==============================================================================
+# 3. THE METRICS
+# ==============================================================================
+STAGE_SECONDS     = Histogram("rag_stage_duration_seconds", "Duration of a pipeline stage", ("stage",))
+STAGE_ERRORS      = Counter("rag_stage_errors_total", "Pipeline stages that raised", ("stage",))
+CREW_TASK_SECONDS = Histogram("rag_crew_task_duration_seconds", "Duration of one crew task, by agent role", ("agent",))
+TOOL_SECONDS      = Histogram("rag_tool_duration_seconds", "Duration of one agent tool call", ("tool",))
+LLM_SECONDS       = Histogram("rag_llm_request_duration_seconds", "Duration of one LLM call", ("model",))
+LLM_TOKENS        = Counter("rag_llm_tokens_total", "Tokens used by LLM calls", ("model", "kind"))
+LLM_ERRORS        = Counter("rag_llm_errors_total", "LLM calls that raised", ("model",))
+HTTP_SECONDS      = Histogram("rag_http_request_duration_seconds", "API request duration", ("method", "path", "status"))
+
+REGISTRY = [STAGE_SECONDS, STAGE_ERRORS, CREW_TASK_SECONDS, TOOL_SECONDS, LLM_SECONDS, LLM_TOKENS, LLM_ERRORS, HTTP_SECONDS]
+
+def register(metric):
+    """Adds a metric defined elsewhere (e.g. the scheduler gauges) to /metrics"""
+    REGISTRY.append(metric)
+    return metric
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+def stage_summary() -> dict:
+    """{stage: {"count", "total_s", "mean_ms"}} of everything timed with span() so far (ingest prints this at the end)"""
+    return {
+        key[0]: {"count": count, "total_s": round(total, 3), "mean_ms": round(total / count * 1000, 2) if count else 0.0}
+        for key, (count, total) in sorted(STAGE_SECONDS.snapshot().items())
+    }
+
+
+# ==============================================================================
+# 4. SPANS
+# ==============================================================================
+current_profile = ContextVar("current_profile", default=None)      # The core/profiling.py Profile of the running request, if any
+
+@contextmanager
+def span(stage: str, histogram: Histogram = STAGE_SECONDS, **labels):
+    """Times the block into `histogram` (the stage histogram by default); failures are counted and re-raised"""
+    labels = labels or {"stage": stage}
+    start  = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed, **labels)
+        profile = current_profile.get()
+        if profile is not None: profile.add_stage(stage, start, elapsed)
+        logger.debug(f"⏱️ {stage} took {elapsed * 1000:.1f} ms")
+
+
+# ==============================================================================
+# 5. LANGCHAIN CALLBACKS
+# ==============================================================================
+def _model_name(serialized: dict, kwargs: dict) -> str:
+    params = kwargs.get("invocation_params") or {}
+    return params.get("model_name") or params.get("model") or (serialized or {}).get("name") or "unknown"
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """Times every LLM call and counts prompt/completion tokens. ClientRegistry attaches one shared instance to each chat model"""
+
+    def __init__(self):
+        self._starts = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._starts[run_id] = (time.perf_counter(), _model_name(serialized, kwargs))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._starts[run_id] = (time.perf_counter(), _model_name(serialized, kwargs))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        start, model = self._starts.pop(run_id, (None, "unknown"))
+        if start is not None: LLM_SECONDS.observe(time.perf_counter() - start, model=model)
+
+        # OpenAI reports token_usage in llm_output, Ollama reports prompt_eval_count / eval_count per generation
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens, completion_tokens = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+        if not usage:
+            for generations in response.generations:
+                for generation in generations:
+                    info = generation.generation_info or {}
+                    prompt_tokens     += info.get("prompt_eval_count", 0) or 0
+                    completion_tokens += info.get("eval_count", 0) or 0
+        if prompt_tokens:     LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+        if completion_tokens: LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        _, model = self._starts.pop(run_id, (None, "unknown"))
+        LLM_ERRORS.inc(model=model)
+
+llm_handler = LLMMetricsHandler()
+
+
+class AgentMetricsHandler(BaseCallbackHandler):
+    """Times each crew task: crewai runs one top-level agent-executor chain per task, tagged here with the agent role"""
+
+    def __init__(self, agent: str):
+        self.agent   = agent
+        self._starts = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None: self._starts[run_id] = time.perf_counter()
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        start = self._starts.pop(run_id, None)
+        if start is not None: CREW_TASK_SECONDS.observe(time.perf_counter() - start, agent=self.agent)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        if self._starts.pop(run_id, None) is not None: STAGE_ERRORS.inc(stage=f"crew_task:{self.agent}")
+
+
+# ==============================================================================
+# 6. EMBEDDINGS
+# ==============================================================================
+
+class TimedEmbeddings(Embeddings):
+    """Wraps an embedder so every call is timed as the 'embed' stage (ClientRegistry hands these out)"""
+
+    def __init__(self, embedder: Embeddings):
+        self.embedder = embedder
+
+    def __getattr__(self, name):
+        return getattr(self.embedder, name)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        with span("embed"):
+            return self.embedder.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        with span("embed"):
+            return self.embedder.embed_query(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        with span("embed"):
+            return await self.embedder.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        with span("embed"):
+            return await self.embedder.aembed_query(text)
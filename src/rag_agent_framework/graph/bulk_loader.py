@@ -0,0 +1,142 @@
+# src/rag_agent_framework/graph/bulk_loader.py -- Loads Part and Document nodes into the knowledge graph in bulk
+# Two loaders with the same interface (add_part / add_document / close):
+#   MergeGraphLoader  -- ensures the schema (graph/schema.define_schema), then writes batches of rows with one UNWIND ... MERGE per batch
+#   CsvGraphWriter    -- writes node / relationship CSVs for `neo4j-admin database import full` (initial loads of very large corpora)
+# Both report nodes/sec on close().
+
+import csv
+import time
+from pathlib import Path
+
+from rag_agent_framework.core.config    import NEO4J_CFG
+from rag_agent_framework.core.telemetry import get_logger, span
+from rag_agent_framework.graph.schema   import define_schema
+
+logger = get_logger(__name__)
+
+# Label -> (unique key, other properties with their neo4j-admin types); mirrors the MERGE keys of the transactional path
+NODE_TYPES = {
+    "Part":     ("part_id", {"volume": "double", "source_file": "string"}),
+    "Document": ("source_path", {"document_id": "string", "filename": "string"}),
+}
+
+MERGE_QUERIES = {
+    label: f"UNWIND $rows AS row MERGE (n:{label} {{{key}: row.{key}}}) SET " + ", ".join(f"n.{prop} = row.{prop}" for prop in props)
+    for label, (key, props) in NODE_TYPES.items()
+}
+
+
+class _GraphLoader:
+    """Shared bookkeeping: row buffers per label and the nodes/sec report"""
+
+    def __init__(self):
+        self.nodes         = 0
+        self.relationships = 0
+        self._started      = time.perf_counter()
+
+    def add_part(self, part_id: str, volume: float, source_file: str):
+        self._add("Part", {"part_id": part_id, "volume": volume, "source_file": source_file})
+
+    def add_document(self, source_path: str, document_id: str, filename: str):
+        self._add("Document", {"source_path": source_path, "document_id": document_id, "filename": filename})
+
+    def stats(self) -> dict:
+        seconds = time.perf_counter() - self._started
+        return {"nodes": self.nodes, "relationships": self.relationships, "seconds": round(seconds, 3),
+                "nodes_per_s": round(self.nodes / seconds, 1) if seconds else 0.0}
+
+
+class MergeGraphLoader(_GraphLoader):
+    """Transactional loading into a live database: `batch_size` rows per UNWIND ... MERGE, on the uniqueness-constraint indexes"""
+
+    def __init__(self, driver, batch_size: int = None):
+        super().__init__()
+        self.driver     = driver
+        self.batch_size = batch_size or NEO4J_CFG.get("batch_size", 1000)
+        self._rows      = {label: [] for label in NODE_TYPES}
+        self._rels      = {}
+        define_schema(driver)                   # Without the constraints every MERGE is a label scan
+
+    def _add(self, label: str, row: dict):
+        self._rows[label].append(row)
+        if len(self._rows[label]) >= self.batch_size: self._flush(label)
+
+    def add_relationship(self, rel_type: str, start: tuple, end: tuple):
+        """start / end are (label, key value), e.g. ("Part", "housing.step:1")"""
+        key = (rel_type, start[0], end[0])
+        self._rels.setdefault(key, []).append({"start": start[1], "end": end[1]})
+        if len(self._rels[key]) >= self.batch_size: self._flush_relationships(key)
+
+    def _flush(self, label: str):
+        rows, self._rows[label] = self._rows[label], []
+        if not rows: return
+        with span("graph_write"), self.driver.session() as session:
+            session.run(MERGE_QUERIES[label], rows=rows)
+        self.nodes += len(rows)
+
+    def _flush_relationships(self, key: tuple):
+        rel_type, start_label, end_label = key
+        rows, self._rels[key] = self._rels[key], []
+        if not rows: return
+        start_key, end_key = NODE_TYPES[start_label][0], NODE_TYPES[end_label][0]
+        with span("graph_write"), self.driver.session() as session:
+            session.run(f"UNWIND $rows AS row MATCH (a:{start_label} {{{start_key}: row.start}}) MATCH (b:{end_label} {{{end_key}: row.end}}) "
+                        f"MERGE (a)-[:{rel_type}]->(b)", rows=rows)
+        self.relationships += len(rows)
+
+    def flush(self):
+        for label in NODE_TYPES: self._flush(label)
+        for key in list(self._rels): self._flush_relationships(key)     # After the nodes they connect
+
+    def close(self) -> dict:
+        self.flush()
+        stats = self.stats()
+        logger.info(f"🕸️  Merged {stats['nodes']} nodes and {stats['relationships']} relationships in {stats['seconds']}s ({stats['nodes_per_s']} nodes/s)")
+        return stats
+
+
+class CsvGraphWriter(_GraphLoader):
+    """
+        Writes one CSV per label and relationship type for an offline initial import (the database must be stopped and empty):
+            neo4j-admin database import full --nodes=Part.csv --nodes=Document.csv [--relationships=...] neo4j
+        Keys are de-duplicated here because the import tool rejects duplicate IDs (MERGE semantics of the transactional path).
+        Run graph/schema.py against the imported database afterwards to create the constraints and indexes.
+    """
+
+    def __init__(self, out_dir: str):
+        super().__init__()
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._files, self._writers, self._seen = {}, {}, {}
+
+    def _writer(self, name: str, header: list[str]):
+        if name not in self._writers:
+            self._files[name]   = open(self.out_dir / f"{name}.csv", "w", newline="", encoding="utf-8")
+            self._writers[name] = csv.writer(self._files[name])
+            self._writers[name].writerow(header)
+        return self._writers[name]
+
+    def _add(self, label: str, row: dict):
+        key, props = NODE_TYPES[label]
+        seen = self._seen.setdefault(label, set())
+        if row[key] in seen: return
+        seen.add(row[key])
+        header = [f"{key}:ID({label})"] + [f"{prop}:{kind}" if kind != "string" else prop for prop, kind in props.items()] + [":LABEL"]
+        self._writer(label, header).writerow([row[key]] + [row[prop] for prop in props] + [label])
+        self.nodes += 1
+
+    def add_relationship(self, rel_type: str, start: tuple, end: tuple):
+        name = f"{start[0]}_{rel_type}_{end[0]}"
+        self._writer(name, [f":START_ID({start[0]})", f":END_ID({end[0]})", ":TYPE"]).writerow([start[1], end[1], rel_type])
+        self.relationships += 1
+
+    def import_command(self) -> str:
+        args = [f"--{'nodes' if name in NODE_TYPES else 'relationships'}={self.out_dir / name}.csv" for name in self._writers]
+        return "neo4j-admin database import full " + " ".join(args) + " neo4j"
+
+    def close(self) -> dict:
+        for handle in self._files.values(): handle.close()
+        stats = self.stats()
+        logger.info(f"🕸️  Wrote {stats['nodes']} nodes and {stats['relationships']} relationships to {self.out_dir} ({stats['nodes_per_s']} nodes/s)")
+        logger.info(f"   Import with: {self.import_command()}")
+        return stats
@@ -9,7 +9,7 @@ NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 
 def define_schema(driver):
     """
-        Defines uniqueness constraints for the medical device knowledge graph.
+        Defines uniqueness constraints (each backed by an index, which MERGE uses) and lookup indexes for the medical device knowledge graph.
         This ensures data integrity by preventing duplicate nodes for the same entity.
         Running this multiple times is safe (idempotent)
     """
@@ -30,13 +30,22 @@ def define_schema(driver):
 
         # Constraint for Standards: ensures each standard ID is unique (e.g., 'ISO 10993')
         session.run("""CREATE CONSTRAINT standard_id_unique IF NOT EXISTS 
-                       FOR (s:Standard) REQUIRE s:id IS UNIQUE""")
+                       FOR (s:Standard) REQUIRE s.id IS UNIQUE""")
         print("  - Constraint 'standard_id_unique' ensured for (:Standard).")
         
         # Generic constraints for Documents: ensures each document is unique by its source path
         session.run("""CREATE CONSTRAINT document_path_unique IF NOT EXISTS
                        FOR (d:Document) REQUIRE d.source_path IS UNIQUE""")
         print("  - Constraint 'document_path_unique' ensured for (:Document).")
+
+        # Lookup indexes for the properties ingestion and retrieval match on besides the unique keys
+        session.run("""CREATE INDEX document_id_index IF NOT EXISTS
+                       FOR (d:Document) ON (d.document_id)""")
+        print("  - Index 'document_id_index' ensured for (:Document).")
+
+        session.run("""CREATE INDEX part_source_file_index IF NOT EXISTS
+                       FOR (p:Part) ON (p.source_file)""")
+        print("  - Index 'part_source_file_index' ensured for (:Part).")
     
         print("\nSchema definition complete.")
 
@@ -46,6 +55,8 @@ def main():
         # Use auth=None as configured in docker-compose.yml for local development
         driver = GraphDatabase.driver(NEO4J_URI, auth=None )
         driver.verify_connectivity()
+        define_schema(driver)
+        driver.close()
         print(f"Connection to Neo4j closed.")
     except Exception as e:
         print(f"Failed to connect to Neo4j or define schema: {e}")
@@ -0,0 +1,122 @@
+# src/rag_agent_framework/rag/collections.py -- Versioned Qdrant collections behind aliases, so rebuilds never take a collection offline
+# Readers (get_vector_store, get_rag_chain, MemoryStore) always address the alias, e.g. "rag_collection";
+# the points live in versioned collections named "<alias>__v<unix ms>".
+# 1. ensure_collection() only ever creates: the first version and its alias when neither exists. A Qdrant error while checking
+#    is raised, never mistaken for "missing" -- so a transient failure can no longer wipe a collection. A process that loses
+#    the race to create the alias drops its own version and uses the winner's
+# 2. A rebuild (scripts/reindex.py) fills new_version() while live traffic keeps reading the old one, then swap_alias() repoints
+#    the alias in one atomic update_collection_aliases call and drops versions beyond `keep`
+# 3. rollback() points the alias back at the newest retained older version
+# 4. aensure_collection() is the event-loop version for the API's async memory path (rag/memory.py AsyncMemoryStore)
+
+import time
+import asyncio
+import weakref
+from qdrant_client import QdrantClient, models
+
+from rag_agent_framework.core.clients      import ClientRegistry
+from rag_agent_framework.core.config       import VECTOR_DB_CFG
+from rag_agent_framework.core.telemetry    import get_logger
+from rag_agent_framework.rag.vector_store  import get_embedder, create_payload_indexes
+
+logger = get_logger(__name__)
+
+KEEP_VERSIONS = VECTOR_DB_CFG.get("keep_versions", 1)     # Older versions kept after a swap, for rollback
+
+
+def resolve(client: QdrantClient, name: str) -> str | None:
+    """The collection behind `name`: the alias target, `name` itself for a plain (pre-alias) collection, or None if neither exists"""
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == name: return alias.collection_name
+    return name if client.collection_exists(name) else None
+
+def versions(client: QdrantClient, alias: str) -> list[str]:
+    """The versioned collections of `alias`, newest first"""
+    prefix = f"{alias}__v"
+    names  = [c.name for c in client.get_collections().collections if c.name.startswith(prefix) and c.name[len(prefix):].isdigit()]
+    return sorted(names, key=lambda name: int(name[len(prefix):]), reverse=True)
+
+def new_version(client: QdrantClient, alias: str, vector_size: int) -> str:
+    """Creates an empty versioned collection (with the payload indexes) that no reader sees until swap_alias()"""
+    stamp = int(time.time() * 1000)
+    while client.collection_exists(f"{alias}__v{stamp}"): stamp += 1
+    name = f"{alias}__v{stamp}"
+    client.create_collection(collection_name=name, vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE))
+    create_payload_indexes(client, name)
+    return name
+
+def _point_alias(client: QdrantClient, alias: str, collection: str, previous: str | None):
+    operations = []
+    if previous == alias:
+        # A plain collection from before aliases holds the name; it has to go before the alias can take it (one-time, not atomic)
+        logger.warning(f"⚠️ Replacing plain collection '{alias}' with an alias, it is unavailable until the alias is created")
+        client.delete_collection(alias)
+    elif previous:
+        operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias)))
+    operations.append(models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=collection, alias_name=alias)))
+    client.update_collection_aliases(change_aliases_operations=operations)        # Applied together: readers never see no alias
+
+def _drop_raced(client: QdrantClient, name: str, created: str) -> str | None:
+    """If another process put `name` in place meanwhile, drops our unused first version and returns theirs"""
+    target = resolve(client, name)
+    if not target or target == created: return None
+    client.delete_collection(created)
+    logger.info(f"🤝 '{name}' was created concurrently as '{target}', dropped our '{created}'")
+    return target
+
+def ensure_collection(client: QdrantClient, name: str, vector_size: int = None) -> str:
+    """
+        Makes `name` usable by readers and returns the collection behind it; creates a first version only if nothing exists.
+        Processes creating the same name at once each make a version, but only the first alias is kept: the others drop theirs.
+    """
+    target = resolve(client, name)
+    if target: return target
+
+    vector_size = vector_size or len(get_embedder().embed_query("test query"))
+    created     = new_version(client, name, vector_size)
+    raced       = _drop_raced(client, name, created)                 # Checked again before the alias: creating it may overwrite
+    if raced: return raced
+    try:
+        _point_alias(client, name, created, None)
+    except Exception:
+        raced = _drop_raced(client, name, created)                   # Alias already exists: another process won
+        if raced: return raced
+        raise
+    logger.info(f"✨ Created collection '{created}' behind alias '{name}'")
+    return created
+
+_ensured = weakref.WeakKeyDictionary()      # client -> names already ensured on it by this process
+
+async def aensure_collection(name: str, url: str = None):
+    """
+        ensure_collection() without blocking the event loop: the existence check goes through the async client, the one-time creation
+        runs on a worker thread. A name already ensured on the same client is not checked again (per-user collections, every /chat)
+    """
+    client = ClientRegistry.get_async_qdrant_client(url)
+    owner  = getattr(client, "client", client)                  # ThreadedAsyncQdrant wraps the client that owns the storage
+    if name in _ensured.get(owner, ()): return
+    exists = any(alias.alias_name == name for alias in (await client.get_aliases()).aliases) or await client.collection_exists(name)
+    if not exists: await asyncio.to_thread(ensure_collection, ClientRegistry.get_qdrant_client(url), name)
+    _ensured.setdefault(owner, set()).add(name)
+
+def swap_alias(client: QdrantClient, alias: str, collection: str, keep: int = None) -> str | None:
+    """Atomically points `alias` at `collection`, then drops all but `keep` older versions. Returns the previous target"""
+    keep     = KEEP_VERSIONS if keep is None else keep
+    previous = resolve(client, alias)
+    _point_alias(client, alias, collection, previous)
+    logger.info(f"🔀 Alias '{alias}' -> '{collection}' (was '{previous}')")
+
+    for name in [name for name in versions(client, alias) if name != collection][keep:]:
+        client.delete_collection(name)
+        logger.info(f"🗑️  Dropped old version '{name}'")
+    return None if previous == alias else previous
+
+def rollback(client: QdrantClient, alias: str) -> str:
+    """Points `alias` back at the newest version older than the current one; returns it"""
+    current  = resolve(client, alias)
+    retained = versions(client, alias)
+    older    = retained[retained.index(current) + 1:] if current in retained else []
+    if not older: raise ValueError(f"No older version of '{alias}' to roll back to")
+    _point_alias(client, alias, older[0], current)
+    logger.info(f"⏪ Alias '{alias}' rolled back to '{older[0]}' (was '{current}')")
+    return older[0]
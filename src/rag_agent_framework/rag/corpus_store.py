@@ -0,0 +1,165 @@
+# src/rag_agent_framework/rag/corpus_store.py -- Re-embeddable corpus store: parsed chunks in Parquet, embeddings in memory-mappable .npy per model
+# Layout under corpus_store.path:
+#   manifest.lock                           -- flock'd by every manifest update, so concurrent ingest / reindex processes
+#                                              never drop each other's shards or tombstones
+#   manifest.json                           -- version counter, shard list, which models each shard has embeddings for, and
+#                                              tombstones: source -> shard count when it was deleted (its rows in earlier shards are dead)
+#   chunks/shard-00000.parquet              -- id, text, source, type, metadata (JSON) for every chunk ingest stored in Qdrant
+#   embeddings/<model key>/shard-00000.npy  -- float32 [rows, dims], row i is the vector of chunk i of the shard
+# scripts/reindex.py rebuilds a collection from it: no parsing, and no embedding when the model already has vectors here.
+# Shards are never rewritten; a source stored again (a changed web page) tombstones its older rows, and reindex skips them.
+
+import os
+import re
+import json
+import fcntl
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib    import Path
+from contextlib import contextmanager
+
+from rag_agent_framework.core.config    import LLM_CFG, CORPUS_STORE_CFG, base_dir
+from rag_agent_framework.core.telemetry import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA = pa.schema([("id", pa.string()), ("text", pa.string()), ("source", pa.string()), ("type", pa.string()), ("metadata", pa.string())])
+
+
+def model_key(provider: str = None, model: str = None) -> str:
+    """Directory-safe name of an embedding model, e.g. 'ollama__nomic-embed-text_latest'"""
+    provider = provider or LLM_CFG["default"]
+    model    = model or LLM_CFG[provider]["embedding_model"]
+    return re.sub(r"[^A-Za-z0-9._-]", "_", f"{provider}__{model}")
+
+
+class CorpusStore:
+    """Append-only shards of chunks plus per-model embedding arrays, tracked by manifest.json"""
+
+    def __init__(self, path: str = None):
+        self.path     = Path(path or base_dir / CORPUS_STORE_CFG.get("path", "data/corpus"))
+        self.manifest = self._read_manifest()
+
+    # --- Manifest ---
+    def _read_manifest(self) -> dict:
+        manifest_path = self.path / "manifest.json"
+        if manifest_path.is_file(): return json.loads(manifest_path.read_text())
+        return {"version": 0, "shards": [], "deleted": {}}
+
+    def _write_manifest(self):
+        """Written to a temp file and renamed, so readers never see a half-written manifest"""
+        self.manifest["version"] += 1
+        temp_path = self.path / "manifest.json.tmp"
+        temp_path.write_text(json.dumps(self.manifest, indent=2))
+        os.replace(temp_path, self.path / "manifest.json")
+
+    @contextmanager
+    def _updating(self):
+        """Holds the manifest lock, re-reads the manifest under it and writes it back, so no other writer's update is lost"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / "manifest.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.manifest = self._read_manifest()
+                yield self.manifest
+                self._write_manifest()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @property
+    def shards(self) -> list[dict]:
+        return self.manifest["shards"]
+
+    # --- Writing ---
+    def write_shard(self, ids: list[str], texts: list[str], metadatas: list[dict], vectors=None, key: str = None) -> str:
+        """Stores one shard of chunks (and their vectors for model `key`, if given); returns the shard name"""
+        table = pa.table({
+            "id":       ids,
+            "text":     texts,
+            "source":   [str(metadata.get("source", "")) for metadata in metadatas],
+            "type":     [str(metadata.get("type", "")) for metadata in metadatas],
+            "metadata": [json.dumps(metadata) for metadata in metadatas],
+        }, schema=SCHEMA)
+        with self._updating():                              # The shard name is taken under the lock too
+            name = f"shard-{len(self.shards):05d}"
+            (self.path / "chunks").mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, self.path / "chunks" / f"{name}.parquet", compression="zstd")
+            self.shards.append({"name": name, "rows": len(ids), "embeddings": {}})
+            if vectors is not None: self._save_embeddings(self.shards[-1], key or model_key(), vectors)
+        return name
+
+    def _save_embeddings(self, shard: dict, key: str, vectors):
+        array = np.asarray(vectors, dtype=np.float32)
+        if array.shape[0] != shard["rows"]: raise ValueError(f"{shard['name']} has {shard['rows']} chunks but {array.shape[0]} vectors")
+        (self.path / "embeddings" / key).mkdir(parents=True, exist_ok=True)
+        np.save(self.path / "embeddings" / key / f"{shard['name']}.npy", array)
+        shard["embeddings"][key] = int(array.shape[1])
+
+    def add_embeddings(self, name: str, key: str, vectors):
+        """Stores vectors for an existing shard under another model (reindex does this after embedding once)"""
+        with self._updating():
+            shard = next(shard for shard in self.shards if shard["name"] == name)
+            self._save_embeddings(shard, key, vectors)
+
+    def delete_source(self, source: str):
+        """Tombstones every row of `source` in the shards written so far; rows written after this stay live"""
+        with self._updating() as manifest:
+            manifest.setdefault("deleted", {})[source] = len(self.shards)
+
+    # --- Reading ---
+    def read_chunks(self, name: str) -> pa.Table:
+        return pq.read_table(self.path / "chunks" / f"{name}.parquet")
+
+    def read_embeddings(self, name: str, key: str) -> np.ndarray | None:
+        """Memory-mapped vectors of a shard for model `key`, or None if that model has not embedded it yet"""
+        array_path = self.path / "embeddings" / key / f"{name}.npy"
+        return np.load(array_path, mmap_mode="r") if array_path.is_file() else None
+
+    def live_rows(self, name: str, sources: list[str]) -> np.ndarray:
+        """Mask of the rows of shard `name` (with these sources) that no later delete_source() removed"""
+        index   = next(i for i, shard in enumerate(self.shards) if shard["name"] == name)
+        deleted = self.manifest.get("deleted", {})
+        return np.array([deleted.get(source, 0) <= index for source in sources], dtype=bool)
+
+    def stats(self) -> dict:
+        models = sorted({key for shard in self.shards for key in shard["embeddings"]})
+        return {
+            "version": self.manifest["version"],
+            "shards":  len(self.shards),
+            "deleted": len(self.manifest.get("deleted", {})),       # Tombstoned sources
+            "chunks":  sum(shard["rows"] for shard in self.shards),
+            "models":  {key: sum(shard["rows"] for shard in self.shards if key in shard["embeddings"]) for key in models},
+        }
+
+
+class CorpusWriter:
+    """Buffers chunks during ingestion and writes a shard every `shard_size` chunks (and on close)"""
+
+    def __init__(self, store: CorpusStore = None, shard_size: int = None, key: str = None):
+        self.store      = store or CorpusStore()
+        self.shard_size = shard_size or CORPUS_STORE_CFG.get("shard_size", 50000)
+        self.key        = key or model_key()
+        self._ids, self._texts, self._metadatas, self._vectors = [], [], [], []
+
+    def add(self, ids: list[str], texts: list[str], metadatas: list[dict], vectors: list[list[float]]):
+        self._ids.extend(ids)
+        self._texts.extend(texts)
+        self._metadatas.extend(metadatas)
+        self._vectors.extend(vectors)
+        if len(self._ids) >= self.shard_size: self.flush()
+
+    def delete_source(self, source: str):
+        """Drops the buffered rows of `source` and tombstones its rows in the shards already written"""
+        keep = [i for i, metadata in enumerate(self._metadatas) if str(metadata.get("source", "")) != source]
+        self._ids, self._texts, self._metadatas, self._vectors = ([rows[i] for i in keep] for rows in (self._ids, self._texts, self._metadatas, self._vectors))
+        self.store.delete_source(source)
+
+    def flush(self):
+        if not self._ids: return
+        name = self.store.write_shard(self._ids, self._texts, self._metadatas, self._vectors, self.key)
+        logger.info(f"🗄️  Wrote {len(self._ids)} chunks to corpus store {name}")
+        self._ids, self._texts, self._metadatas, self._vectors = [], [], [], []
+
+    def close(self):
+        self.flush()
@@ -1,16 +1,21 @@
 # src/rag_agent_framework/rag/data_loader.py
 
 from pathlib import Path
+from typing  import Iterator
 from langchain_community.document_loaders import PyPDFLoader, WebBaseLoader
 from langchain.schema import Document
 
 """
     Handling PDFs and web page - load a PDF from disk or fetch & parse text from a URL.
-    Returns a list of LangChain Document objects.
+    lazy_load_documents() yields one page at a time, so a large PDF never sits in memory as a whole list of Documents;
+    load_documents() returns them all as a list.
 """
 
-def load_documents(source: str) -> list[Document]:
+def lazy_load_documents(source: str) -> Iterator[Document]:
     if Path(source).is_file(): loader = PyPDFLoader(str(source))    # If it's a local file
     else: loader = WebBaseLoader(source)
 
-    return loader.load()
\ No newline at end of file
+    return loader.lazy_load()
+
+def load_documents(source: str) -> list[Document]:
+    return list(lazy_load_documents(source))
@@ -0,0 +1,169 @@
+# src/rag_agent_framework/rag/dedup.py -- Near-duplicate chunk detection before embedding (MinHash signatures + a persistent LSH index)
+# 1. Each chunk gets a MinHash signature of its word shingles (bands * rows values, seeded, so it is stable across runs)
+# 2. The LSH index (SQLite, one per collection) maps every band of every stored chunk to its point id; a new chunk that shares
+#    a band with a stored one is a candidate, and a near-duplicate if the signatures agree on at least `threshold` of their values
+# 3. Near-duplicates are not embedded: mode `skip` drops them, mode `link` adds their source to the existing point's
+#    metadata.duplicate_sources (ingest.py / MemoryStore do the Qdrant side and report the counts)
+# Chunks within one batch are also compared with each other. Entries are only written by commit(), after the points are stored,
+# and matches are confirmed against the collection, so a dropped collection never suppresses new chunks.
+
+import re
+import zlib
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from pathlib import Path
+from dataclasses import dataclass, field
+
+from rag_agent_framework.core.config    import DEDUP_CFG, base_dir
+from rag_agent_framework.core.telemetry import Counter, register, get_logger
+
+logger = get_logger(__name__)
+
+CHUNKS = register(Counter("rag_dedup_chunks_total", "Chunks checked for near-duplicates before embedding", ("result",)))
+
+_PRIME = np.uint64(4294967291)           # Largest prime below 2**32; shingle hashes are crc32 values
+_WORDS = re.compile(r"\w+")
+
+
+@dataclass
+class DedupPlan:
+    """Outcome of DedupIndex.check() for one batch of chunks"""
+    keep:       list[int]                                   # Indexes of the chunks to embed and store
+    duplicates: dict[int, str] = field(default_factory=dict)  # Chunk index -> point id of the chunk it duplicates
+    ids:        list[str] = field(default_factory=list)
+    signatures: list[np.ndarray] = field(default_factory=list)
+
+
+class DedupIndex:
+    """Persistent MinHash LSH index of the chunks stored in one collection"""
+
+    def __init__(self, collection: str, path: str = None, threshold: float = 0.85, bands: int = 16, rows: int = 8, shingle_size: int = 5):
+        self.collection   = collection
+        self.path         = Path(path or base_dir / DEDUP_CFG.get("path", "data/dedup.sqlite"))
+        self.threshold    = threshold
+        self.bands        = bands
+        self.rows         = rows
+        self.shingle_size = shingle_size
+        rng               = np.random.default_rng(1)        # Fixed seed: signatures must match the ones already in the index
+        self._a           = rng.integers(1, 2**31, size=bands * rows, dtype=np.uint64)
+        self._b           = rng.integers(0, 2**31, size=bands * rows, dtype=np.uint64)
+        self._lock        = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS signatures (collection TEXT, point_id TEXT, signature BLOB, PRIMARY KEY (collection, point_id))")
+        self._db.execute("CREATE TABLE IF NOT EXISTS bands (collection TEXT, band INTEGER, bucket INTEGER, point_id TEXT)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS bands_lookup ON bands (collection, band, bucket)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS bands_point ON bands (collection, point_id)")
+
+    # --- Signatures ---
+    def signature(self, text: str) -> np.ndarray:
+        words    = [word.lower() for word in _WORDS.findall(text)]
+        size     = min(self.shingle_size, len(words)) or 1
+        shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes   = np.array([zlib.crc32(shingle.encode()) for shingle in shingles], dtype=np.uint64) % _PRIME
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def _buckets(self, signature: np.ndarray) -> list[int]:
+        return [int.from_bytes(hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).digest(), "big", signed=True)
+                for band in range(self.bands)]
+
+    def similarity(self, first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two chunks' shingle sets"""
+        return float(np.mean(first == second))
+
+    # --- Lookup ---
+    def _stored_candidates(self, buckets: list[int]) -> set[str]:
+        placeholders = " OR ".join("(band = ? AND bucket = ?)" for _ in buckets)
+        params       = [self.collection] + [value for band, bucket in enumerate(buckets) for value in (band, bucket)]
+        rows         = self._db.execute(f"SELECT DISTINCT point_id FROM bands WHERE collection = ? AND ({placeholders})", params).fetchall()
+        return {row[0] for row in rows}
+
+    def _stored_signature(self, point_id: str) -> np.ndarray | None:
+        row = self._db.execute("SELECT signature FROM signatures WHERE collection = ? AND point_id = ?", (self.collection, point_id)).fetchone()
+        return np.frombuffer(row[0], dtype=np.uint64) if row else None
+
+    def check(self, ids: list[str], texts: list[str], exists=None) -> DedupPlan:
+        """
+            Which chunks are new, and which near-duplicate a stored chunk or an earlier chunk of this batch.
+            `exists(point_ids) -> set` confirms that matched points are still in the collection; entries of points that are gone
+            (the collection was dropped, an in-memory Qdrant restarted) are removed instead of suppressing the chunk.
+        """
+        signatures = [self.signature(text) for text in texts]
+        buckets    = [self._buckets(signature) for signature in signatures]
+        with self._lock:
+            stored = [self._stored_candidates(chunk_buckets) for chunk_buckets in buckets]
+        live = set().union(*stored)
+        if exists is not None and live:
+            live = set(exists(sorted(live)))
+            self._forget(set().union(*stored) - live)
+
+        plan, batch_bands = DedupPlan(keep=[]), {}
+        for i, (point_id, signature) in enumerate(zip(ids, signatures)):
+            with self._lock:
+                candidates = [(other, self._stored_signature(other)) for other in stored[i] & live]
+            candidates += [(plan.ids[j], plan.signatures[j]) for j in {batch_bands[key] for key in enumerate(buckets[i]) if key in batch_bands}]
+            match = next((other for other, other_signature in candidates
+                          if other_signature is not None and self.similarity(signature, other_signature) >= self.threshold), None)
+            if match is not None:
+                plan.duplicates[i] = match
+                continue
+            for key in enumerate(buckets[i]): batch_bands.setdefault(key, len(plan.ids))
+            plan.keep.append(i)
+            plan.ids.append(point_id)
+            plan.signatures.append(signature)
+
+        CHUNKS.inc(len(plan.keep), result="kept")
+        CHUNKS.inc(len(plan.duplicates), result="duplicate")
+        return plan
+
+    def _forget(self, point_ids: set[str]):
+        if not point_ids: return
+        logger.info(f"🧹 Dropping {len(point_ids)} dedup entries of points no longer in '{self.collection}'")
+        with self._lock:
+            for point_id in point_ids:
+                self._db.execute("DELETE FROM signatures WHERE collection = ? AND point_id = ?", (self.collection, point_id))
+                self._db.execute("DELETE FROM bands WHERE collection = ? AND point_id = ?", (self.collection, point_id))
+
+    def commit(self, plan: DedupPlan):
+        """Records the kept chunks once their points are stored"""
+        with self._lock:
+            self._db.execute("BEGIN")
+            for point_id, signature in zip(plan.ids, plan.signatures):
+                self._db.execute("INSERT OR REPLACE INTO signatures VALUES (?, ?, ?)", (self.collection, point_id, signature.tobytes()))
+                self._db.executemany("INSERT INTO bands VALUES (?, ?, ?, ?)",
+                                     [(self.collection, band, bucket, point_id) for band, bucket in enumerate(self._buckets(signature))])
+            self._db.execute("COMMIT")
+
+    def reset(self):
+        """Forgets the collection's chunks (after the collection itself was dropped or rebuilt elsewhere)"""
+        with self._lock:
+            self._db.execute("DELETE FROM signatures WHERE collection = ?", (self.collection,))
+            self._db.execute("DELETE FROM bands WHERE collection = ?", (self.collection,))
+
+
+def existing_points(client, collection_name: str):
+    """The `exists` check for DedupIndex.check(): one retrieve call for all matched points"""
+    return lambda point_ids: {str(point.id) for point in client.retrieve(collection_name=collection_name, ids=point_ids, with_payload=False)}
+
+def link_duplicates(client, collection_name: str, duplicates: dict[str, list[str]]):
+    """Mode `link`: adds each duplicate's source to metadata.duplicate_sources of the point it duplicates"""
+    if not duplicates: return
+    for point in client.retrieve(collection_name=collection_name, ids=list(duplicates), with_payload=True):
+        metadata = dict((point.payload or {}).get("metadata", {}))
+        metadata["duplicate_sources"] = sorted(set(metadata.get("duplicate_sources", [])) | set(duplicates[str(point.id)]))
+        client.set_payload(collection_name=collection_name, payload={"metadata": metadata}, points=[point.id])
+
+
+_indexes, _indexes_lock = {}, threading.Lock()
+
+def get_dedup_index(collection: str) -> DedupIndex | None:
+    """The index for a collection, configured from the `dedup` section of config.yaml, or None when dedup is disabled"""
+    if not DEDUP_CFG.get("enabled", True): return None
+    with _indexes_lock:
+        if collection not in _indexes:
+            _indexes[collection] = DedupIndex(collection, threshold=DEDUP_CFG.get("threshold", 0.85), bands=DEDUP_CFG.get("bands", 16),
+                                              rows=DEDUP_CFG.get("rows", 8), shingle_size=DEDUP_CFG.get("shingle_size", 5))
+        return _indexes[collection]
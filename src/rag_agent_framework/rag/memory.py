@@ -2,18 +2,25 @@
 
 import io       # Needed to handle files uploaded through the API as in-memory binary streams.
 import os
+import uuid
+import shutil
 import tempfile
+from pathlib                                import Path
 # --- Qdrant and LangChain Imports ---
 from langchain.schema                       import Document       # Used in RAG workflows to pass around the individual text chunks that also carry context about their origin.
-from langchain_openai                       import ChatOpenAI
-from langchain_community.chat_models.ollama import ChatOllama
 from langchain.prompts                      import ChatPromptTemplate
-from qdrant_client                          import QdrantClient, models
+from qdrant_client                          import QdrantClient
 # --- Project-Specific Imports: The RAG Tools ---
-from rag_agent_framework.rag.data_loader   import load_documents
-from rag_agent_framework.rag.text_splitter import split_documents
-from rag_agent_framework.rag.vector_store  import get_vector_store, get_embedder
+from rag_agent_framework.rag.data_loader   import lazy_load_documents
+from rag_agent_framework.rag.text_splitter import iter_split_documents, batched
+from rag_agent_framework.rag.vector_store  import get_vector_store, asimilarity_search, aadd_documents
+from rag_agent_framework.rag.collections   import ensure_collection, aensure_collection
+from rag_agent_framework.rag.dedup         import get_dedup_index, existing_points, link_duplicates
+from rag_agent_framework.core.clients      import ClientRegistry
 from rag_agent_framework.core.config       import *
+from rag_agent_framework.core.telemetry    import get_logger, span
+
+logger = get_logger(__name__)
 
 
 
@@ -21,8 +28,12 @@ from rag_agent_framework.core.config       import *
 # 1. HELPER FUNCTION
 # ==============================================================================
 def _get_qdrant_client() -> QdrantClient:
-    """Helper to get a Qdrant client instance"""
-    return QdrantClient(url=QDRANT_URL)
+    """Helper to get the shared Qdrant client instance"""
+    return ClientRegistry.get_qdrant_client(QDRANT_URL)
+
+def _collection_for(user_id: str = None, collection_name: str = None) -> str:
+    if user_id: return f"user_{user_id}_memory"                         # For /chat endpoint for conversation history
+    return collection_name or "my_rag_collection"                       # For /upload endpoint for the document knowledge base
 
 
 # ==============================================================================
@@ -31,8 +42,7 @@ def _get_qdrant_client() -> QdrantClient:
 
 class MemoryStore:
     def __init__(self, user_id: str = None, collection_name: str = None, url: str = QDRANT_URL):
-        if user_id: self.collection_name = f"user_{user_id}_memory"                     # For /chat endpoint for conversation history
-        else:       self.collection_name = collection_name or "my_rag_collection"       # For /upload endpoint for the document knowledge base
+        self.collection_name = _collection_for(user_id, collection_name)
 
         # Store the user_id if it exists, for tagging memories later
         self.user_id = user_id
@@ -40,24 +50,9 @@ class MemoryStore:
         # Instantiate necessary clients and the vector store itself -- keeping the class self-contained
         self.client       = _get_qdrant_client()
 
-# --- START: ADDED CODE to ensure user-specific collection exists ---
-        try:
-            self.client.get_collection(collection_name = self.collection_name)
-            print(f"Collection '{self.collection_name}' already exists for user '{self.user_id or self.collection_name}'.")
-        except Exception as e: # Catch any exception, specifically 'NotFoundError' from Qdrant
-            print(f"Collection '{self.collection_name}' not found for user '{self.user_id or self.collection_name}'. Creating new collection.")
-            
-            # Determine vector size using the embedder
-            embedder = get_embedder() 
-            vector_size = len(embedder.embed_query("test query")) 
-            
-            # Create the new collection
-            self.client.recreate_collection( # Using recreate_collection here for simplicity, create_collection is also an option if you don't want to inadvertently clear an existing one
-                collection_name = self.collection_name,
-                vectors_config  = models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
-            )
-            print(f"Successfully created collection '{self.collection_name}' for user '{self.user_id or self.collection_name}'.")
-        # --- END: ADDED CODE ---
+        # Creates the collection (a first version behind the alias) only if nothing exists; Qdrant errors propagate instead of wiping it
+        ensure_collection(self.client, self.collection_name)
+        logger.debug(f"Collection '{self.collection_name}' ready for '{self.user_id or self.collection_name}'.")
 
         self.vector_store = get_vector_store(
             collection_name = self.collection_name,
@@ -67,52 +62,117 @@ class MemoryStore:
     # --- Methods for User Conversation Memory ---
     def get_memories(self, query: str, k: int = 5) -> list[Document]:
         """Retrieves the top 'k' most relevant chat summaries for a user by performing a vector similarity search"""
-        print(f"🧠 Searching collection '{self.collection_name}' for memories relevant to: '{query}'")
-        return self.vector_store.similarity_search(query, k=k)
+        logger.debug(f"🧠 Searching collection '{self.collection_name}' for memories relevant to: '{query}'")
+        with span("memory_retrieval"):
+            return self.vector_store.similarity_search(query, k=k)
     
     def add_memory(self, text: str):
         """Adds a new chat summary to the user's specific collection. This summary is wrapped in a Document object with user_id metadata"""
         doc = Document(page_content = text, metadata = {"user_id": self.user_id})
-        self.vector_store.add_documents([doc])
-        print(f"📝 Added memory to '{self.collection_name}' for user '{self.user_id}'")
+        with span("memory_write"):                                      # Includes the "embed" of the summary
+            self.vector_store.add_documents([doc])
+        logger.debug(f"📝 Added memory to '{self.collection_name}' for user '{self.user_id}'")
 
     # --- Method for General Document Storage (The "Head Chef") --- 
-    def add_document(self, file_obj: io.BytesIO):
-        """Orchestrates the document processing pipeline by calling the specialized RAG tools in the correct order"""
-        # 1. Temporarily save the uploaded file to 
-        temp_file_path = f"./{file_obj.name}"
-        with open(file_obj.name, "wb") as f: f.write(file_obj.getbuffer())
-
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file_obj.name).suffix) as temp_file:
-            temp_file.write(file_obj.getbuffer())
+    def add_document(self, file_obj: io.BytesIO, name: str = None):
+        """
+            Orchestrates the document processing pipeline by calling the specialized RAG tools in the correct order.
+            Streams: pages are loaded lazily, chunked and stored retriever.embed_batch_size chunks at a time, so memory stays
+            bounded by one batch however long the document is. `file_obj` may be any binary file object (`name` defaults to its name)
+        """
+        name = name or file_obj.name
+
+        # 1. Temporarily save the uploaded file to disk (copied in blocks, not through one in-memory buffer)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(name).suffix) as temp_file:
+            file_obj.seek(0)
+            shutil.copyfileobj(file_obj, temp_file)
             temp_file_path = temp_file.name
 
-        
-        # 2. Call the Prep Station (data_loader.py)
-        print(f"👨‍🍳 -> Calling data_loader to process file: {temp_file_path}")
-        documents = load_documents(temp_file_path)
-        
-        os.remove(temp_file_path)
+        # 2. Call the Prep Station (data_loader.py) -- a page generator; the file must stay until the stream is consumed
+        logger.info(f"👨‍🍳 -> Calling data_loader to process file: {temp_file_path}")
+        try:
+            stored = self._store_documents(lazy_load_documents(temp_file_path), name)
+        finally:
+            os.remove(temp_file_path)
 
-        if not documents:
-            print(f"⚠️ Warning: Data loader could not extract content from {file_obj.name}.")
+        if not stored: logger.warning(f"⚠️ Warning: Data loader could not extract content from {name}.")
+
+    def add_text(self, text: str, source: str):
+        """Stores text that was already extracted elsewhere (e.g. Markdown from the PDF parser service) in the knowledge base"""
+        if not text or not text.strip():
+            logger.warning(f"⚠️ Warning: No content was extracted from {source}.")
             return
 
-        # 3. Call the Chopping Station (text_splitter.py).
-        print(f"🔪 -> Calling text_splitter to chunk {len(documents)} document(s).")
-        chunked_documents = split_documents(  
-            documents,  
-            chunk_size    = config.retriever.chunk_size,  
-            chunk_overlap = config.retriever.chunk_overlap  
+        self._store_documents([Document(page_content=text, metadata={"source": source})], source)
+
+    def _store_documents(self, documents, source: str) -> int:
+        """Chunks documents (a list or a lazy page iterator) and stores them batch by batch; returns how many chunks were stored"""
+        # 3. Call the Chopping Station (text_splitter.py) -- chunks are produced as the pages arrive
+        logger.info(f"🔪 -> Calling text_splitter to chunk the pages of '{source}'.")
+        chunks = iter_split_documents(
+            documents,
+            chunk_size    = config.retriever.chunk_size,
+            chunk_overlap = config.retriever.chunk_overlap
         )
-        
-        # 4. Call the Line Cook (vector_store) to save the final product.
-        print(f"✅ -> Storing {len(chunked_documents)} chunks in the vector store.")
-        self.vector_store.add_documents(chunked_documents)
-        print(f"Successfully added '{file_obj.name}' to the '{self.collection_name}' knowledge base.")
+        dedup, stored, duplicates = get_dedup_index(self.collection_name), 0, 0
+        batches = batched(chunks, config.retriever.get("embed_batch_size", 64))
+        while True:
+            with span("load"):                                          # Loading and chunking the pages of this batch
+                batch = next(batches, None)
+            if batch is None: break
+            kept, skipped = self._store_batch(batch, source, dedup)
+            stored, duplicates = stored + kept, duplicates + skipped
+
+        if duplicates: logger.info(f"🧬 Skipped {duplicates} near-duplicate chunks of '{source}'.")
+        logger.info(f"Successfully added '{source}' ({stored} chunks) to the '{self.collection_name}' knowledge base.")
+        return stored + duplicates
+
+    def _store_batch(self, chunked_documents: list[Document], source: str, dedup) -> tuple[int, int]:
+        """Stores one batch of chunks; returns (stored, near-duplicates skipped)"""
+        # 4. Drop chunks that near-duplicate ones already in the collection (rag/dedup.py), so they are never embedded
+        ids, plan = [str(uuid.uuid4()) for _ in chunked_documents], None
+        if dedup is not None:
+            plan = dedup.check(ids, [doc.page_content for doc in chunked_documents], exists=existing_points(self.client, self.collection_name))
+            chunked_documents, ids = [chunked_documents[i] for i in plan.keep], plan.ids
+            if plan.duplicates and DEDUP_CFG.get("mode", "skip") == "link":
+                links = {}
+                for point_id in plan.duplicates.values(): links.setdefault(point_id, []).append(source)
+                link_duplicates(self.client, self.collection_name, links)
+
+        # 5. Call the Line Cook (vector_store) to save the final product.
+        logger.debug(f"✅ -> Storing {len(chunked_documents)} chunks in the vector store.")
+        with span("vector_store_write"):                                # Embedding inside is also timed on its own as "embed"
+            if chunked_documents: self.vector_store.add_documents(chunked_documents, ids=ids)
+        if plan is not None: dedup.commit(plan)
+        return len(chunked_documents), len(plan.duplicates) if plan else 0
 
         
+class AsyncMemoryStore:
+    """
+        The conversation-memory half of MemoryStore for async callers (the API's /chat): nothing happens in the constructor, and
+        retrieval and writes use async embedding calls and the async Qdrant client (rag/vector_store.py), so the event loop never
+        waits on Qdrant or the embedder. Reads and writes the same collections and payload layout as MemoryStore
+    """
+
+    def __init__(self, user_id: str = None, collection_name: str = None, url: str = QDRANT_URL):
+        self.collection_name = _collection_for(user_id, collection_name)
+        self.user_id         = user_id
+        self.url             = url
+
+    async def get_memories(self, query: str, k: int = 5) -> list[Document]:
+        """Retrieves the top 'k' most relevant chat summaries for a user"""
+        await aensure_collection(self.collection_name, self.url)
+        with span("memory_retrieval"):
+            return await asimilarity_search(self.collection_name, query, k=k, url=self.url)
+
+    async def add_memory(self, text: str):
+        """Adds a chat summary to the user's collection, tagged with the user_id"""
+        await aensure_collection(self.collection_name, self.url)
+        with span("memory_write"):
+            await aadd_documents(self.collection_name, [Document(page_content=text, metadata={"user_id": self.user_id})], url=self.url)
+        logger.debug(f"📝 Added memory to '{self.collection_name}' for user '{self.user_id}'")
+
+
 # ==============================================================================
 # 3. SUMMARIZER HELPER FUNCTION
 # ==============================================================================
@@ -125,16 +185,7 @@ CONVERSATION:
 
 def get_summarizer():
     """Builds and returns a simple and reusable LangChain (LCEL) chain that takes text and produces a summary"""
-    if LLM_CFG["default"] == "openai":
-        llm = ChatOpenAI(
-            model = LLM_CFG["openai"]["chat_model"],
-            openai_api_key = OPENAI_API_KEY
-        )
-    else:
-        llm = ChatOllama(
-            model = LLM_CFG["ollama"]["chat_model"],
-            base_url = OLLAMA_URL
-        )
+    llm    = ClientRegistry.get_role_model("summarizer")                       # Shared, pooled client of the summarizer role -- not rebuilt per call
     prompt = ChatPromptTemplate.from_template(SUMMARIZER_PROMPT_TEMPLATE)       # Use modern LCEL chain syntax
     
     return prompt | llm
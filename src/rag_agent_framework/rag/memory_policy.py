@@ -0,0 +1,184 @@
+# src/rag_agent_framework/rag/memory_policy.py -- When and how chat turns become long-term memories (memory.policy in config.yaml)
+#   per_turn         -- one summarizer call per turn, written before /chat returns (the original behaviour)
+#   every_n          -- turns collect in a per-user rolling buffer; every `every_n` turns the buffer is summarized as one conversation
+#   token_threshold  -- same buffer, summarized once it holds about `token_threshold` tokens
+#   extractive       -- no LLM: the question and the first sentences of the answer are stored as they are
+# Buffered conversations are summarized in the background: a worker takes up to `max_batch` due conversations (of any users)
+# and summarizes them in ONE LLM request with numbered sections, falling back to single calls for sections it cannot parse.
+
+import re
+import queue
+import threading
+
+from rag_agent_framework.core.clients   import ClientRegistry
+from rag_agent_framework.core.config    import MEMORY_CFG
+from rag_agent_framework.core.telemetry import Counter, register, span, get_logger
+from rag_agent_framework.rag.memory     import MemoryStore, AsyncMemoryStore, SUMMARIZER_PROMPT_TEMPLATE
+
+logger = get_logger(__name__)
+
+POLICIES = ("per_turn", "every_n", "token_threshold", "extractive")
+
+SUMMARIZER_CALLS = register(Counter("rag_memory_summarizer_calls_total", "LLM requests made to write memories", ("mode",)))
+
+BATCH_PROMPT_TEMPLATE = """
+Below are {count} separate conversations. Summarize EACH one into a concise 2-3 sentence memory segment that captures the key
+information and user intent. Answer with exactly {count} sections, in order, each starting with its number and a period on its own line:
+1.
+<summary of conversation 1>
+
+{conversations}
+"""
+
+_SECTION   = re.compile(r"^\s*(\d+)\.\s*$", re.MULTILINE)
+_SENTENCES = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """About four characters per token, close enough to decide when a buffer is due"""
+    return len(text) // 4
+
+def format_turn(question: str, answer: str) -> str:
+    return f"User Question: {question}\nAgent Answer: {answer}"
+
+def extract_memory(question: str, answer: str, sentences: int = 2, max_chars: int = 500) -> str:
+    """The no-LLM memory: the question plus the opening sentences of the answer"""
+    opening = " ".join(_SENTENCES.split(str(answer).strip())[:sentences])
+    return f"User asked: {question.strip()} Answer: {opening}"[:max_chars]
+
+def parse_sections(text: str, count: int) -> dict[int, str]:
+    """{number: summary} for the numbered sections of a batched answer; numbers outside 1..count are ignored"""
+    marks    = list(_SECTION.finditer(text))
+    sections = {}
+    for i, mark in enumerate(marks):
+        number = int(mark.group(1))
+        body   = text[mark.end():marks[i + 1].start() if i + 1 < len(marks) else len(text)].strip()
+        if 1 <= number <= count and body: sections[number] = body
+    return sections
+
+
+class MemoryWriter:
+    """Applies the memory policy for every user of the process. record() is called once per finished chat turn"""
+
+    def __init__(self, policy: str = "per_turn", every_n: int = 4, token_threshold: int = 1500, max_batch: int = 8,
+                 max_wait_s: float = 2.0, store_factory=None, llm_factory=None):
+        if policy not in POLICIES: raise ValueError(f"Unknown memory policy '{policy}', expected one of {POLICIES}")
+        self.policy             = policy
+        self.every_n            = every_n
+        self.token_threshold    = token_threshold
+        self.max_batch          = max_batch
+        self.max_wait_s         = max_wait_s
+        self.store_factory      = store_factory                 # user_id -> MemoryStore (tests pass their own)
+        self.llm_factory        = llm_factory or (lambda: ClientRegistry.get_role_model("summarizer"))
+        self._buffers           = {}                            # user_id -> list of formatted turns
+        self._lock              = threading.Lock()
+        self._due               = queue.Queue()                 # (user_id, conversation) ready to summarize
+        self._worker            = None
+
+    def _store(self, user_id: str):
+        return self.store_factory(user_id) if self.store_factory else MemoryStore(user_id=user_id)
+
+    def _complete(self, prompt: str, mode: str) -> str:
+        SUMMARIZER_CALLS.inc(mode=mode)
+        return self.llm_factory().invoke(prompt).content
+
+    async def _acomplete(self, prompt: str, mode: str) -> str:
+        SUMMARIZER_CALLS.inc(mode=mode)
+        return (await self.llm_factory().ainvoke(prompt)).content
+
+    # --- Per turn ---
+    def record(self, user_id: str, question: str, answer: str, memory_store=None) -> str | None:
+        """Writes (or buffers) the memory of one turn; returns the memory text when it was written now"""
+        if self.policy == "extractive":
+            summary = extract_memory(question, answer)
+        elif self.policy == "per_turn":
+            with span("summarization"):
+                summary = self._complete(SUMMARIZER_PROMPT_TEMPLATE.format(text=format_turn(question, answer)), "single")
+        else:
+            self._buffer(user_id, format_turn(question, answer))
+            return None
+        (memory_store or self._store(user_id)).add_memory(summary)
+        return summary
+
+    async def arecord(self, user_id: str, question: str, answer: str, memory_store=None) -> str | None:
+        """record() for the event loop: the summarizer call and the write are awaited (memory_store is an AsyncMemoryStore)"""
+        if self.policy == "extractive":
+            summary = extract_memory(question, answer)
+        elif self.policy == "per_turn":
+            with span("summarization"):
+                summary = await self._acomplete(SUMMARIZER_PROMPT_TEMPLATE.format(text=format_turn(question, answer)), "single")
+        else:
+            self._buffer(user_id, format_turn(question, answer))         # Summarized later by the worker thread
+            return None
+        await (memory_store or AsyncMemoryStore(user_id=user_id)).add_memory(summary)
+        return summary
+
+    def _buffer(self, user_id: str, turn: str):
+        with self._lock:
+            turns = self._buffers.setdefault(user_id, [])
+            turns.append(turn)
+            if self.policy == "every_n": due = len(turns) >= self.every_n
+            else:                        due = estimate_tokens("\n\n".join(turns)) >= self.token_threshold
+            if due: del self._buffers[user_id]
+        if due: self._submit(user_id, "\n\n".join(turns))
+
+    def _submit(self, user_id: str, conversation: str):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._work, name="memory-writer", daemon=True)
+                    self._worker.start()
+        self._due.put((user_id, conversation))
+
+    # --- Batched summarization ---
+    def _work(self):
+        while True:
+            pending = [self._due.get()]
+            while len(pending) < self.max_batch:
+                try: pending.append(self._due.get(timeout=self.max_wait_s))
+                except queue.Empty: break
+            self._write(pending)
+
+    def summarize(self, conversations: list[str]) -> list[str]:
+        """One summary per conversation; several conversations go to the LLM in one request"""
+        if len(conversations) == 1: return [self._complete(SUMMARIZER_PROMPT_TEMPLATE.format(text=conversations[0]), "single")]
+
+        numbered = "\n\n".join(f"CONVERSATION {i}:\n{text}" for i, text in enumerate(conversations, start=1))
+        sections = parse_sections(self._complete(BATCH_PROMPT_TEMPLATE.format(count=len(conversations), conversations=numbered), "batch"),
+                                  len(conversations))
+        return [sections[i] if i in sections                    # Missing when the model merged or skipped a section
+                else self._complete(SUMMARIZER_PROMPT_TEMPLATE.format(text=conversation), "single")
+                for i, conversation in enumerate(conversations, start=1)]
+
+    def _write(self, pending: list[tuple[str, str]]):
+        try:
+            with span("summarization"):
+                summaries = self.summarize([conversation for _, conversation in pending])
+            for (user_id, _), summary in zip(pending, summaries):
+                self._store(user_id).add_memory(summary)
+            logger.debug(f"📝 Wrote {len(pending)} buffered memories")
+        except Exception as e:
+            logger.exception(f"❌ Failed to write {len(pending)} buffered memories: {e}")
+
+    def flush(self):
+        """Summarizes and writes every buffered and queued conversation now (on shutdown / end of a CLI session)"""
+        with self._lock:
+            buffers, self._buffers = self._buffers, {}
+        pending = [(user_id, "\n\n".join(turns)) for user_id, turns in buffers.items()]
+        while True:
+            try: item = self._due.get_nowait()
+            except queue.Empty: break
+            pending.append(item)
+        for start in range(0, len(pending), self.max_batch):
+            self._write(pending[start:start + self.max_batch])
+
+
+_writer = None
+
+def get_memory_writer() -> MemoryWriter:
+    """The process-wide writer, configured from the `memory` section of config.yaml"""
+    global _writer
+    if _writer is None:
+        _writer = MemoryWriter(**MEMORY_CFG)
+        logger.info(f"🧠 Memory policy: {_writer.policy}")
+    return _writer
@@ -0,0 +1,68 @@
+# src/rag_agent_framework/rag/multi_query.py -- Retrieval for several phrasings of a question in one round trip each to the embedder and Qdrant
+# 1. All sub-queries are embedded in one batch (embed_queries on the batching embedder, see core/embedding_batcher.py)
+# 2. One query_batch_points request searches them all, with the same metadata filter
+# 3. Hits are fused with reciprocal rank fusion and de-duplicated (same point, or same text), best first
+# 4. Optionally one LLM call answers every sub-query from the fused context (instead of one RAG chain call per phrasing)
+
+from qdrant_client                          import models
+from langchain.schema                       import Document
+from langchain_core.prompts                 import ChatPromptTemplate
+
+from rag_agent_framework.core.clients       import ClientRegistry
+from rag_agent_framework.core.config        import RETRIEVER_CFG
+from rag_agent_framework.core.telemetry     import span
+from rag_agent_framework.rag.vector_store   import get_embedder, build_filter
+from rag_agent_framework.rag.collections    import ensure_collection
+from rag_agent_framework.rag.rag_chain      import RAG_PROMPT_TEMPLATE
+
+RRF_K = 60          # Damping constant of reciprocal rank fusion; 60 is the usual choice
+
+
+def embed_queries(queries: list[str]) -> list[list[float]]:
+    """One batched request when the embedder supports it, otherwise one embed_query per sub-query"""
+    embedder = get_embedder()
+    batch    = getattr(embedder, "embed_queries", None)
+    return batch(queries) if callable(batch) else [embedder.embed_query(query) for query in queries]
+
+def fuse(results: list[list[models.ScoredPoint]], limit: int) -> list[Document]:
+    """Reciprocal rank fusion over the per-query hit lists; a chunk found by several sub-queries ranks higher"""
+    scores, points = {}, {}
+    for hits in results:
+        for rank, point in enumerate(hits, start=1):
+            scores[point.id] = scores.get(point.id, 0.0) + 1.0 / (RRF_K + rank)
+            points.setdefault(point.id, point)
+
+    documents, seen_texts = [], set()
+    for point_id in sorted(scores, key=scores.get, reverse=True):
+        payload = points[point_id].payload or {}
+        text    = payload.get("page_content", "")
+        if text in seen_texts: continue                 # The same chunk stored twice (e.g. an uploaded file ingested again)
+        seen_texts.add(text)
+        documents.append(Document(page_content=text, metadata={**payload.get("metadata", {}), "rrf_score": round(scores[point_id], 5)}))
+        if len(documents) >= limit: break
+    return documents
+
+def multi_query_search(queries: list[str], collection_name: str, url: str = None, filters: dict = None, k: int = None, limit: int = None) -> list[Document]:
+    """The fused top `limit` chunks for all sub-queries (`k` hits each)"""
+    queries = [query.strip() for query in queries if query and query.strip()]
+    if not queries: return []
+    k      = k or RETRIEVER_CFG.get("k", 4)
+    limit  = limit or RETRIEVER_CFG.get("multi_query_limit", 8)
+    client = ClientRegistry.get_qdrant_client(url)
+    ensure_collection(client, collection_name)
+
+    vectors       = embed_queries(queries)
+    search_filter = build_filter(filters)
+    requests      = [models.QueryRequest(query=vector, filter=search_filter, limit=k, with_payload=True) for vector in vectors]
+    with span("retrieval"):
+        responses = client.query_batch_points(collection_name=collection_name, requests=requests)
+    return fuse([response.points for response in responses], limit)
+
+def format_context(documents: list[Document]) -> str:
+    return "\n\n".join(f"[{doc.metadata.get('source', 'unknown')}] {doc.page_content}" for doc in documents)
+
+def answer_queries(queries: list[str], documents: list[Document]) -> str:
+    """One LLM call that answers all sub-queries from the fused context"""
+    llm    = ClientRegistry.get_role_model("rag_answerer")
+    prompt = ChatPromptTemplate.from_template(RAG_PROMPT_TEMPLATE)
+    return (prompt | llm).invoke({"context": format_context(documents), "question": "\n".join(f"- {query}" for query in queries)}).content
@@ -1,10 +1,13 @@
 # src/rag_agent_framework/rag/text_splitter.py -- Reusable Component with single respoinsibility: splitting documents 
 
+from typing                  import Iterable, Iterator
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema        import Document
 
 """
-Breaks each Document into smaller chunks for embedding, using settings from the central configuration file
+Breaks each Document into smaller chunks for embedding, using settings from the central configuration file.
+iter_split_documents() and batched() are the streaming path: pages go in one at a time and chunks come out in fixed-size
+batches, so only one batch of chunks (and its vectors) is held at once.
 """
 
 def split_documents(documents: list[Document], chunk_size : int, chunk_overlap: int) -> list[Document]:
@@ -29,4 +32,24 @@ def split_documents(documents: list[Document], chunk_size : int, chunk_overlap:
         length_function = len
     )
     
-    return splitter.split_documents(documents)
\ No newline at end of file
+    return splitter.split_documents(documents)
+
+def iter_split_documents(documents: Iterable[Document], chunk_size: int, chunk_overlap: int) -> Iterator[Document]:
+    """Like split_documents(), but pulls one Document at a time from `documents` (e.g. a lazy loader) and yields its chunks"""
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size      = chunk_size,
+        chunk_overlap   = chunk_overlap,
+        length_function = len
+    )
+    for document in documents:
+        yield from splitter.split_documents([document])
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    """Consecutive lists of `size` items (the last one may be shorter)"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch: yield batch
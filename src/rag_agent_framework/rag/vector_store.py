@@ -1,40 +1,33 @@
 # src/rag_agent_framework/rag/vector_store.py -- Chef (construction crew is init_collection.py). Its job is to connect to the kitchen that is already built. It puts your PDF information (ingredients) onto the shelves and pulls them out later to answer questions. It doesn't have the power to destroy the shelves.
-import os
-from qdrant_client import QdrantClient
-from langchain_openai import OpenAIEmbeddings
+import uuid
+from qdrant_client    import models
 from langchain_qdrant import QdrantVectorStore
-from langchain_community.embeddings.ollama import OllamaEmbeddings
-from rag_agent_framework.core.config import LLM_CFG, OPENAI_API_KEY, OLLAMA_URL
+from langchain.schema import Document
+from rag_agent_framework.core.clients import ClientRegistry
+from rag_agent_framework.core.config  import VECTOR_DB_CFG
+
+# Chunk metadata fields that retrieval can filter on; QdrantVectorStore keeps metadata under the "metadata" payload key
+FILTER_FIELDS = VECTOR_DB_CFG.get("payload_indexes", ["source", "document_id", "part_id", "type"])
 
 # Helper function to get the embedding model based on the config
 def get_embedder():
-    """Returns the embedding model client based on the specified provider or default from the config file"""
-    if LLM_CFG["default"] == "openai":
-        return OpenAIEmbeddings(
-            model=LLM_CFG["openai"]["embedding_model"],
-            openai_api_key = OPENAI_API_KEY
-        )
-    else:
-        return OllamaEmbeddings(
-            model = LLM_CFG["ollama"]["embedding_model"],
-            base_url = OLLAMA_URL,
-            num_ctx = 2048 # Explicitly set context size
-        )
+    """Returns the shared embedding model client for the default provider in the config file"""
+    return ClientRegistry.get_embedder()
 
 
-def get_vector_store(collection_name: str, url: str) -> QdrantVectorStore:
+def get_vector_store(collection_name: str, url: str = None) -> QdrantVectorStore:
     """
-        We instantiate a QdrantClient once, then wrap it in LangChain’s QdrantVectorStore class for easy document add/query.
-        1. We pull in the Qdrant URL from the provided argument.
+        We reuse the process-wide QdrantClient, then wrap it in LangChain’s QdrantVectorStore class for easy document add/query.
+        1. We pull in the Qdrant URL from the provided argument (or QDRANT_URL); embedded vector_db types need none.
         2. We create an embeddings object (OpenAI or Ollama) based on LLM_CFG and available environment variables.	
+        `collection_name` is the alias (rag/collections.py), so a rebuild that swaps it is picked up without restarting anything.
     """
-    if not url: raise ValueError("Qdrant URL must be provided.")
 
     # 1. Initialize embedding function based on config
     embeddings = get_embedder()
 
-    # 2. Initialize Qdrant client
-    client = QdrantClient(url = url)
+    # 2. Get the pooled Qdrant client for this URL (raises if the server type has no URL)
+    client = ClientRegistry.get_qdrant_client(url)
 
     # 3. Returns a LangChain vectore store wrapper around an existing Qdrant collection
     return QdrantVectorStore(
@@ -43,3 +36,47 @@ def get_vector_store(collection_name: str, url: str) -> QdrantVectorStore:
         embedding = embeddings,
     )
 
+
+def create_payload_indexes(client, collection_name: str):
+    """Creates keyword indexes on the filterable metadata fields (skipping existing ones) so filtered searches narrow the candidates first"""
+    existing = client.get_collection(collection_name=collection_name).payload_schema or {}
+    for field in FILTER_FIELDS:
+        if f"metadata.{field}" in existing: continue
+        client.create_payload_index(
+            collection_name = collection_name,
+            field_name      = f"metadata.{field}",
+            field_schema    = models.PayloadSchemaType.KEYWORD,
+        )
+
+def build_filter(filters: dict = None) -> models.Filter | None:
+    """Turns {"source": "spec.pdf", "type": ["cad_summary"]} into a Qdrant filter on chunk metadata; None/empty values are ignored"""
+    conditions = []
+    for field, value in (filters or {}).items():
+        if value in (None, "", []): continue
+        if field not in FILTER_FIELDS: raise ValueError(f"Cannot filter on '{field}', filterable fields are {FILTER_FIELDS}")
+        match = models.MatchAny(any=list(value)) if isinstance(value, (list, tuple, set)) else models.MatchValue(value=value)
+        conditions.append(models.FieldCondition(key=f"metadata.{field}", match=match))
+    return models.Filter(must=conditions) if conditions else None
+
+
+# --- Async path (the API) --- Same payload layout as QdrantVectorStore ({"page_content", "metadata"}, unnamed vector),
+# so documents written by either side are read by the other
+async def asimilarity_search(collection_name: str, query: str, k: int = 4, filters: dict = None, url: str = None) -> list[Document]:
+    """The `k` chunks closest to `query`, with an async embedding call and an async Qdrant query"""
+    vector   = await get_embedder().aembed_query(query)
+    client   = ClientRegistry.get_async_qdrant_client(url)
+    response = await client.query_points(collection_name=collection_name, query=vector, query_filter=build_filter(filters), limit=k, with_payload=True)
+    return [Document(page_content=(point.payload or {}).get("page_content", ""), metadata=(point.payload or {}).get("metadata") or {})
+            for point in response.points]
+
+async def aadd_documents(collection_name: str, documents: list[Document], ids: list[str] = None, url: str = None) -> list[str]:
+    """Embeds and upserts documents without blocking the event loop; returns their point ids"""
+    if not documents: return []
+    ids     = ids or [str(uuid.uuid4()) for _ in documents]
+    vectors = await get_embedder().aembed_documents([doc.page_content for doc in documents])
+    client  = ClientRegistry.get_async_qdrant_client(url)
+    await client.upsert(collection_name=collection_name, points=[
+        models.PointStruct(id=point_id, vector=vector, payload={"page_content": doc.page_content, "metadata": doc.metadata})
+        for point_id, vector, doc in zip(ids, vectors, documents)
+    ])
+    return ids
@@ -0,0 +1,219 @@
+# src/rag_agent_framework/rag/web_loader.py -- Concurrent web-page ingestion with per-host rate limits and an HTTP validator cache
+# 1. Sources are page URLs or sitemaps (urlset or sitemapindex, optionally gzipped); sitemaps are expanded to their page URLs
+# 2. Pages are fetched with httpx.AsyncClient, at most `concurrency` at once and `per_host_concurrency` per host, and no faster
+#    than `per_host_rps` requests per second per host; 429/5xx/timeouts are retried with backoff
+# 3. The HTTP cache (SQLite) keeps each page's ETag / Last-Modified and content hash. Requests are conditional
+#    (If-None-Match / If-Modified-Since), so an unchanged page costs a 304 and is not parsed, chunked or embedded again;
+#    a 200 with the same content hash counts as unchanged too
+# 4. Cache entries are written by commit() once the caller has stored the page, so a failed run re-fetches it next time
+# Used by scripts/ingest.py --urls / --sitemap (web section of config.yaml)
+
+import gzip
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+import httpx
+from pathlib              import Path
+from dataclasses          import dataclass
+from urllib.parse         import urlsplit
+from xml.etree            import ElementTree
+from bs4                  import BeautifulSoup
+from langchain.schema     import Document
+
+from rag_agent_framework.core.config    import WEB_CFG, base_dir
+from rag_agent_framework.core.telemetry import Counter, register, span, get_logger
+
+logger = get_logger(__name__)
+
+PAGES = register(Counter("rag_web_pages_total", "Web pages fetched for ingestion", ("result",)))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+TEXT_TYPES     = ("text/html", "application/xhtml+xml", "text/plain", "text/markdown")
+
+
+@dataclass
+class WebPage:
+    """One fetched source URL. status is new | changed | unchanged | failed"""
+    url:           str
+    status:        str
+    document:      Document = None
+    etag:          str = None
+    last_modified: str = None
+    content_hash:  str = None
+    error:         str = None
+
+
+# ==============================================================================
+# 1. HTTP CACHE
+# ==============================================================================
+class HTTPCache:
+    """Validators (ETag, Last-Modified) and content hash of every page stored so far"""
+
+    def __init__(self, path: str):
+        self.path  = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT, stored REAL)")
+
+    def get(self, url: str) -> tuple | None:
+        """(etag, last_modified, content_hash) of the stored page, or None"""
+        with self._lock:
+            return self._db.execute("SELECT etag, last_modified, content_hash FROM pages WHERE url = ?", (url,)).fetchone()
+
+    def commit(self, page: WebPage):
+        """Records a stored page, so the next fetch of it is conditional"""
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                             (page.url, page.etag, page.last_modified, page.content_hash, time.time()))
+
+    def forget(self, url: str):
+        with self._lock:
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+
+    def close(self):
+        self._db.close()
+
+
+# ==============================================================================
+# 2. PARSING
+# ==============================================================================
+def html_to_document(url: str, content: str, content_type: str = "text/html") -> Document:
+    """The page's visible text (scripts, styles and navigation chrome removed) with its URL and title as metadata"""
+    if "html" not in content_type:
+        return Document(page_content=content.strip(), metadata={"source": url, "title": "", "type": "web_page"})
+    soup = BeautifulSoup(content, "html.parser")
+    for tag in soup(["script", "style", "noscript", "nav", "header", "footer"]): tag.decompose()
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    lines = (line.strip() for line in soup.get_text("\n").splitlines())
+    return Document(page_content="\n".join(line for line in lines if line), metadata={"source": url, "title": title, "type": "web_page"})
+
+def parse_sitemap(content: bytes) -> tuple[list[str], list[str]]:
+    """(page URLs, nested sitemap URLs) of a sitemap or sitemap index"""
+    if content[:2] == b"\x1f\x8b": content = gzip.decompress(content)
+    root  = ElementTree.fromstring(content)
+    locs  = [element.text.strip() for element in root.iter() if element.tag.rsplit("}", 1)[-1] == "loc" and element.text]
+    index = root.tag.rsplit("}", 1)[-1] == "sitemapindex"
+    return ([], locs) if index else (locs, [])
+
+def is_sitemap(url: str) -> bool:
+    path = urlsplit(url).path.lower()
+    return path.endswith((".xml", ".xml.gz")) or "sitemap" in path.rsplit("/", 1)[-1]
+
+
+# ==============================================================================
+# 3. FETCHING
+# ==============================================================================
+class HostLimiter:
+    """Per-host request spacing (1 / rps) and concurrency; used from one event loop"""
+
+    def __init__(self, rps: float, concurrency: int):
+        self.interval    = 1.0 / rps if rps else 0.0
+        self.concurrency = concurrency
+        self._next       = {}                           # host -> earliest start of its next request
+        self._slots      = {}                           # host -> semaphore
+
+    def slot(self, host: str) -> asyncio.Semaphore:
+        return self._slots.setdefault(host, asyncio.Semaphore(self.concurrency))
+
+    async def wait(self, host: str):
+        now   = asyncio.get_running_loop().time()
+        start = max(now, self._next.get(host, now))
+        self._next[host] = start + self.interval
+        if start > now: await asyncio.sleep(start - now)
+
+
+class WebFetcher:
+    """Fetches pages and sitemaps concurrently; with a cache, unchanged pages come back as status 'unchanged' without content"""
+
+    def __init__(self, cache: HTTPCache = None, concurrency: int = 16, per_host_concurrency: int = 4, per_host_rps: float = 4.0,
+                 timeout: float = 30.0, retries: int = 2, user_agent: str = "rag-agent-framework"):
+        self.cache       = cache
+        self.concurrency = concurrency
+        self.limiter     = HostLimiter(per_host_rps, per_host_concurrency)
+        self.timeout     = timeout
+        self.retries     = retries
+        self.user_agent  = user_agent
+
+    async def _get(self, client: httpx.AsyncClient, url: str, headers: dict = None) -> httpx.Response:
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            async with self.limiter.slot(host):
+                await self.limiter.wait(host)
+                try:
+                    response = await client.get(url, headers=headers)
+                    if response.status_code not in RETRY_STATUSES or attempt == self.retries: return response
+                except httpx.TransportError:
+                    if attempt == self.retries: raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def _expand(self, client: httpx.AsyncClient, sources: list[str], depth: int = 3) -> list[str]:
+        """The page URLs of the sources, sitemaps replaced by their pages (nested indexes up to `depth` levels)"""
+        pages, sitemaps = [], []
+        for source in sources: (sitemaps if is_sitemap(source) else pages).append(source)
+        while sitemaps and depth > 0:
+            responses = await asyncio.gather(*(self._get(client, sitemap) for sitemap in sitemaps), return_exceptions=True)
+            nested = []
+            for sitemap, response in zip(sitemaps, responses):
+                if isinstance(response, Exception) or response.status_code != 200:
+                    logger.error(f"❌ Could not read sitemap {sitemap}: {response if isinstance(response, Exception) else response.status_code}")
+                    continue
+                sitemap_pages, children = parse_sitemap(response.content)
+                pages += sitemap_pages
+                nested += children
+            sitemaps, depth = nested, depth - 1
+        return list(dict.fromkeys(pages))                       # Unique, in order
+
+    async def _fetch_page(self, client: httpx.AsyncClient, url: str, limit: asyncio.Semaphore) -> WebPage:
+        cached  = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached and cached[0]: headers["If-None-Match"]     = cached[0]
+        if cached and cached[1]: headers["If-Modified-Since"] = cached[1]
+        async with limit:
+            try:
+                with span("fetch"):
+                    response = await self._get(client, url, headers)
+            except httpx.HTTPError as e:
+                return WebPage(url, "failed", error=f"{type(e).__name__}: {e}")
+        if response.status_code == 304: return WebPage(url, "unchanged")
+        if response.status_code != 200: return WebPage(url, "failed", error=f"HTTP {response.status_code}")
+
+        content_type = response.headers.get("content-type", "text/html").split(";")[0].strip().lower()
+        if content_type not in TEXT_TYPES: return WebPage(url, "failed", error=f"unsupported content type {content_type}")
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        page = WebPage(url, "changed" if cached else "new", etag=response.headers.get("etag"),
+                       last_modified=response.headers.get("last-modified"), content_hash=content_hash)
+        if cached and cached[2] == content_hash:                # The server sent no validators, or ignored them
+            page.status = "unchanged"
+            return page
+        page.document = html_to_document(url, response.text, content_type)
+        return page
+
+    async def afetch(self, sources: list[str]) -> list[WebPage]:
+        """Every page of the sources, in order of completion"""
+        limit = asyncio.Semaphore(self.concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True, headers={"User-Agent": self.user_agent},
+                                     limits=httpx.Limits(max_connections=self.concurrency)) as client:
+            urls  = await self._expand(client, sources)
+            pages = [await task for task in asyncio.as_completed([self._fetch_page(client, url, limit) for url in urls])]
+        for page in pages: PAGES.inc(result=page.status)
+        return pages
+
+    def fetch(self, sources: list[str]) -> list[WebPage]:
+        """Blocking afetch() for scripts"""
+        return asyncio.run(self.afetch(sources))
+
+
+def get_web_fetcher(use_cache: bool = True) -> WebFetcher:
+    """A fetcher configured from the `web` section of config.yaml"""
+    cache = HTTPCache(base_dir / WEB_CFG.get("cache_path", "data/http_cache.sqlite")) if use_cache else None
+    return WebFetcher(cache,
+                      concurrency          = WEB_CFG.get("concurrency", 16),
+                      per_host_concurrency = WEB_CFG.get("per_host_concurrency", 4),
+                      per_host_rps         = WEB_CFG.get("per_host_rps", 4.0),
+                      timeout              = WEB_CFG.get("timeout", 30),
+                      retries              = WEB_CFG.get("retries", 2),
+                      user_agent           = WEB_CFG.get("user_agent", "rag-agent-framework"))
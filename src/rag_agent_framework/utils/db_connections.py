@@ -6,6 +6,9 @@ from neo4j         import GraphDatabase, Driver
 from dotenv        import load_dotenv
 load_dotenv()
 
+from rag_agent_framework.core.clients import ClientRegistry
+from rag_agent_framework.core.config  import NEO4J_CFG
+
 class DatabaseConnections:
     """A singleton class to manage database connections"""
     _qdrant_client = None
@@ -15,21 +18,27 @@ class DatabaseConnections:
     def get_qdrant_client(cls) -> QdrantClient:
         if cls._qdrant_client is None:
             qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
-            print(f"Initializing qdrant client at {qdrant_url}")
-            cls._qdrant_client = QdrantClient(url= qdrant_url)
+            cls._qdrant_client = ClientRegistry.get_qdrant_client(qdrant_url)     # Shares the pooled client with the rest of the process
         return cls._qdrant_client
     
     @classmethod
     def get_neo4j_driver(cls) -> Driver:
         if cls._neo4j_driver is None:
             neo4j_uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+            neo4j_auth = (os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")) if os.getenv("NEO4J_USER") else None   # docker-compose runs NEO4J_AUTH=none
             print(f"Initializing Neo4j driver at {neo4j_uri}")
-            cls._neo4j_driver = GraphDatabase(url= neo4j_uri)
+            cls._neo4j_driver = GraphDatabase.driver(
+                neo4j_uri,
+                auth                           = neo4j_auth,
+                max_connection_pool_size       = NEO4J_CFG.get("max_connection_pool_size", 50),
+                connection_acquisition_timeout = NEO4J_CFG.get("connection_acquisition_timeout", 60),
+            )
         return cls._neo4j_driver
     
-    # Only Neo4j client has an explicit close method
+    # Only Neo4j client has an explicit close method -- the Qdrant client belongs to the ClientRegistry, which closes it
     @classmethod
     def close_connections(cls):
+        cls._qdrant_client = None
         if cls._neo4j_driver:
             print("Closing Neo4j driver.")
             cls._neo4j_driver.close()
@@ -1,6 +1,268 @@
 # src/rag_agent_framework/utils/parser_client.py -- Central Parser Client -- a module communicates with microservices
+# 1. One keep-alive httpx pool (sync + async) is shared by the CAD and PDF parser clients
+# 2. Each service client bounds its in-flight requests, retries 5xx/timeouts with jittered backoff and trips a circuit breaker
+# 3. Sync calls stream files from disk (or any file object); aparse reads the file in a worker thread, off the event loop
 
 import os
-import requests
+import json
+import time
+import random
+import asyncio
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing             import BinaryIO, Iterator, Optional, Union
 
-from ..core.config
\ No newline at end of file
+import httpx
+
+from ..core.config import PARSER_CFG, CAD_PARSER_URL, PDF_PARSER_URL
+
+
+class ParserServiceError(RuntimeError):
+    """Raised when a parser service rejects a file or keeps failing after all retries"""
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class CircuitOpenError(ParserServiceError):
+    """Raised without calling the service while its circuit breaker is open"""
+
+
+# ==============================================================================
+# 1. SHARED CONNECTION POOL
+# ==============================================================================
+_http_client       = None
+_async_http_client = None
+_pool_lock         = threading.Lock()
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections           = PARSER_CFG.get("max_connections", 16),
+        max_keepalive_connections = PARSER_CFG.get("max_keepalive", 8),
+        keepalive_expiry          = PARSER_CFG.get("keepalive_expiry", 30),
+    )
+
+def _get_http_client() -> httpx.Client:
+    global _http_client
+    with _pool_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=_limits(), timeout=PARSER_CFG.get("timeout", 120))
+    return _http_client
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = httpx.AsyncClient(limits=_limits(), timeout=PARSER_CFG.get("timeout", 120))
+    return _async_http_client
+
+def close():
+    """Closes the shared sync pool (scripts call this when done)"""
+    global _http_client
+    with _pool_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+async def aclose():
+    """Closes both shared pools (the API calls this on shutdown)"""
+    global _async_http_client
+    close()
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
+
+
+# ==============================================================================
+# 2. CIRCUIT BREAKER
+# ==============================================================================
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures, then lets one trial request through every `reset_timeout` seconds"""
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold     = threshold
+        self.reset_timeout = reset_timeout
+        self._failures     = 0
+        self._opened_at    = None
+        self._lock         = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None: return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout: return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open": return False
+            if self.state == "half_open": self._opened_at = time.monotonic()     # Only one trial per reset window
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures  = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+# ==============================================================================
+# 3. THE ParserClient CLASS
+# ==============================================================================
+FileInput = Union[str, os.PathLike, BinaryIO]
+
+def _is_retryable(response: httpx.Response) -> bool:
+    return response.status_code >= 500
+
+class ParserClient:
+    """Client for one parser microservice (`/parse_cad/` or `/parse_pdf/` plus its `/batch` variant)"""
+
+    def __init__(self, name: str, base_url: str, path: str):
+        if not base_url: raise ValueError(f"No URL configured for the {name} parser service.")
+        self.name            = name
+        self.url             = base_url.rstrip("/") + path
+        self.batch_url       = self.url.rstrip("/") + "/batch"
+        self.retries         = PARSER_CFG.get("retries", 3)
+        self.backoff_base    = PARSER_CFG.get("backoff_base", 0.5)
+        self.max_concurrency = PARSER_CFG.get("max_concurrency", 4)
+        self.breaker         = CircuitBreaker(PARSER_CFG.get("breaker_threshold", 5), PARSER_CFG.get("breaker_reset", 30))
+        self._semaphore      = threading.BoundedSemaphore(self.max_concurrency)
+        self._async_semaphores = weakref.WeakKeyDictionary()       # Event loop -> its asyncio.Semaphore
+
+    # --- Helpers ---
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: a random delay in [0, base * 2^attempt]"""
+        return random.uniform(0, self.backoff_base * (2 ** attempt))
+
+    def _check_breaker(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} parser circuit is open; not sending request.")
+
+    def _finish(self, response: httpx.Response) -> dict:
+        if response.status_code >= 400:
+            raise ParserServiceError(f"{self.name} parser returned {response.status_code}: {response.text[:200]}", response.status_code)
+        return response.json()
+
+    @staticmethod
+    def _open(file: FileInput, filename: Optional[str]):
+        """Returns (filename, file object, should_close). Paths are opened lazily so uploads stream from disk"""
+        if isinstance(file, (str, os.PathLike)):
+            return filename or os.path.basename(file), open(file, "rb"), True
+        return filename or os.path.basename(getattr(file, "name", "upload")), file, False
+
+    def _read(self, file: FileInput, filename: Optional[str]) -> tuple[str, bytes]:
+        """Returns (filename, contents from the current position); blocking, so aparse runs it in a worker thread"""
+        name, fh, should_close = self._open(file, filename)
+        try:
+            return name, fh.read()
+        finally:
+            if should_close: fh.close()
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        """The in-flight cap for the running event loop; an asyncio.Semaphore is bound to the loop that first waits on it"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_semaphores:
+            self._async_semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._async_semaphores[loop]
+
+    # --- Sync API ---
+    def _post(self, url: str, file: FileInput, filename: Optional[str] = None) -> httpx.Response:
+        name, fh, should_close = self._open(file, filename)
+        start = fh.tell()
+        try:
+            for attempt in range(self.retries + 1):
+                self._check_breaker()
+                fh.seek(start)      # Rewind for every attempt
+                try:
+                    with self._semaphore:
+                        response = _get_http_client().post(url, files={"file": (name, fh)})
+                except httpx.TransportError as e:       # Timeouts and connection errors
+                    self.breaker.record_failure()
+                    if attempt == self.retries: raise ParserServiceError(f"{self.name} parser unreachable: {e}") from e
+                else:
+                    if not _is_retryable(response):
+                        self.breaker.record_success()
+                        return response
+                    self.breaker.record_failure()
+                    if attempt == self.retries: return response
+                time.sleep(self._backoff(attempt))
+        finally:
+            if should_close: fh.close()
+
+    def parse(self, file: FileInput, filename: Optional[str] = None) -> dict:
+        """Parses one file (a path or an open binary file object) and returns the service's JSON response"""
+        return self._finish(self._post(self.url, file, filename))
+
+    def parse_many(self, paths: list[str]) -> Iterator[tuple[str, Union[dict, Exception]]]:
+        """Parses many files concurrently (bounded by max_concurrency). Yields (path, result or exception) as each completes"""
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            futures = {pool.submit(self.parse, path): path for path in paths}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+
+    def parse_batch(self, paths: list[str]) -> Iterator[dict]:
+        """
+            Sends many files to the service's /batch endpoint in one request and yields its NDJSON result lines as they arrive.
+            Not retried: a batch that fails midway has already streamed partial results.
+        """
+        self._check_breaker()
+        handles = [open(path, "rb") for path in paths]
+        try:
+            files = [("files", (os.path.basename(path), fh)) for path, fh in zip(paths, handles)]
+            with self._semaphore, _get_http_client().stream("POST", self.batch_url, files=files) as response:
+                if response.status_code >= 400:
+                    response.read()
+                    self.breaker.record_failure() if _is_retryable(response) else self.breaker.record_success()
+                    raise ParserServiceError(f"{self.name} parser returned {response.status_code}: {response.text[:200]}", response.status_code)
+                self.breaker.record_success()
+                for line in response.iter_lines():
+                    if line: yield json.loads(line)
+        finally:
+            for fh in handles: fh.close()
+
+    # --- Async API ---
+    async def aparse(self, file: FileInput, filename: Optional[str] = None) -> dict:
+        """Async version of parse(), for use inside the API's event loop"""
+        name, content = await asyncio.to_thread(self._read, file, filename)
+        semaphore     = self._async_semaphore()
+        for attempt in range(self.retries + 1):
+            self._check_breaker()
+            try:
+                async with semaphore:
+                    response = await _get_async_http_client().post(self.url, files={"file": (name, content)})
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                if attempt == self.retries: raise ParserServiceError(f"{self.name} parser unreachable: {e}") from e
+            else:
+                if not _is_retryable(response):
+                    self.breaker.record_success()
+                    return self._finish(response)
+                self.breaker.record_failure()
+                if attempt == self.retries: return self._finish(response)
+            await asyncio.sleep(self._backoff(attempt))
+
+
+# ==============================================================================
+# 4. SERVICE CLIENTS
+# ==============================================================================
+_clients = {}
+
+def _get_client(name: str, base_url: str, path: str) -> ParserClient:
+    with _pool_lock:
+        if name not in _clients:
+            _clients[name] = ParserClient(name, base_url, path)
+    return _clients[name]
+
+def get_cad_parser() -> ParserClient:
+    """Client for the CAD parsing microservice at CAD_PARSER_URL"""
+    return _get_client("cad", CAD_PARSER_URL, "/parse_cad/")
+
+def get_pdf_parser() -> ParserClient:
+    """Client for the PDF parsing microservice at PDF_PARSER_URL"""
+    return _get_client("pdf", PDF_PARSER_URL, "/parse_pdf/")
@@ -1,28 +1,51 @@
 # src/rag_agent_framework/tools/rag_tool.py -- RSG Tools for Agents use decorator @tool to wrap Python function into tool that AI agent can understand
 # query.py is designed for human use vs rag_tool.py designed as API for the AI Agent, and we can add more tools later specialized for AI Agent 
 
-from crewai.tools import tool
+from crewai_tools import tool                 # crewai 0.35 ships the @tool decorator in crewai-tools
 from rag_agent_framework.rag.rag_chain import get_rag_chain
+from rag_agent_framework.rag.multi_query import multi_query_search, answer_queries, format_context
 from rag_agent_framework.core.config   import QDRANT_URL
 from rag_agent_framework.core.config   import config
+from rag_agent_framework.core.telemetry import span, TOOL_SECONDS
 
 
 @tool("Document Knowledge Base Tool")
-def rag_tool(question: str) -> str:
+def rag_tool(question: str, source: str = None, chunk_type: str = None, document_id: str = None, part_id: str = None) -> str:
     """
     Searches and returns relevant information from the document knowledge base.
-    Use this tool to answer questions about the contents of the ingested document
+    Use this tool to answer questions about the contents of the ingested document.
+    Optional filters narrow the search: `source` (file name, e.g. "spec.pdf"), `chunk_type` ("text_chunk" for documents,
+    "cad_summary" for CAD parts), `document_id`, or `part_id` (e.g. "housing.step:3"). Leave them empty to search everything.
     """
-    qdrant_url = QDRANT_URL
-    if not qdrant_url: raise ValueError("QDRANT_URL environment variable not set.")
+    qdrant_url = QDRANT_URL                      # None is fine for the embedded vector_db types; the client registry checks it
 
-    # Get the RAG chain (builds retrieval, generation pipeline) - for rag_tool to execute that pipeline given the question
-    collection_name = config.vector_db.default_collection_name
-    rag_chain = get_rag_chain(collection_name = collection_name, url = qdrant_url)
+    # crewai calls tools directly, not through LangChain callbacks, so the tool times itself -- including building the chain,
+    # whose first call per collection checks it in Qdrant (ensure_collection)
+    with span("tool", TOOL_SECONDS, tool="rag_tool"):
+        # Get the RAG chain (builds retrieval, generation pipeline) - for rag_tool to execute that pipeline given the question
+        collection_name = config.vector_db.default_collection_name
+        filters         = {"source": source, "type": chunk_type, "document_id": document_id, "part_id": part_id}
+        rag_chain = get_rag_chain(collection_name = collection_name, url = qdrant_url, filters = filters)
 
-    # Invoke the chain with the questions
-    result = rag_chain.invoke(question)
+        # Invoke the chain with the questions
+        result = rag_chain.invoke(question)
 
     return result
 
-    
\ No newline at end of file
+
+@tool("Multi-Query Document Search Tool")
+def multi_query_rag_tool(queries: list[str], synthesize: bool = True, source: str = None, chunk_type: str = None,
+                         document_id: str = None, part_id: str = None) -> str:
+    """
+    Searches the document knowledge base for several phrasings or sub-questions at once and returns one combined result.
+    Prefer this over calling the Document Knowledge Base Tool repeatedly with reworded questions: pass them all in `queries`.
+    With `synthesize` true (default) it returns one answer to all of them; with false, the de-duplicated matching passages.
+    Optional filters work as in the Document Knowledge Base Tool.
+    """
+    if isinstance(queries, str): queries = queries.splitlines()          # Agents sometimes send one newline-separated string
+    filters = {"source": source, "type": chunk_type, "document_id": document_id, "part_id": part_id}
+
+    with span("tool", TOOL_SECONDS, tool="multi_query_rag_tool"):
+        documents = multi_query_search(queries, config.vector_db.default_collection_name, url=QDRANT_URL, filters=filters)
+        if not documents: return "No relevant information was found in the documents."
+        return answer_queries(queries, documents) if synthesize else format_context(documents)
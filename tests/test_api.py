@@ -1,12 +1,25 @@
 # tests/test_api.py
 
+import sys
+import asyncio
+import httpx
+from pathlib            import Path
+from qdrant_client      import QdrantClient
 from fastapi.testclient import TestClient
-from rag_agent_framework.api.server import app
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeEmbeddings
+from rag_agent_framework.api             import server
+from rag_agent_framework.api.server      import app
+from rag_agent_framework.core.clients    import ClientRegistry
+from rag_agent_framework.rag             import memory
+from rag_agent_framework.rag.collections import resolve
+from rag_agent_framework.utils           import parser_client
 
 # Create a client to interact with app in tests
 client = TestClient(app)
 
-def teset_health_check():
+def test_health_check():
     """ Tests if the /health endpoint returns a 200 OK status and the correct JSON response"""
     response = client.get("/health")
     assert response.status_code == 200
@@ -15,4 +28,81 @@ def teset_health_check():
 def test_read_main_docs():
     """Tests if the main documentation page loads correctly"""
     response = client.get("/docs")
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+def test_metrics_endpoint():
+    """Tests that /metrics serves the Prometheus text format and records the requests made so far"""
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE rag_stage_duration_seconds histogram" in response.text
+    assert 'rag_http_request_duration_seconds_count{method="GET",path="/health",status="200"}' in response.text
+
+def test_ready_stays_unavailable_while_warmup_fails(monkeypatch):
+    """A failed warmup keeps /ready at 503 with the error, and is retried until the components build"""
+    attempts, answers = [], []
+    def warm():
+        attempts.append(1)
+        if len(attempts) == 1: raise ConnectionError("ollama unreachable")
+    def sleep_then_probe(seconds):
+        answers.append(client.get("/ready"))
+        return real_sleep(0)
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(server, "_warm_components", warm)
+    monkeypatch.setattr(server.asyncio, "sleep", sleep_then_probe)
+    monkeypatch.setattr(app.state, "ready", False, raising=False)
+    monkeypatch.setattr(app.state, "warmup_error", None, raising=False)
+
+    asyncio.run(server._warmup(app))
+    assert answers[0].status_code == 503 and "ollama unreachable" in answers[0].json()["warmup_error"]
+    response = client.get("/ready")
+    assert len(attempts) == 2 and response.status_code == 200 and response.json() == {"status": "ready"}
+
+def test_office_uploads_are_parsed_by_the_parser_service(monkeypatch):
+    """DOCX and PPTX go to the pdf-parser service like PDFs; without the service they are refused rather than parsed in-process"""
+    parsed = []
+    def service(request: httpx.Request) -> httpx.Response:
+        parsed.append(request.url.path)
+        text = ["# Valve manual\nThe housing is tightened to 11 Nm.", "# Pump slides\nImpellers are balanced before assembly."][len(parsed) - 1]
+        return httpx.Response(200, json={"markdown_content": text})
+    qdrant = QdrantClient(location=":memory:")
+    ClientRegistry.override(embedder=FakeEmbeddings(dims=16), qdrant_client=qdrant)
+    monkeypatch.setattr(parser_client, "_clients", {})
+    monkeypatch.setattr(parser_client, "PDF_PARSER_URL", "http://pdf-parser")
+    monkeypatch.setattr(parser_client, "_async_http_client", httpx.AsyncClient(transport=httpx.MockTransport(service)))
+    try:
+        monkeypatch.setattr(server, "PDF_PARSER_URL", "http://pdf-parser")
+        for name in ("manual.docx", "slides.pptx"):
+            response = client.post("/upload", data={"collection_name": "office_docs"}, files={"file": (name, b"PK\x03\x04")})
+            assert response.status_code == 200, response.text
+        assert parsed == ["/parse_pdf/", "/parse_pdf/"] and qdrant.count(resolve(qdrant, "office_docs")).count == 2
+
+        monkeypatch.setattr(server, "PDF_PARSER_URL", None)
+        response = client.post("/upload", data={"collection_name": "office_docs"}, files={"file": ("manual.docx", b"PK\x03\x04")})
+        assert response.status_code == 400 and len(parsed) == 2
+    finally:
+        ClientRegistry.override()
+
+def test_upload_builds_the_store_off_the_event_loop(monkeypatch):
+    """MemoryStore() makes Qdrant round-trips (ensure_collection), so /upload must not construct it on the event loop"""
+    on_loop = []
+    def ensure(*args):
+        try:
+            on_loop.append(asyncio.get_running_loop() is not None)
+        except RuntimeError:
+            on_loop.append(False)
+        return ensure_collection(*args)
+    ensure_collection = memory.ensure_collection
+    ClientRegistry.override(embedder=FakeEmbeddings(dims=16), qdrant_client=QdrantClient(location=":memory:"))
+    monkeypatch.setattr(memory, "ensure_collection", ensure)
+    monkeypatch.setattr(server, "PDF_PARSER_URL", "http://pdf-parser")
+    monkeypatch.setattr(parser_client, "_clients", {})
+    monkeypatch.setattr(parser_client, "PDF_PARSER_URL", "http://pdf-parser")
+    monkeypatch.setattr(parser_client, "_async_http_client", httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"markdown_content": "# Torque table\nM8 bolts take 25 Nm."}))))
+    try:
+        response = client.post("/upload", data={"collection_name": "torque_docs"}, files={"file": ("table.pdf", b"%PDF-1.4")})
+    finally:
+        ClientRegistry.override()
+    assert response.status_code == 200 and on_loop == [False]
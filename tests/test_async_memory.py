@@ -0,0 +1,78 @@
+# tests/test_async_memory.py -- /chat memory reads and writes are awaited on the event loop and share storage with MemoryStore
+
+import sys
+import asyncio
+from pathlib       import Path
+from qdrant_client import QdrantClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeEmbeddings
+from rag_agent_framework.core.clients    import ClientRegistry
+from rag_agent_framework.rag             import collections
+from rag_agent_framework.rag.memory      import MemoryStore, AsyncMemoryStore
+
+
+def _override(embedder: FakeEmbeddings) -> QdrantClient:
+    client = QdrantClient(location=":memory:")
+    ClientRegistry.override(embedder=embedder, qdrant_client=client)
+    return client
+
+def test_async_round_trip_is_visible_to_the_sync_store():
+    _override(FakeEmbeddings(dims=16))
+    try:
+        store = AsyncMemoryStore(user_id="alice")
+        async def run():
+            await store.add_memory("Alice prefers torque values in Nm.")
+            await store.add_memory("Alice works on the valve assembly line.")
+            return await store.get_memories("Which units does Alice prefer for torque?", k=1)
+        found = asyncio.run(run())
+        assert found[0].page_content == "Alice prefers torque values in Nm." and found[0].metadata["user_id"] == "alice"
+
+        synced = MemoryStore(user_id="alice").get_memories("valve assembly line", k=1)       # Same collection and payload layout
+        assert synced[0].page_content == "Alice works on the valve assembly line."
+    finally:
+        ClientRegistry.override()
+
+def test_event_loop_keeps_running_while_memories_are_retrieved():
+    _override(FakeEmbeddings(dims=16, latency_s=0.2))
+    try:
+        store = AsyncMemoryStore(user_id="bob")
+        async def run():
+            await store.add_memory("Bob asked about the spindle bearings.")
+            ticks = 0
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+            task = asyncio.create_task(ticker())
+            await asyncio.gather(*(store.get_memories("spindle") for _ in range(4)))   # Four 0.2 s embedding calls, concurrently
+            task.cancel()
+            return ticks
+        assert asyncio.run(run()) >= 10
+    finally:
+        ClientRegistry.override()
+
+def test_collection_is_created_once(monkeypatch):
+    client = _override(FakeEmbeddings(dims=16))
+    calls  = []
+    ensure = collections.ensure_collection
+    monkeypatch.setattr(collections, "ensure_collection", lambda *args: calls.append(args[1]) or ensure(*args))
+    try:
+        async def run():
+            for _ in range(3): await collections.aensure_collection("user_carol_memory")
+        asyncio.run(run())
+        assert calls == ["user_carol_memory"] and collections.resolve(client, "user_carol_memory")
+    finally:
+        ClientRegistry.override()
+
+def test_collection_is_ensured_again_on_a_new_client():
+    async def run():
+        await collections.aensure_collection("user_dave_memory")
+    for _ in range(2):
+        client = _override(FakeEmbeddings(dims=16))                 # A fresh storage each time, e.g. after a Qdrant reset
+        try:
+            asyncio.run(run())
+            assert collections.resolve(client, "user_dave_memory")
+        finally:
+            ClientRegistry.override()
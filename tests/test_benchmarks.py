@@ -0,0 +1,44 @@
+# tests/test_benchmarks.py -- Smoke test: the offline benchmark suite runs end to end and emits a complete JSON report
+
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+RUNNER = Path(__file__).resolve().parent.parent / "benchmarks" / "run.py"
+
+def test_benchmark_suite_runs_offline(tmp_path):
+    """Runs every benchmark at a tiny size against the fakes and checks the report structure"""
+    output = tmp_path / "bench.json"
+    subprocess.run(
+        [sys.executable, str(RUNNER), "--docs", "3", "--doc-chars", "2000", "--memories", "10", "--queries", "3",
+         "--chat-requests", "4", "--concurrency", "2", "--crew-latency", "0", "--output", str(output)],
+        check = True, capture_output = True
+    )
+
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == {"split_documents", "ingest", "get_memories", "rag_chain", "chat"}
+    assert report["results"]["ingest"]["points"] > 0
+    assert report["results"]["chat"]["errors"] == 0
+    assert "p99_ms" in report["results"]["chat"]
+
+
+def test_fake_llm_server_is_deterministic():
+    """The OpenAI and Ollama endpoints of the stand-in server answer deterministically with the configured dimensions"""
+    sys.path.insert(0, str(RUNNER.parent))
+    from fastapi.testclient import TestClient
+    from fake_llm_server    import app, Settings
+
+    client = TestClient(app)
+    chat   = {"model": "fake-chat", "messages": [{"role": "user", "content": "torque spec?"}]}
+    first  = client.post("/v1/chat/completions", json=chat).json()
+    assert first == client.post("/v1/chat/completions", json=chat).json()
+    assert first["usage"]["completion_tokens"] == Settings.words
+
+    streamed = client.post("/api/chat", json=chat).text.strip().splitlines()
+    assert json.loads(streamed[-1])["done"] is True
+    assert "".join(json.loads(line)["message"]["content"] for line in streamed) == first["choices"][0]["message"]["content"]
+
+    vector = client.post("/api/embeddings", json={"model": "fake-embed", "prompt": "valve"}).json()["embedding"]
+    assert len(vector) == Settings.dims
+    assert client.post("/v1/embeddings", json={"input": ["valve"]}).json()["data"][0]["embedding"] == vector
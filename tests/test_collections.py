@@ -0,0 +1,81 @@
+# tests/test_collections.py -- Collections are served through aliases: rebuilds swap atomically, old versions roll back, errors never recreate
+
+import sys
+import pytest
+from pathlib import Path
+from qdrant_client import QdrantClient, models
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeEmbeddings
+from rag_agent_framework.core.clients    import ClientRegistry
+from rag_agent_framework.rag             import collections
+from rag_agent_framework.rag.collections import ensure_collection, new_version, swap_alias, rollback, resolve, versions
+from rag_agent_framework.rag.memory      import MemoryStore
+
+
+def _add(client, collection, text):
+    client.upsert(collection, [models.PointStruct(id=abs(hash(text)) % 10**9, vector=[1.0] * 8, payload={"page_content": text, "metadata": {}})])
+
+@pytest.fixture
+def client():
+    client = QdrantClient(location=":memory:")
+    ClientRegistry.override(embedder=FakeEmbeddings(dims=8), qdrant_client=client)
+    yield client
+    ClientRegistry.override()
+
+def test_swap_keeps_readers_on_the_alias(client):
+    first = ensure_collection(client, "kb")
+    assert ensure_collection(client, "kb") == first                     # Existing: nothing created
+    store = MemoryStore(collection_name="kb")
+    store.add_memory("old fact")
+
+    second = new_version(client, "kb", 8)
+    _add(client, second, "new fact")
+    assert store.get_memories("fact", k=5)[0].page_content == "old fact"    # The build is invisible until the swap
+
+    assert swap_alias(client, "kb", second, keep=1) == first
+    assert [doc.page_content for doc in store.get_memories("fact", k=5)] == ["new fact"]     # Same store object, new version
+
+    third = new_version(client, "kb", 8)
+    swap_alias(client, "kb", third, keep=1)
+    assert versions(client, "kb") == [third, second]                    # `first` is beyond the retention
+    assert rollback(client, "kb") == second and resolve(client, "kb") == second
+
+def test_qdrant_errors_do_not_recreate(client, monkeypatch):
+    target = ensure_collection(client, "kb")
+    _add(client, target, "keep me")
+    monkeypatch.setattr(client, "get_aliases", lambda: (_ for _ in ()).throw(ConnectionError("qdrant unavailable")))
+    with pytest.raises(ConnectionError):
+        MemoryStore(collection_name="kb")
+    monkeypatch.undo()
+    assert client.count("kb").count == 1
+
+def _rival(client, name):
+    """Another process creating `name` at the same moment: its own version, then the alias"""
+    theirs = f"{name}__v1"
+    client.create_collection(theirs, vectors_config=models.VectorParams(size=8, distance=models.Distance.COSINE))
+    client.update_collection_aliases(change_aliases_operations=[
+        models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=theirs, alias_name=name))])
+    return theirs
+
+def test_concurrent_first_creation_keeps_one_version(client, monkeypatch):
+    created = new_version
+    def racing_new_version(client, alias, vector_size):
+        ours = created(client, alias, vector_size)
+        racing_new_version.theirs = _rival(client, alias)               # The rival's alias lands before ours
+        return ours
+    monkeypatch.setattr(collections, "new_version", racing_new_version)
+    assert ensure_collection(client, "kb") == racing_new_version.theirs
+    assert versions(client, "kb") == [racing_new_version.theirs] and resolve(client, "kb") == racing_new_version.theirs
+
+def test_alias_conflict_drops_our_version(client, monkeypatch):
+    def conflict(client, alias, collection, previous):
+        conflict.theirs = _rival(client, alias)
+        raise RuntimeError(f"Alias {alias} already exists!")            # How a Qdrant server refuses a second alias
+    monkeypatch.setattr(collections, "_point_alias", conflict)
+    assert ensure_collection(client, "kb") == conflict.theirs
+    assert versions(client, "kb") == [conflict.theirs]
+
+    monkeypatch.setattr(collections, "_point_alias", lambda *args: (_ for _ in ()).throw(RuntimeError("qdrant unavailable")))
+    with pytest.raises(RuntimeError):                                    # Not a lost race: the error propagates
+        ensure_collection(client, "other")
@@ -0,0 +1,71 @@
+# tests/test_corpus_store.py -- Chunks and vectors round-trip through the corpus store, and reindex rebuilds a collection from it
+
+import sys
+import threading
+import importlib.util
+import numpy as np
+from pathlib import Path
+from click.testing import CliRunner
+from qdrant_client import QdrantClient
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+from fakes import FakeEmbeddings
+from rag_agent_framework.core.clients      import ClientRegistry
+from rag_agent_framework.rag.corpus_store  import CorpusStore, CorpusWriter, model_key
+
+
+def _load_reindex():
+    spec   = importlib.util.spec_from_file_location("reindex", PROJECT_ROOT / "scripts" / "reindex.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_writer_shards_and_memory_maps_vectors(tmp_path):
+    writer = CorpusWriter(CorpusStore(tmp_path), shard_size=3, key="fake__model")
+    for i in range(4):
+        writer.add([f"00000000-0000-0000-0000-00000000000{i}"], [f"chunk {i}"], [{"source": "spec.md", "type": "text_chunk"}], [[float(i), 1.0]])
+    writer.close()
+
+    store = CorpusStore(tmp_path)                        # Re-read from disk
+    assert [shard["rows"] for shard in store.shards] == [3, 1]
+    assert store.read_chunks("shard-00000").column("text").to_pylist() == ["chunk 0", "chunk 1", "chunk 2"]
+    vectors = store.read_embeddings("shard-00001", "fake__model")
+    assert isinstance(vectors, np.memmap) and vectors.tolist() == [[3.0, 1.0]]
+    assert store.read_embeddings("shard-00001", "other__model") is None
+    assert store.stats()["models"] == {"fake__model": 4}
+
+def test_concurrent_writers_keep_each_others_shards_and_tombstones(tmp_path):
+    stores = [CorpusStore(tmp_path) for _ in range(8)]         # Each holds its own, soon stale, copy of the manifest
+    def write(i, store):
+        store.write_shard([f"id-{i}"], [f"chunk {i}"], [{"source": f"doc-{i}.md"}], [[float(i), 1.0]], "fake__model")
+        store.delete_source(f"old-{i}.md")
+    threads = [threading.Thread(target=write, args=(i, store)) for i, store in enumerate(stores)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+
+    store = CorpusStore(tmp_path)
+    assert sorted(shard["name"] for shard in store.shards) == [f"shard-{i:05d}" for i in range(8)]
+    assert sorted(store.read_chunks(shard["name"]).column("text")[0].as_py() for shard in store.shards) == [f"chunk {i}" for i in range(8)]
+    assert store.stats()["deleted"] == 8 and store.manifest["version"] == 16
+
+def test_reindex_embeds_once_per_model(tmp_path):
+    embedder = FakeEmbeddings(dims=16)
+    client   = QdrantClient(location=":memory:")
+    ClientRegistry.override(embedder=embedder, qdrant_client=client)
+    try:
+        store = CorpusStore(tmp_path)
+        store.write_shard([f"00000000-0000-0000-0000-00000000000{i}" for i in range(5)], [f"valve part {i}" for i in range(5)],
+                          [{"source": "spec.md", "type": "text_chunk"}] * 5)          # Chunks only, no vectors for this model yet
+        reindex = _load_reindex().reindex
+        args    = ["--collection", "rebuilt", "--store", str(tmp_path), "--parallel", "1"]
+
+        assert CliRunner().invoke(reindex, args).exit_code == 0
+        calls_first = embedder.calls
+        assert CliRunner().invoke(reindex, args).exit_code == 0
+
+        assert client.count("rebuilt").count == 5
+        assert calls_first > 0 and embedder.calls == calls_first                 # Second run embeds nothing
+        assert CorpusStore(tmp_path).stats()["models"] == {model_key(): 5}
+    finally:
+        ClientRegistry.override()
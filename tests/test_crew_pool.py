@@ -0,0 +1,50 @@
+# tests/test_crew_pool.py -- Concurrent crew runs each get their own crew; built crews are reused and share clients and tools
+
+import sys
+import time
+import threading
+from pathlib            import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeChatModel
+from rag_agent_framework.agents.crew import CrewPool, build_crew
+
+
+class RecordingCrew:
+    """Fails the test if two threads use it at once, like a Crew whose tasks hold one run's inputs and outputs"""
+
+    def __init__(self):
+        self.in_use = threading.Lock()
+        self.runs   = 0
+
+    def kickoff(self, inputs: dict) -> str:
+        assert self.in_use.acquire(blocking=False), "crew shared between concurrent runs"
+        try:
+            time.sleep(0.02)
+            self.runs += 1
+            return f"answer to {inputs['topic']}"
+        finally:
+            self.in_use.release()
+
+def test_concurrent_runs_never_share_a_crew():
+    built = []
+    pool  = CrewPool(lambda: built.append(RecordingCrew()) or built[-1], size=2, max_idle=3)
+    pool.prefill()
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        answers = list(executor.map(lambda i: pool.kickoff({"topic": i}), range(24)))
+
+    assert answers == [f"answer to {i}" for i in range(24)]
+    assert 2 <= len(built) <= 6 and sum(crew.runs for crew in built) == 24
+    assert pool._idle.qsize() == 3                                                   # Extra crews beyond max_idle are dropped
+
+    with pool.checkout() as first: pass
+    with pool.checkout() as second: pass
+    assert first is second                                                           # Sequential runs reuse the warm crew
+
+def test_built_crews_share_the_llm_and_tools_but_not_tasks():
+    llm         = FakeChatModel()
+    one, other  = build_crew(llm), build_crew(llm)
+    assert one.tasks[0] is not other.tasks[0] and one.agents[0] is not other.agents[0]
+    assert one.agents[0].llm is other.agents[0].llm
+    assert [id(tool) for tool in one.agents[0].tools] == [id(tool) for tool in other.agents[0].tools]
@@ -0,0 +1,42 @@
+# tests/test_dedup.py -- Near-duplicate chunks are recognised before embedding, across batches and across index instances
+
+from rag_agent_framework.rag.dedup import DedupIndex
+
+TEXT = ("The spindle motor is rated for 2.2 kW at 24000 rpm and must be warmed up for ten minutes before cutting aluminium. "
+        "Coolant flow should be checked at the start of every shift, and the collet cleaned whenever the tool is changed. "
+        "Spindle bearings are greased for life, but a rising noise level or temperature above 60 degrees means they need inspection. "
+        "Never run the spindle without a tool clamped, since the empty collet can be damaged at full speed. Record every service "
+        "in the machine log together with the operating hours shown on the controller and the name of the technician.")
+NEAR = TEXT.replace("every shift", "each shift")                                   # One word changed
+OTHER = ("Gearbox oil is replaced every 2000 operating hours; use ISO VG 220 and check the level weekly with the machine stopped. "
+         "The sight glass must show oil between the two marks, otherwise top up through the breather port on the housing.")
+
+
+def test_near_duplicates_are_skipped_and_distinct_chunks_kept(tmp_path):
+    index = DedupIndex("docs", path=tmp_path / "dedup.sqlite")
+    plan  = index.check(["a", "b"], [TEXT, OTHER])
+    assert plan.keep == [0, 1] and not plan.duplicates
+    index.commit(plan)
+
+    plan = index.check(["c", "d"], [NEAR, OTHER + " "])
+    assert plan.keep == [] and plan.duplicates == {0: "a", 1: "b"}
+
+def test_duplicates_within_one_batch(tmp_path):
+    plan = DedupIndex("docs", path=tmp_path / "dedup.sqlite").check(["a", "b", "c"], [TEXT, OTHER, NEAR])
+    assert plan.keep == [0, 1] and plan.duplicates == {2: "a"} and plan.ids == ["a", "b"]
+
+def test_index_persists_and_is_per_collection(tmp_path):
+    path  = tmp_path / "dedup.sqlite"
+    first = DedupIndex("docs", path=path)
+    first.commit(first.check(["a"], [TEXT]))
+
+    assert DedupIndex("docs", path=path).check(["b"], [NEAR]).duplicates == {0: "a"}   # A later ingest run
+    assert DedupIndex("other", path=path).check(["b"], [NEAR]).keep == [0]
+
+def test_entries_of_deleted_points_are_forgotten(tmp_path):
+    index = DedupIndex("docs", path=tmp_path / "dedup.sqlite")
+    index.commit(index.check(["a"], [TEXT]))
+
+    plan = index.check(["b"], [NEAR], exists=lambda point_ids: set())               # The collection was dropped
+    assert plan.keep == [0]
+    assert index.check(["c"], [NEAR]).keep == [0]                                   # The stale entry is gone for good
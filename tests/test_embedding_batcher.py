@@ -0,0 +1,83 @@
+# tests/test_embedding_batcher.py -- Concurrent embed calls from threads and from the event loop share batched requests
+
+import sys
+import json
+import asyncio
+import httpx
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.embeddings import Embeddings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeEmbeddings, fake_embedding
+from rag_agent_framework.core.embedding_batcher import BatchingEmbeddings
+
+
+def test_threads_share_batches():
+    fake     = FakeEmbeddings(dims=8, latency_s=0.02)
+    batcher  = BatchingEmbeddings(fake, max_batch=64, max_wait_ms=10, workers=1)
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        vectors = list(pool.map(batcher.embed_query, [f"question {i}" for i in range(32)]))
+
+    assert vectors == [fake_embedding(f"question {i}", 8) for i in range(32)]     # Every caller gets its own vector back
+    assert fake.calls < 8
+
+def test_asyncio_callers_and_prefixes():
+    fake    = FakeEmbeddings(dims=8)
+    batcher = BatchingEmbeddings(fake, max_batch=4, max_wait_ms=10, query_prefix="query: ", document_prefix="passage: ")
+
+    async def main():
+        return await asyncio.gather(batcher.aembed_query("a"), batcher.aembed_documents(["b", "c"]), batcher.aembed_query("d"))
+
+    query_a, documents, query_d = asyncio.run(main())
+    assert query_a == fake_embedding("query: a", 8) and query_d == fake_embedding("query: d", 8)
+    assert documents == [fake_embedding("passage: b", 8), fake_embedding("passage: c", 8)]
+    assert batcher.embed_documents([f"chunk {i}" for i in range(4)]) == [fake_embedding(f"passage: chunk {i}", 8) for i in range(4)]
+
+def test_errors_reach_every_caller():
+    class Failing(FakeEmbeddings):
+        def embed_documents(self, texts): raise ConnectionError("embedding server down")
+
+    batcher = BatchingEmbeddings(Failing(), max_wait_ms=10)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(batcher.embed_query, f"q{i}") for i in range(4)]
+    assert all(isinstance(future.exception(), ConnectionError) for future in futures)
+
+def test_event_loop_callers_are_batched_without_threads():
+    class SyncOnly(FakeEmbeddings):
+        aembed_documents = Embeddings.aembed_documents              # No native async API
+
+    sent    = []
+    async def abatch(texts):
+        sent.append(len(texts))
+        await asyncio.sleep(0.01)
+        return [fake_embedding(text, 8) for text in texts]
+    batcher = BatchingEmbeddings(SyncOnly(dims=8), max_batch=64, max_wait_ms=10, abatch_fn=abatch)
+
+    async def main():
+        return await asyncio.gather(*(batcher.aembed_query(f"question {i}") for i in range(20)))
+
+    assert asyncio.run(main()) == [fake_embedding(f"question {i}", 8) for i in range(20)]
+    assert sent == [20] and batcher._threads == []                 # One async request, no worker thread started
+    assert asyncio.run(main()) and sent == [20, 20]                 # A new event loop starts its own batches
+
+    fallback = BatchingEmbeddings(SyncOnly(dims=8), max_wait_ms=10)
+    assert asyncio.run(fallback.aembed_query("q")) == fake_embedding("q", 8) and fallback._threads   # Sync-only: the worker threads
+
+def test_ollama_batches_from_the_event_loop_use_the_async_client(monkeypatch):
+    from rag_agent_framework.core         import clients
+    from rag_agent_framework.core.clients import ClientRegistry
+    monkeypatch.setattr(clients, "OLLAMA_URL", "http://ollama:11434")
+    sent = []
+    async def handler(request):
+        body = json.loads(request.content)
+        sent.append(body["input"])
+        return httpx.Response(200, json={"embeddings": [[float(len(text))] for text in body["input"]]})
+    monkeypatch.setitem(ClientRegistry._clients, ("async_http", "ollama"), httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    batcher = BatchingEmbeddings(FakeEmbeddings(dims=8), batch_fn=lambda texts: 1 / 0,              # The sync path must not be used
+                                 abatch_fn=ClientRegistry._ollama_abatch_fn("nomic"),
+                                 max_wait_ms=10, query_prefix="query: ")
+    async def main():
+        return await asyncio.gather(batcher.aembed_query("ab"), batcher.aembed_query("abcd"))
+    assert asyncio.run(main()) == [[9.0], [11.0]] and sent == [["query: ab", "query: abcd"]]
@@ -0,0 +1,44 @@
+# tests/test_llm_cache.py -- Repeated prompts are served from the on-disk cache until they expire or are evicted
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeChatModel
+from rag_agent_framework.core.llm_cache import SQLiteLLMCache, LOOKUPS
+
+
+def _hits() -> float:
+    return LOOKUPS.value(result="hit")
+
+class CountingChatModel(FakeChatModel):
+    """Counts the calls that reach the model, i.e. were not answered from the cache"""
+    generated: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.generated += 1
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+def test_repeated_prompt_is_a_hit_across_instances(tmp_path):
+    path  = tmp_path / "cache.sqlite"
+    model = CountingChatModel(cache=SQLiteLLMCache(path))
+    first = model.invoke("What is the torque?").content
+
+    replay = CountingChatModel(cache=SQLiteLLMCache(path))                        # A new process would open the same file
+    hits   = _hits()
+    assert replay.invoke("What is the torque?").content == first
+    assert replay.generated == 0 and _hits() == hits + 1                           # Answered without calling the model
+    hits = _hits()
+    replay.invoke("What is the torque?", stop=["\n"])
+    assert replay.generated == 1 and _hits() == hits                               # Other call parameters, other key
+
+def test_ttl_and_entry_cap(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "cache.sqlite", ttl_s=0.05, max_entries=2, prune_every=1)
+    model = FakeChatModel(cache=cache)
+    for i in range(4): model.invoke(f"prompt {i}")
+    assert cache.size() == 2                                                         # Least recently used evicted
+    time.sleep(0.1)
+    hits = _hits()
+    model.invoke("prompt 3")
+    assert _hits() == hits                                                         # Expired: a miss, answered again
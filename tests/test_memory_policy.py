@@ -0,0 +1,60 @@
+# tests/test_memory_policy.py -- Memory policies decide when turns are summarized; buffered conversations share one LLM request
+
+import re
+import time
+import pytest
+from types import SimpleNamespace
+
+from rag_agent_framework.rag.memory_policy import MemoryWriter, parse_sections, extract_memory
+
+
+class RecordingStore:
+    def __init__(self): self.memories = []
+    def add_memory(self, text): self.memories.append(text)
+
+class NumberedLLM:
+    """Answers a batched prompt with one numbered section per conversation, a single prompt with one line"""
+    def __init__(self): self.prompts = []
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        count = len(re.findall(r"^CONVERSATION \d+:", prompt, re.MULTILINE))
+        return SimpleNamespace(content="\n".join(f"{i}.\nsummary {i}" for i in range(1, count + 1)) if count else "single summary")
+
+def _writer(policy, **kwargs):
+    stores, llm = {}, NumberedLLM()
+    writer = MemoryWriter(policy=policy, store_factory=lambda user_id: stores.setdefault(user_id, RecordingStore()),
+                          llm_factory=lambda: llm, **kwargs)
+    return writer, stores, llm
+
+def test_per_turn_and_extractive_write_immediately():
+    writer, stores, llm = _writer("per_turn")
+    assert writer.record("ana", "Torque?", "12 Nm.") == "single summary" and len(llm.prompts) == 1
+
+    writer, stores, llm = _writer("extractive")
+    memory = writer.record("ana", "Torque?", "It is 12 Nm. Use a calibrated wrench. Check twice.")
+    assert memory == "User asked: Torque? Answer: It is 12 Nm. Use a calibrated wrench." and not llm.prompts
+    assert stores["ana"].memories == [memory]
+
+def test_every_n_batches_due_conversations_across_users():
+    writer, stores, llm = _writer("every_n", every_n=2, max_batch=8, max_wait_s=0.2)
+    for user_id in ("ana", "ben", "cy"):
+        for turn in range(2):
+            assert writer.record(user_id, f"question {turn}", "answer") is None
+    deadline = time.time() + 5
+    while sum(len(store.memories) for store in stores.values()) < 3 and time.time() < deadline: time.sleep(0.02)
+
+    assert len(llm.prompts) == 1                                          # Three users' conversations, one LLM request
+    assert sorted(memory for store in stores.values() for memory in store.memories) == ["summary 1", "summary 2", "summary 3"]
+
+def test_token_threshold_and_flush():
+    writer, stores, llm = _writer("token_threshold", token_threshold=1000)
+    writer.record("ana", "short", "answer")
+    assert not llm.prompts                                                # Below the threshold: buffered
+    writer.flush()
+    assert stores["ana"].memories == ["single summary"]
+
+def test_section_parsing_and_policy_validation():
+    assert parse_sections("1.\nfirst\n\n3.\nthird\n7.\nout of range", 3) == {1: "first", 3: "third"}
+    with pytest.raises(ValueError):
+        MemoryWriter(policy="never")
+    assert extract_memory("q", "") == "User asked: q Answer: "
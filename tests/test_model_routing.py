@@ -0,0 +1,39 @@
+# tests/test_model_routing.py -- Each role gets its configured model; Ollama models are preloaded with keep_alive
+
+import json
+import httpx
+import pytest
+
+from rag_agent_framework.core import clients
+from rag_agent_framework.core.clients import ClientRegistry
+
+
+@pytest.fixture
+def roles(monkeypatch):
+    ollama = {**clients.LLM_CFG["ollama"], "keep_alive": "1h", "preload": True}
+    monkeypatch.setitem(clients.LLM_CFG, "ollama", ollama)
+    monkeypatch.setitem(clients.LLM_CFG, "default", "ollama")
+    monkeypatch.setattr(clients, "OLLAMA_URL", "http://ollama:11434")
+    monkeypatch.setattr(clients, "LLM_ROLES_CFG", {"summarizer": {"model": "tiny:1b", "timeout": 60, "num_ctx": 4096}})
+    yield ollama
+    ClientRegistry.close_all()
+
+def test_roles_route_to_their_models(roles):
+    summarizer = ClientRegistry.get_role_model("summarizer")
+    assert (summarizer.model, summarizer.timeout, summarizer.num_ctx, summarizer.keep_alive) == ("tiny:1b", 60, 4096, "1h")
+
+    writer = ClientRegistry.get_role_model("writer")
+    assert writer.model == roles["chat_model"] and writer.timeout == 300
+    assert ClientRegistry.get_role_model("rag_answerer") is writer                # Same settings, one shared client
+
+def test_preload_loads_each_ollama_model_once(roles):
+    sent = []
+    def handler(request):
+        sent.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={"done": True})
+    ClientRegistry._clients[("http", "ollama")] = httpx.Client(transport=httpx.MockTransport(handler))
+
+    ClientRegistry.preload_ollama()
+    assert sent == [("/api/generate", {"model": roles["chat_model"], "keep_alive": "1h"}),
+                    ("/api/generate", {"model": "tiny:1b", "keep_alive": "1h"}),
+                    ("/api/embed", {"model": roles["embedding_model"], "input": "", "keep_alive": "1h"})]
@@ -0,0 +1,37 @@
+# tests/test_multi_query.py -- Sub-queries are embedded in one batch, searched in one request, fused and de-duplicated
+
+import sys
+from pathlib import Path
+from langchain.schema import Document
+from qdrant_client import QdrantClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeEmbeddings
+from rag_agent_framework.core.clients           import ClientRegistry
+from rag_agent_framework.core.embedding_batcher import BatchingEmbeddings
+from rag_agent_framework.rag.memory             import MemoryStore
+from rag_agent_framework.rag.multi_query        import multi_query_search
+
+
+def test_sub_queries_share_one_embedding_batch_and_one_search():
+    fake   = FakeEmbeddings(dims=16)
+    client = QdrantClient(location=":memory:")
+    ClientRegistry.override(embedder=BatchingEmbeddings(fake, max_wait_ms=1), qdrant_client=client)
+    try:
+        store = MemoryStore(collection_name="kb")
+        texts = ["valve housing torque is 12 Nm", "sterilize with ethylene oxide", "housing material is PEEK"]
+        store.vector_store.add_documents([Document(page_content=text, metadata={"source": "spec.md"}) for text in texts + texts[:1]])
+
+        searches = []
+        query_batch_points = client.query_batch_points
+        client.query_batch_points = lambda **kwargs: searches.append(kwargs) or query_batch_points(**kwargs)
+        calls_before = fake.calls
+
+        documents = multi_query_search(["valve housing torque", "housing material", "torque of the housing"], "kb", k=4, limit=10)
+        assert fake.calls - calls_before == 1 and len(searches) == 1 and len(searches[0]["requests"]) == 3
+        contents = [doc.page_content for doc in documents]
+        assert sorted(contents) == sorted(texts)                               # The duplicate chunk is returned once
+        assert all(doc.metadata["source"] == "spec.md" for doc in documents)
+        assert multi_query_search(["  ", ""], "kb") == []
+    finally:
+        ClientRegistry.override()
@@ -0,0 +1,161 @@
+# tests/test_parser_client.py -- Retries, circuit breaker, concurrency cap and batch streaming of the parser-service client
+
+import json
+import time
+import asyncio
+import threading
+import httpx
+import pytest
+
+from rag_agent_framework.utils import parser_client
+from rag_agent_framework.utils.parser_client import ParserClient, CircuitBreaker, ParserServiceError, CircuitOpenError
+
+
+class Service:
+    """MockTransport handler that answers from a script of responses (or exceptions) and records in-flight requests"""
+
+    def __init__(self, *script, latency_s: float = 0.0):
+        self.script    = list(script)
+        self.latency_s = latency_s
+        self.calls     = 0
+        self.in_flight = 0
+        self.peak      = 0
+        self.bodies    = []
+        self._lock     = threading.Lock()
+
+    def _next(self, request: httpx.Request):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.bodies.append(request.read())
+            step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        return step
+
+    def _answer(self, step, request: httpx.Request) -> httpx.Response:
+        with self._lock: self.in_flight -= 1
+        if isinstance(step, Exception): raise step
+        status, body = step
+        if isinstance(body, str): return httpx.Response(status, text=body, request=request)
+        return httpx.Response(status, json=body, request=request)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        step = self._next(request)
+        if self.latency_s: time.sleep(self.latency_s)
+        return self._answer(step, request)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        step = self._next(request)
+        if self.latency_s: await asyncio.sleep(self.latency_s)
+        return self._answer(step, request)
+
+
+@pytest.fixture
+def part(tmp_path):
+    path = tmp_path / "part.step"
+    path.write_bytes(b"ISO-10303-21;")
+    return str(path)
+
+def _client(monkeypatch, service: Service, retries: int = 3, concurrency: int = 4, threshold: int = 5, reset: float = 30) -> ParserClient:
+    monkeypatch.setitem(parser_client.PARSER_CFG, "retries", retries)
+    monkeypatch.setitem(parser_client.PARSER_CFG, "backoff_base", 0.0)
+    monkeypatch.setitem(parser_client.PARSER_CFG, "max_concurrency", concurrency)
+    monkeypatch.setitem(parser_client.PARSER_CFG, "breaker_threshold", threshold)
+    monkeypatch.setitem(parser_client.PARSER_CFG, "breaker_reset", reset)
+    monkeypatch.setattr(parser_client, "_http_client", httpx.Client(transport=httpx.MockTransport(service)))
+    monkeypatch.setattr(parser_client, "_async_http_client", httpx.AsyncClient(transport=httpx.MockTransport(service.handle_async)))
+    return ParserClient("cad", "http://parser", "/parse_cad/")
+
+
+def test_server_errors_and_timeouts_are_retried(monkeypatch, part):
+    service = Service((503, "busy"), httpx.ReadTimeout("slow"), (200, {"volume": 1.5}))
+    client  = _client(monkeypatch, service)
+    assert client.parse(part) == {"volume": 1.5} and service.calls == 3
+    assert all(b"ISO-10303-21;" in body for body in service.bodies)             # The file is re-sent from the start every attempt
+
+def test_retries_give_up_and_client_errors_are_not_retried(monkeypatch, part):
+    service = Service((502, "bad gateway"))
+    with pytest.raises(ParserServiceError) as failed:
+        _client(monkeypatch, service, retries=2).parse(part)
+    assert failed.value.status_code == 502 and service.calls == 3
+
+    service = Service((400, "Unsupported CAD format"))
+    with pytest.raises(ParserServiceError) as failed:
+        _client(monkeypatch, service).parse(part)
+    assert failed.value.status_code == 400 and service.calls == 1
+
+def test_backoff_is_jittered_and_bounded():
+    client = ParserClient("cad", "http://parser", "/parse_cad/")
+    delays = [client._backoff(3) for _ in range(200)]
+    assert all(0 <= delay <= client.backoff_base * 8 for delay in delays) and len(set(delays)) > 100
+
+def test_breaker_opens_then_recovers_through_one_trial(monkeypatch, part):
+    service = Service((500, "down"), (500, "down"), (200, {"volume": 2.0}))
+    client  = _client(monkeypatch, service, retries=0, threshold=2, reset=0.1)
+    for _ in range(2):
+        with pytest.raises(ParserServiceError): client.parse(part)
+    assert client.breaker.state == "open"
+    with pytest.raises(CircuitOpenError): client.parse(part)
+    assert service.calls == 2                                                    # Rejected without calling the service
+
+    time.sleep(0.12)
+    assert client.breaker.state == "half_open"
+    assert client.breaker.allow() and not client.breaker.allow()                # One trial per reset window
+    time.sleep(0.12)
+    assert client.parse(part) == {"volume": 2.0} and client.breaker.state == "closed"
+
+def test_breaker_reopens_when_the_trial_fails():
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+def test_in_flight_requests_are_capped(monkeypatch, part):
+    service = Service((200, {"volume": 1.0}), latency_s=0.05)
+    client  = _client(monkeypatch, service, concurrency=2)
+    threads = [threading.Thread(target=client.parse, args=(part,)) for _ in range(8)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    assert service.calls == 8 and service.peak == 2
+
+    results = list(client.parse_many([part] * 4))
+    assert [result for _, result in results] == [{"volume": 1.0}] * 4 and service.peak == 2
+
+def test_parse_batch_streams_result_lines(monkeypatch, part):
+    lines   = "\n".join(json.dumps({"filename": f"part{i}.step", "status": "ok"}) for i in range(3)) + "\n"
+    service = Service((200, lines))
+    client  = _client(monkeypatch, service)
+    results = list(client.parse_batch([part, part, part]))
+    assert [line["filename"] for line in results] == ["part0.step", "part1.step", "part2.step"]
+    assert service.bodies[0].count(b'name="files"') == 3
+
+    service = Service((503, "busy"))
+    client  = _client(monkeypatch, service, threshold=1)
+    with pytest.raises(ParserServiceError): list(client.parse_batch([part]))
+    assert service.calls == 1 and client.breaker.state == "open"                # Batches are not retried
+
+def test_aparse_retries_and_caps_concurrency(monkeypatch, part):
+    service = Service((503, "busy"), (200, {"volume": 3.0}))
+    client  = _client(monkeypatch, service)
+    assert asyncio.run(client.aparse(part)) == {"volume": 3.0} and service.calls == 2
+
+    service = Service((200, {"volume": 3.0}), latency_s=0.05)
+    client  = _client(monkeypatch, service, concurrency=3)
+    async def run():
+        return await asyncio.gather(*(client.aparse(part) for _ in range(9)))
+    assert len(asyncio.run(run())) == 9 and service.peak == 3
+
+def test_aparse_works_across_event_loops_and_reads_off_the_loop(monkeypatch, part):
+    service = Service((200, {"volume": 4.0}), latency_s=0.02)
+    client  = _client(monkeypatch, service, concurrency=2)
+    readers = []
+    read    = client._read
+    monkeypatch.setattr(client, "_read", lambda *args: readers.append(threading.current_thread()) or read(*args))
+    async def run():
+        return await asyncio.gather(*(client.aparse(part) for _ in range(6)))
+    for _ in range(2):                                                          # A fresh loop each time, e.g. per test or per worker
+        monkeypatch.setattr(parser_client, "_async_http_client", httpx.AsyncClient(transport=httpx.MockTransport(service.handle_async)))
+        assert asyncio.run(run()) == [{"volume": 4.0}] * 6
+    assert service.peak == 2 and threading.main_thread() not in readers
@@ -0,0 +1,83 @@
+# tests/test_profiling.py -- On-demand profiles: samples from every busy thread, stage timings, the admin header and GET /profiles
+
+import json
+import time
+import asyncio
+import threading
+from fastapi.testclient import TestClient
+
+from rag_agent_framework.api            import server
+from rag_agent_framework.core           import profiling
+from rag_agent_framework.core.telemetry import span
+
+
+def spin_in_worker(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline: sum(range(1000))
+
+def test_profile_samples_other_threads_and_records_stages(tmp_path):
+    with profiling.profile("unit", directory=tmp_path) as running:
+        with span("retrieval"):
+            worker = threading.Thread(target=spin_in_worker, args=(0.2,), name="worker")
+            worker.start()
+            worker.join()
+
+    summary = profiling.recent_profiles(tmp_path)[0]
+    assert summary["id"] == running.id and summary["samples"] > 0
+    assert [stage["stage"] for stage in summary["stages"]] == ["retrieval"]
+
+    speedscope = json.loads(profiling.speedscope_path(running.id, tmp_path).read_text())
+    frames     = speedscope["shared"]["frames"]
+    worker     = next(profile for profile in speedscope["profiles"] if profile["name"] == "worker")
+    assert len(worker["samples"]) == len(worker["weights"])
+    assert all(0 <= index < len(frames) for sample in worker["samples"] for index in sample)
+    assert any(frames[sample[-1]]["name"] in ("spin_in_worker", "<genexpr>") for sample in worker["samples"])
+    assert profiling.speedscope_path("../../etc/passwd", tmp_path) is None
+
+def test_only_the_newest_profiles_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setitem(profiling.PROFILING_CFG, "keep", 2)
+    for i in range(3):
+        with profiling.profile(f"run {i}", directory=tmp_path): time.sleep(0.02)
+    assert [summary["name"] for summary in profiling.recent_profiles(tmp_path)] == ["run 2", "run 1"]
+    assert len(list(tmp_path.glob("*.speedscope.json"))) == 2
+
+def test_admin_header_profiles_a_request(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(profiling, "profiles_dir", lambda: tmp_path)
+    monkeypatch.setattr(server, "PROFILED_PATHS", ("/health",))
+    client = TestClient(server.app)
+
+    assert "X-Profile-Id" not in client.get("/health").headers
+    assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": "wrong"}).headers
+    profile_id = client.get("/health", headers={"X-Profile": "secret"}).headers["X-Profile-Id"]
+
+    assert client.get("/profiles").status_code == 403
+    listed = client.get("/profiles", headers={"X-Profile": "secret"}).json()
+    assert [summary["id"] for summary in listed] == [profile_id] and listed[0]["name"] == "GET /health"
+    download = client.get(f"/profiles/{profile_id}", headers={"X-Profile": "secret"})
+    assert download.status_code == 200 and "profiles" in download.json()
+
+def test_profiles_are_closed_without_a_token(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", None)
+    monkeypatch.setattr(profiling, "profiles_dir", lambda: tmp_path)
+    monkeypatch.setattr(server, "PROFILED_PATHS", ("/health",))
+    client = TestClient(server.app)
+
+    assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": ""}).headers
+    assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": "anything"}).headers
+    assert client.get("/profiles").status_code == 403
+    assert client.get("/profiles", headers={"X-Profile": "anything"}).status_code == 403
+
+def test_async_profile_writes_files_off_the_event_loop(tmp_path, monkeypatch):
+    writers = []
+    save    = profiling.Profile.save
+    monkeypatch.setattr(profiling.Profile, "save", lambda self, directory: writers.append(threading.current_thread()) or save(self, directory))
+
+    async def main():
+        async with profiling.aprofile("async", directory=tmp_path):
+            await asyncio.sleep(0.02)
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(main())
+    assert len(writers) == 1 and writers[0] is not loop_thread
+    assert profiling.recent_profiles(tmp_path)[0]["name"] == "async"
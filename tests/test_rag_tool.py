@@ -0,0 +1,24 @@
+# tests/test_rag_tool.py -- Agent tool calls are timed end to end, including the first-call setup of the RAG chain
+
+import time
+import importlib
+
+from rag_agent_framework.core.telemetry import TOOL_SECONDS
+
+tools = importlib.import_module("rag_agent_framework.utils.tools.rag_tool")
+
+
+def test_tool_latency_includes_building_the_chain(monkeypatch):
+    class Chain:
+        def invoke(self, question):
+            return f"answer to {question}"
+    def get_rag_chain(**kwargs):
+        time.sleep(0.2)                                                 # Stands in for ensure_collection's Qdrant round-trips
+        assert kwargs["filters"]["type"] == "cad_summary"
+        return Chain()
+    monkeypatch.setattr(tools, "get_rag_chain", get_rag_chain)
+
+    count, total = TOOL_SECONDS.snapshot().get(("rag_tool",), (0, 0.0))
+    assert tools.rag_tool.run(question="torque?", chunk_type="cad_summary") == "answer to torque?"
+    after_count, after_total = TOOL_SECONDS.snapshot()[("rag_tool",)]
+    assert after_count == count + 1 and after_total - total >= 0.2
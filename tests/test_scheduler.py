@@ -0,0 +1,66 @@
+# tests/test_scheduler.py -- Admission control for crew runs: concurrency limit, rejections, lanes and per-user fairness
+
+import time
+import asyncio
+import threading
+import pytest
+
+from rag_agent_framework.api.scheduler import CrewScheduler, SchedulerRejected
+
+
+def _crew_run(log: list, name: str, seconds: float = 0.05):
+    log.append(name)
+    time.sleep(seconds)
+    return name
+
+def test_concurrency_limit_and_queue_rejection():
+    """Only max_concurrency runs execute at once; once the queue is full new requests get 503"""
+    scheduler = CrewScheduler(max_concurrency=2, max_queue=2, max_queue_wait=10, max_per_user=10, expected_run_s=0.1)
+    active, peak, lock = 0, 0, threading.Lock()
+
+    def tracked():
+        nonlocal active, peak
+        with lock: active += 1; peak = max(peak, active)
+        time.sleep(0.1)
+        with lock: active -= 1
+
+    async def main():
+        tasks = [asyncio.create_task(scheduler.run(tracked, user_id=f"u{i}")) for i in range(4)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(SchedulerRejected) as rejected:
+            await scheduler.run(tracked, user_id="late")
+        await asyncio.gather(*tasks)
+        return rejected.value
+
+    rejected = asyncio.run(main())
+    assert rejected.status_code == 503 and rejected.retry_after >= 1
+    assert peak == 2
+    assert scheduler.snapshot()["running"] == 0
+
+def test_per_user_limit_returns_429():
+    scheduler = CrewScheduler(max_concurrency=4, max_per_user=1)
+
+    async def main():
+        first = asyncio.create_task(scheduler.run(time.sleep, 0.1, user_id="alice"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(SchedulerRejected) as rejected:
+            await scheduler.run(time.sleep, 0.1, user_id="alice")
+        await first
+        return rejected.value
+
+    assert asyncio.run(main()).status_code == 429
+
+def test_short_lane_first_then_round_robin_across_users():
+    """With one slot busy, queued short questions go before normal ones, and users alternate inside a lane"""
+    scheduler = CrewScheduler(max_concurrency=1, max_queue=10, max_queue_wait=10, max_per_user=5, short_burst=10, expected_run_s=0.01)
+    log = []
+
+    async def main():
+        blocker = asyncio.create_task(scheduler.run(_crew_run, log, "blocker", 0.1, user_id="z"))
+        await asyncio.sleep(0.01)
+        queued = [("a1", "a", "normal"), ("a2", "a", "short"), ("a3", "a", "short"), ("b1", "b", "short")]
+        tasks  = [asyncio.create_task(scheduler.run(_crew_run, log, name, 0.01, user_id=user, lane=lane)) for name, user, lane in queued]
+        await asyncio.gather(blocker, *tasks)
+
+    asyncio.run(main())
+    assert log == ["blocker", "a2", "b1", "a3", "a1"]
@@ -0,0 +1,81 @@
+# tests/test_singleflight.py -- Identical in-flight requests share one execution, and nothing is cached afterwards
+
+import sys
+import asyncio
+import threading
+import httpx
+from pathlib       import Path
+from qdrant_client import QdrantClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeChatModel, FakeCrew, FakeEmbeddings
+from rag_agent_framework.core.clients     import ClientRegistry
+from rag_agent_framework.api.singleflight import SingleFlight, request_key
+
+
+def test_request_key_normalizes_question_but_not_context():
+    assert request_key("What is the torque spec?", "none") == request_key("  what is the TORQUE   spec ", "none")
+    assert request_key("What is the torque spec?", "none") != request_key("What is the torque spec?", "user memory")
+
+def test_identical_requests_share_one_run():
+    flights, calls = SingleFlight(), 0
+
+    async def crew_run():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def main():
+        results = await asyncio.gather(*(flights.do("same", crew_run) for _ in range(5)), flights.do("other", crew_run))
+        again   = await flights.do("same", crew_run)           # The finished run is not reused
+        return results, again
+
+    results, again = asyncio.run(main())
+    assert results == ["answer"] * 6 and again == "answer"
+    assert calls == 3
+
+def test_failure_reaches_every_waiter():
+    flights = SingleFlight()
+
+    async def crew_run():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("LLM unavailable")
+
+    async def main():
+        return await asyncio.gather(*(flights.do("same", crew_run) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+
+def test_coalesced_chat_requests_are_admitted_per_user(monkeypatch):
+    """Each user is held to their own limit; a user over it gets their own 429 and never someone else's"""
+    from rag_agent_framework.api.server import app
+    from rag_agent_framework.api        import scheduler as scheduler_module
+    from rag_agent_framework.agents     import crew as crew_module
+
+    kickoffs, lock = [], threading.Lock()
+    class CountingCrew(FakeCrew):
+        def kickoff(self, inputs: dict) -> str:
+            with lock: kickoffs.append(inputs["topic"])
+            return super().kickoff(inputs)
+
+    chat_model = FakeChatModel()
+    ClientRegistry.override(chat_model=chat_model, embedder=FakeEmbeddings(dims=16), qdrant_client=QdrantClient(location=":memory:"))
+    monkeypatch.setattr(crew_module, "_pool", crew_module.CrewPool(lambda: CountingCrew(chat_model, latency_s=0.2)))
+    scheduler = scheduler_module.CrewScheduler(max_concurrency=4, max_per_user=1, expected_run_s=0.2)
+    monkeypatch.setattr(scheduler_module, "_scheduler", scheduler)
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            ask = lambda user: client.post("/chat", json={"question": "What is the torque spec?", "user_id": user})
+            with scheduler.admitted("alice"):                       # Alice already has a request in progress
+                return await asyncio.gather(ask("alice"), ask("bob"), ask("carol"), ask("carol"))
+
+    try:
+        alice, bob, *carol = asyncio.run(main())
+    finally:
+        ClientRegistry.override()
+    assert alice.status_code == 429 and "alice" in alice.json()["detail"]
+    assert bob.status_code == 200 and sorted(response.status_code for response in carol) == [200, 429]
+    assert "bob" not in carol[0].text + carol[1].text                 # Carol's follower was counted against Carol's limit only
+    assert kickoffs == ["What is the torque spec?"]                   # Bob and Carol shared one crew run
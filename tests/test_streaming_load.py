@@ -0,0 +1,69 @@
+# tests/test_streaming_load.py -- Documents stream page -> chunks -> fixed-size embedding batches -> upserts, never all at once
+
+import io
+import sys
+from pathlib       import Path
+from qdrant_client import QdrantClient
+from langchain.schema import Document
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from fakes import FakeEmbeddings
+from rag_agent_framework.core.clients      import ClientRegistry
+from rag_agent_framework.core.config       import DEDUP_CFG
+from rag_agent_framework.rag               import memory
+from rag_agent_framework.rag.text_splitter import iter_split_documents, batched
+
+PAGE = " ".join(f"Clause {i} requires the valve housing to be inspected after sterilization." for i in range(20))   # About 1500 chars
+
+
+class Pages:
+    """A lazy loader stand-in that counts how many pages were pulled"""
+
+    def __init__(self, count: int):
+        self.count  = count
+        self.pulled = 0
+
+    def __iter__(self):
+        for i in range(self.count):
+            self.pulled += 1
+            yield Document(page_content=f"Page {i}. {PAGE}", metadata={"source": "big.pdf", "page": i})
+
+
+class RecordingEmbeddings(FakeEmbeddings):
+    """Records the batch sizes and how far the loader had read at each embedding call"""
+
+    def __init__(self, pages: Pages):
+        super().__init__(dims=16)
+        self.pages, self.batches, self.pulled = pages, [], []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(len(texts))
+        self.pulled.append(self.pages.pulled)
+        return super().embed_documents(texts)
+
+def test_chunks_are_produced_as_pages_are_pulled():
+    pages   = Pages(1000)
+    batches = batched(iter_split_documents(pages, chunk_size=1000, chunk_overlap=200), 8)
+    first   = next(batches)
+    assert len(first) == 8 and pages.pulled <= 5
+
+def test_add_document_stores_in_bounded_batches(monkeypatch):
+    pages    = Pages(300)
+    embedder = RecordingEmbeddings(pages)
+    monkeypatch.setitem(DEDUP_CFG, "enabled", False)
+    monkeypatch.setattr(memory, "lazy_load_documents", lambda path: iter(pages))
+    ClientRegistry.override(embedder=embedder, qdrant_client=QdrantClient(location=":memory:"))
+    try:
+        store = memory.MemoryStore(collection_name="streaming")
+        store.add_document(io.BytesIO(b"%PDF-1.4 stand-in"), "big.pdf")
+        assert store.client.count("streaming").count == 600 and pages.pulled == 300         # Two chunks per page
+    finally:
+        ClientRegistry.override()
+
+    size = memory.config.retriever.embed_batch_size
+    assert max(embedder.batches) <= size and len(embedder.batches) > 5
+    stored = 0
+    for batch, pulled in zip(embedder.batches, embedder.pulled):
+        if pulled == 0: continue                                 # Probing the vector size when the collection is created
+        stored += batch
+        assert pulled <= stored // 2 + 1                         # The loader never ran more than one page ahead of this batch
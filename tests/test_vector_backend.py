@@ -0,0 +1,63 @@
+# tests/test_vector_backend.py -- The embedded vector_db types run MemoryStore without a Qdrant server
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in a fresh interpreter because VECTOR_DB_TYPE is read once at import; the fake embedder keeps it offline
+SCRIPT = """
+import sys
+sys.path.insert(0, "benchmarks")
+from fakes import FakeEmbeddings
+from rag_agent_framework.core.clients import ClientRegistry
+ClientRegistry.override(embedder=FakeEmbeddings(dims=64))
+from rag_agent_framework.rag.memory import MemoryStore
+
+store = MemoryStore(user_id="embedded")
+if sys.argv[1] == "write":
+    store.add_memory("The valve housing torque is 12 Nm.")
+    store.add_memory("Sterilization uses ethylene oxide.")
+print(store.get_memories("valve housing torque", k=1)[0].page_content)
+"""
+
+def _run(mode: str, env: dict) -> str:
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT / "src"), "LOG_LEVEL": "WARNING", **env}
+    out = subprocess.run([sys.executable, "-c", SCRIPT, mode], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True)
+    return out.stdout.strip()
+
+def test_memory_backend_without_server():
+    assert _run("write", {"VECTOR_DB_TYPE": "memory"}) == "The valve housing torque is 12 Nm."
+
+def test_local_backend_persists_on_disk(tmp_path):
+    env = {"VECTOR_DB_TYPE": "local", "VECTOR_DB_PATH": str(tmp_path / "qdrant")}
+    assert _run("write", env) == "The valve housing torque is 12 Nm."
+    assert _run("read", env) == "The valve housing torque is 12 Nm."        # A new process finds the collection on disk
+
+
+FILTER_SCRIPT = """
+import sys
+sys.path.insert(0, "benchmarks")
+from fakes import FakeEmbeddings, FakeChatModel
+from rag_agent_framework.core.clients import ClientRegistry
+ClientRegistry.override(embedder=FakeEmbeddings(dims=64), chat_model=FakeChatModel())
+from langchain.schema import Document
+from rag_agent_framework.rag.rag_chain    import get_rag_chain
+from rag_agent_framework.rag.vector_store import get_vector_store, build_filter
+
+get_rag_chain("filtered")                     # Creates the collection (payload indexes are a no-op in embedded mode)
+store = get_vector_store("filtered")
+store.add_documents([
+    Document(page_content="valve housing torque 12 Nm", metadata={"source": "spec.pdf", "type": "text_chunk"}),
+    Document(page_content="valve housing torque part",  metadata={"source": "housing.step", "type": "cad_summary", "part_id": "housing.step:1"}),
+])
+hits = store.similarity_search("valve housing torque", k=5, filter=build_filter({"type": "cad_summary", "source": None}))
+print([hit.metadata["source"] for hit in hits])
+"""
+
+def test_filtered_retrieval_on_chunk_metadata():
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT / "src"), "LOG_LEVEL": "WARNING", "VECTOR_DB_TYPE": "memory"}
+    out = subprocess.run([sys.executable, "-c", FILTER_SCRIPT], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "['housing.step']"
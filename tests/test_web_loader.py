@@ -0,0 +1,130 @@
+# tests/test_web_loader.py -- Web ingestion against a local stand-in site: sitemaps, conditional GETs, per-host limits, re-ingestion
+
+import sys
+import asyncio
+import importlib.util
+from pathlib       import Path
+from qdrant_client import QdrantClient, models
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+from fakes           import FakeEmbeddings, FakeDatabaseConnections
+from fake_web_server import FakeSite, FakeWebServer
+from rag_agent_framework.rag.web_loader import WebFetcher, HTTPCache, HostLimiter
+
+
+def _by_status(pages) -> dict:
+    statuses = {}
+    for page in pages: statuses.setdefault(page.status, []).append(page.url)
+    return statuses
+
+def test_sitemap_pages_are_fetched_once_and_then_revalidated(tmp_path):
+    site = FakeSite(pages=4)
+    with FakeWebServer(site) as web:
+        fetcher = WebFetcher(HTTPCache(tmp_path / "http.sqlite"), per_host_rps=0)
+        first   = fetcher.fetch([f"{web.url}/sitemap.xml"])
+        assert sorted(_by_status(first)) == ["new"] and len(first) == 4
+        page = next(page for page in first if page.url.endswith("page-1.html"))
+        assert page.document.metadata["title"] == "Page 1" and "tightened to 11 Nm" in page.document.page_content
+        assert "tracking" not in page.document.page_content and "Home | Docs" not in page.document.page_content
+        for page in first: fetcher.cache.commit(page)                       # Stored by the caller
+
+        site.update("/docs/page-2.html", FakeSite.render(2, 2))
+        second = _by_status(fetcher.fetch([f"{web.url}/sitemap.xml"]))
+    assert second["changed"] == [f"{web.url}/docs/page-2.html"] and len(second["unchanged"]) == 3
+    assert site.statuses().count(304) == 3                                   # Unchanged pages were not downloaded again
+
+def test_uncommitted_pages_and_servers_without_validators(tmp_path):
+    site = FakeSite(pages=2, validators=False)
+    with FakeWebServer(site) as web:
+        fetcher = WebFetcher(HTTPCache(tmp_path / "http.sqlite"), per_host_rps=0)
+        urls    = [f"{web.url}/docs/page-0.html", f"{web.url}/docs/page-1.html", f"{web.url}/docs/missing.html"]
+        first   = fetcher.fetch(urls)
+        fetcher.cache.commit(next(page for page in first if page.url == urls[0]))
+        second  = _by_status(fetcher.fetch(urls))
+    assert second == {"unchanged": [urls[0]], "new": [urls[1]], "failed": [urls[2]]}   # Same content hash; never stored; 404
+
+def test_concurrency_and_per_host_rate_limit():
+    site = FakeSite(pages=8, latency_s=0.1)
+    with FakeWebServer(site) as web:
+        urls = [f"{web.url}/docs/page-{i}.html" for i in range(8)]
+        WebFetcher(concurrency=8, per_host_concurrency=3, per_host_rps=0).fetch(urls)
+        assert 1 < site.peak <= 3                                             # Overlapping, but never past the per-host cap
+
+        site.reset_log()
+        WebFetcher(concurrency=8, per_host_concurrency=8, per_host_rps=20).fetch(urls)
+    starts = sorted(site.starts)
+    assert starts[-1] - starts[0] >= 7 / 20 * 0.9                            # At most 20 requests per second to the host
+
+def test_host_limiter_spaces_requests_per_host():
+    async def run():
+        limiter = HostLimiter(rps=10, concurrency=2)
+        loop    = asyncio.get_running_loop()
+        start   = loop.time()
+        for host in ("a", "a", "a", "b"): await limiter.wait(host)
+        return loop.time() - start
+    assert 0.18 <= asyncio.run(run()) < 0.3                                   # Host b does not wait behind host a
+
+def _load_script(name: str):
+    spec   = importlib.util.spec_from_file_location(name, PROJECT_ROOT / "scripts" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_ingest_web_skips_unchanged_pages_and_replaces_changed_ones(tmp_path, monkeypatch):
+    ingest = _load_script("ingest")
+
+    client   = QdrantClient(location=":memory:")
+    embedder = FakeEmbeddings(dims=16)
+    client.create_collection(ingest.QDRANT_COLLECTION_NAME, vectors_config=models.VectorParams(size=16, distance=models.Distance.COSINE))
+    db_manager = FakeDatabaseConnections(client)
+    monkeypatch.setattr(ingest, "get_web_fetcher", lambda use_cache: WebFetcher(HTTPCache(tmp_path / "http.sqlite"), per_host_rps=0))
+
+    site = FakeSite(pages=3)
+    with FakeWebServer(site) as web:
+        run = lambda: ingest.ingest_web([f"{web.url}/sitemap.xml"], db_manager, embedder, ingest.MergeGraphLoader(db_manager.get_neo4j_driver()))
+        assert run() == {"new": 3}
+        calls, points = embedder.calls, client.count(ingest.QDRANT_COLLECTION_NAME).count
+
+        assert run() == {"unchanged": 3} and embedder.calls == calls         # Nothing parsed or embedded again
+        site.update("/docs/page-0.html", FakeSite.render(0, 2))
+        assert run() == {"changed": 1, "unchanged": 2}
+
+    assert client.count(ingest.QDRANT_COLLECTION_NAME).count == points      # The old chunks of the changed page were replaced
+    source = models.Filter(must=[models.FieldCondition(key="metadata.source", match=models.MatchValue(value=f"{web.url}/docs/page-0.html"))])
+    stored = client.scroll(ingest.QDRANT_COLLECTION_NAME, scroll_filter=source, with_payload=True)[0]
+    assert all("Revision 2" in point.payload["page_content"] for point in stored)
+
+def test_reindex_after_a_page_changed_restores_only_the_new_version(tmp_path, monkeypatch):
+    from click.testing                        import CliRunner
+    from rag_agent_framework.core.clients     import ClientRegistry
+    from rag_agent_framework.rag.corpus_store import CorpusStore, CorpusWriter
+    ingest  = _load_script("ingest")
+    reindex = _load_script("reindex")
+
+    client   = QdrantClient(location=":memory:")
+    embedder = FakeEmbeddings(dims=16)
+    client.create_collection(ingest.QDRANT_COLLECTION_NAME, vectors_config=models.VectorParams(size=16, distance=models.Distance.COSINE))
+    db_manager = FakeDatabaseConnections(client)
+    monkeypatch.setattr(ingest, "get_web_fetcher", lambda use_cache: WebFetcher(HTTPCache(tmp_path / "http.sqlite"), per_host_rps=0))
+
+    site = FakeSite(pages=2)
+    with FakeWebServer(site) as web:
+        def run(shard_size: int):
+            writer = CorpusWriter(CorpusStore(tmp_path / "corpus"), shard_size=shard_size)
+            ingest.ingest_web([f"{web.url}/sitemap.xml"], db_manager, embedder, ingest.MergeGraphLoader(db_manager.get_neo4j_driver()), corpus=writer)
+            writer.close()
+        run(shard_size=1000)
+        site.update("/docs/page-0.html", FakeSite.render(0, 2))
+        run(shard_size=1)
+    live = client.count(ingest.QDRANT_COLLECTION_NAME).count
+
+    ClientRegistry.override(embedder=embedder, qdrant_client=client)
+    try:
+        result = CliRunner().invoke(reindex.reindex, ["--collection", "rebuilt", "--store", str(tmp_path / "corpus"), "--parallel", "1"])
+    finally:
+        ClientRegistry.override()
+    assert result.exit_code == 0 and client.count("rebuilt").count == live
+    points = client.scroll("rebuilt", with_payload=True, limit=100)[0]
+    page_0 = [point.payload["page_content"] for point in points if point.payload["metadata"]["source"].endswith("page-0.html")]
+    assert page_0 and all("Revision 2" in text for text in page_0)          # The first run's chunks of page 0 stayed dead